@@ -0,0 +1,347 @@
+"""Move generated content and knowledge bases into compressed blobs
+
+Revision ID: 36cd3f1befff
+Revises: eaa1e70be21e
+Create Date: 2026-10-19 14:05:43.219784
+
+"""
+import hashlib
+import json
+import zlib
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '36cd3f1befff'
+down_revision: Union[str, Sequence[str], None] = 'eaa1e70be21e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Frozen copy of app/models/search_index.py at this revision. The item
+# triggers no longer read generated_content, so its text is indexed below.
+CREATE_STATEMENTS = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS search_index USING fts5(kind UNINDEXED, entity_id UNINDEXED, project_id UNINDEXED, item_id UNINDEXED, title, body, content, tokenize = 'unicode61 remove_diacritics 2')
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS search_projects_ai AFTER INSERT ON projects BEGIN
+        INSERT INTO search_index(rowid, kind, entity_id, project_id, item_id, title, body) VALUES (NEW.id * 4 + 1, 1, NEW.id, NEW.id, NULL, NEW.name, NEW.description || ' ' || coalesce(NEW.client, ''));
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS search_projects_au AFTER UPDATE OF name, description, client ON projects BEGIN
+        DELETE FROM search_index WHERE rowid = OLD.id * 4 + 1;
+        INSERT INTO search_index(rowid, kind, entity_id, project_id, item_id, title, body) VALUES (NEW.id * 4 + 1, 1, NEW.id, NEW.id, NULL, NEW.name, NEW.description || ' ' || coalesce(NEW.client, ''));
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS search_projects_ad AFTER DELETE ON projects BEGIN
+        DELETE FROM search_index WHERE rowid = OLD.id * 4 + 1;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS search_items_ai AFTER INSERT ON documentation_items BEGIN
+        INSERT INTO search_index(rowid, kind, entity_id, project_id, item_id, title, body) VALUES (NEW.id * 4 + 2, 2, NEW.id, NEW.project_id, NEW.id, NEW.title, NEW.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS search_items_au AFTER UPDATE OF title, description ON documentation_items BEGIN
+        UPDATE search_index SET title = NEW.title, body = NEW.description WHERE rowid = NEW.id * 4 + 2;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS search_items_ad AFTER DELETE ON documentation_items BEGIN
+        DELETE FROM search_index WHERE rowid = OLD.id * 4 + 2;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS search_questions_ai AFTER INSERT ON questions BEGIN
+        INSERT INTO search_index(rowid, kind, entity_id, project_id, item_id, title, body) VALUES (NEW.id * 4 + 3, 3, NEW.id, (SELECT project_id FROM documentation_items WHERE id = NEW.doc_item_id), NEW.doc_item_id, NEW.question_text, coalesce(NEW.answer, ''));
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS search_questions_au AFTER UPDATE OF question_text, answer ON questions BEGIN
+        DELETE FROM search_index WHERE rowid = OLD.id * 4 + 3;
+        INSERT INTO search_index(rowid, kind, entity_id, project_id, item_id, title, body) VALUES (NEW.id * 4 + 3, 3, NEW.id, (SELECT project_id FROM documentation_items WHERE id = NEW.doc_item_id), NEW.doc_item_id, NEW.question_text, coalesce(NEW.answer, ''));
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS search_questions_ad AFTER DELETE ON questions BEGIN
+        DELETE FROM search_index WHERE rowid = OLD.id * 4 + 3;
+    END
+    """,
+]
+
+BACKFILL_STATEMENTS = [
+    """
+    INSERT INTO search_index(rowid, kind, entity_id, project_id, item_id, title, body) SELECT id * 4 + 1, 1, id, id, NULL, name, description || ' ' || coalesce(client, '') FROM projects
+    """,
+    """
+    INSERT INTO search_index(rowid, kind, entity_id, project_id, item_id, title, body) SELECT id * 4 + 2, 2, id, project_id, id, title, description FROM documentation_items
+    """,
+    """
+    INSERT INTO search_index(rowid, kind, entity_id, project_id, item_id, title, body) SELECT q.id * 4 + 3, 3, q.id, i.project_id, q.doc_item_id, q.question_text, coalesce(q.answer, '') FROM questions q JOIN documentation_items i ON i.id = q.doc_item_id
+    """,
+]
+
+# Frozen copy of the index from e4a1b8c3d502, restored on downgrade
+OLD_CREATE_STATEMENTS = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS search_index USING fts5(kind UNINDEXED, entity_id UNINDEXED, project_id UNINDEXED, item_id UNINDEXED, title, body, tokenize = 'unicode61 remove_diacritics 2')
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS search_projects_ai AFTER INSERT ON projects BEGIN
+        INSERT INTO search_index(rowid, kind, entity_id, project_id, item_id, title, body) VALUES (NEW.id * 4 + 1, 1, NEW.id, NEW.id, NULL, NEW.name, NEW.description || ' ' || coalesce(NEW.client, ''));
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS search_projects_au AFTER UPDATE OF name, description, client ON projects BEGIN
+        DELETE FROM search_index WHERE rowid = OLD.id * 4 + 1;
+        INSERT INTO search_index(rowid, kind, entity_id, project_id, item_id, title, body) VALUES (NEW.id * 4 + 1, 1, NEW.id, NEW.id, NULL, NEW.name, NEW.description || ' ' || coalesce(NEW.client, ''));
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS search_projects_ad AFTER DELETE ON projects BEGIN
+        DELETE FROM search_index WHERE rowid = OLD.id * 4 + 1;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS search_items_ai AFTER INSERT ON documentation_items BEGIN
+        INSERT INTO search_index(rowid, kind, entity_id, project_id, item_id, title, body) VALUES (NEW.id * 4 + 2, 2, NEW.id, NEW.project_id, NEW.id, NEW.title, NEW.description || ' ' || coalesce((SELECT group_concat(value, ' ') FROM json_tree(NEW.generated_content) WHERE type = 'text'), ''));
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS search_items_au AFTER UPDATE OF title, description, generated_content ON documentation_items BEGIN
+        DELETE FROM search_index WHERE rowid = OLD.id * 4 + 2;
+        INSERT INTO search_index(rowid, kind, entity_id, project_id, item_id, title, body) VALUES (NEW.id * 4 + 2, 2, NEW.id, NEW.project_id, NEW.id, NEW.title, NEW.description || ' ' || coalesce((SELECT group_concat(value, ' ') FROM json_tree(NEW.generated_content) WHERE type = 'text'), ''));
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS search_items_ad AFTER DELETE ON documentation_items BEGIN
+        DELETE FROM search_index WHERE rowid = OLD.id * 4 + 2;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS search_questions_ai AFTER INSERT ON questions BEGIN
+        INSERT INTO search_index(rowid, kind, entity_id, project_id, item_id, title, body) VALUES (NEW.id * 4 + 3, 3, NEW.id, (SELECT project_id FROM documentation_items WHERE id = NEW.doc_item_id), NEW.doc_item_id, NEW.question_text, coalesce(NEW.answer, ''));
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS search_questions_au AFTER UPDATE OF question_text, answer ON questions BEGIN
+        DELETE FROM search_index WHERE rowid = OLD.id * 4 + 3;
+        INSERT INTO search_index(rowid, kind, entity_id, project_id, item_id, title, body) VALUES (NEW.id * 4 + 3, 3, NEW.id, (SELECT project_id FROM documentation_items WHERE id = NEW.doc_item_id), NEW.doc_item_id, NEW.question_text, coalesce(NEW.answer, ''));
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS search_questions_ad AFTER DELETE ON questions BEGIN
+        DELETE FROM search_index WHERE rowid = OLD.id * 4 + 3;
+    END
+    """,
+]
+
+OLD_BACKFILL_STATEMENTS = [
+    """
+    INSERT INTO search_index(rowid, kind, entity_id, project_id, item_id, title, body) SELECT id * 4 + 1, 1, id, id, NULL, name, description || ' ' || coalesce(client, '') FROM projects
+    """,
+    """
+    INSERT INTO search_index(rowid, kind, entity_id, project_id, item_id, title, body) SELECT id * 4 + 2, 2, id, project_id, id, title, description || ' ' || coalesce((SELECT group_concat(value, ' ') FROM json_tree(documentation_items.generated_content) WHERE type = 'text'), '') FROM documentation_items
+    """,
+    """
+    INSERT INTO search_index(rowid, kind, entity_id, project_id, item_id, title, body) SELECT q.id * 4 + 3, 3, q.id, i.project_id, q.doc_item_id, q.question_text, coalesce(q.answer, '') FROM questions q JOIN documentation_items i ON i.id = q.doc_item_id
+    """,
+]
+
+TRIGGERS = [
+    'search_projects_ai', 'search_projects_au', 'search_projects_ad',
+    'search_items_ai', 'search_items_au', 'search_items_ad',
+    'search_questions_ai', 'search_questions_au', 'search_questions_ad',
+]
+
+
+
+# Frozen copies of app/models/blob.py and search_service.content_text
+
+def _compress(raw):
+    data = zlib.compress(raw, 9)
+    if len(data) < len(raw):
+        return 'zlib', data
+    return 'identity', raw
+
+
+def _decompress(codec, data):
+    return zlib.decompress(data) if codec == 'zlib' else data
+
+
+def _encode_json(value):
+    return json.dumps(value, sort_keys=True, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+
+def _content_text(content):
+    if isinstance(content, str):
+        return content
+    if isinstance(content, dict):
+        content = content.values()
+    elif not isinstance(content, list):
+        return ''
+    return ' '.join(text for text in map(_content_text, content) if text)
+
+
+def _put(conn, raw):
+    digest = hashlib.sha256(raw).hexdigest()
+    codec, data = _compress(raw)
+    conn.execute(
+        sa.text('INSERT OR IGNORE INTO blobs (hash, codec, size, data) VALUES (:hash, :codec, :size, :data)'),
+        {'hash': digest, 'codec': codec, 'size': len(raw), 'data': data}
+    )
+    return digest
+
+
+def _blob(conn, digest):
+    codec, data = conn.execute(
+        sa.text('SELECT codec, data FROM blobs WHERE hash = :hash'), {'hash': digest}
+    ).one()
+    return _decompress(codec, data)
+
+
+def _drop_search_index():
+    for trigger in TRIGGERS:
+        op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+    op.execute("DROP TABLE IF EXISTS search_index")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    conn = op.get_bind()
+
+    # The triggers reference the columns being moved, and batch mode would
+    # drop them anyway when it recreates the tables
+    _drop_search_index()
+
+    op.create_table(
+        'blobs',
+        sa.Column('hash', sa.String(length=64), nullable=False),
+        sa.Column('codec', sa.String(length=16), nullable=False),
+        sa.Column('size', sa.Integer(), nullable=False),
+        sa.Column('data', sa.LargeBinary(), nullable=False),
+        sa.PrimaryKeyConstraint('hash')
+    )
+
+    with op.batch_alter_table('projects') as batch_op:
+        batch_op.add_column(sa.Column('knowledge_base_hash', sa.String(length=64), nullable=True))
+        batch_op.create_foreign_key('fk_projects_knowledge_base_hash_blobs', 'blobs', ['knowledge_base_hash'], ['hash'])
+    with op.batch_alter_table('documentation_items') as batch_op:
+        batch_op.add_column(sa.Column('generated_content_hash', sa.String(length=64), nullable=True))
+        batch_op.create_foreign_key(
+            'fk_documentation_items_generated_content_hash_blobs', 'blobs', ['generated_content_hash'], ['hash']
+        )
+    with op.batch_alter_table('content_revisions') as batch_op:
+        batch_op.add_column(sa.Column('blob_hash', sa.String(length=64), nullable=True))
+        batch_op.create_foreign_key('fk_content_revisions_blob_hash_blobs', 'blobs', ['blob_hash'], ['hash'])
+        batch_op.alter_column('content', existing_type=sa.JSON(), nullable=True)
+
+    # Move the existing values into blobs
+    rows = conn.execute(sa.text(
+        "SELECT id, knowledge_base FROM projects WHERE knowledge_base IS NOT NULL AND knowledge_base != ''"
+    )).all()
+    for project_id, knowledge_base in rows:
+        conn.execute(
+            sa.text('UPDATE projects SET knowledge_base_hash = :hash WHERE id = :id'),
+            {'hash': _put(conn, knowledge_base.encode('utf-8')), 'id': project_id}
+        )
+
+    rows = conn.execute(sa.text(
+        "SELECT id, generated_content FROM documentation_items "
+        "WHERE generated_content IS NOT NULL AND generated_content != 'null'"
+    )).all()
+    for item_id, content in rows:
+        conn.execute(
+            sa.text('UPDATE documentation_items SET generated_content_hash = :hash WHERE id = :id'),
+            {'hash': _put(conn, _encode_json(json.loads(content))), 'id': item_id}
+        )
+
+    rows = conn.execute(sa.text('SELECT id, content FROM content_revisions WHERE is_snapshot')).all()
+    for revision_id, content in rows:
+        conn.execute(
+            sa.text('UPDATE content_revisions SET blob_hash = :hash, content = NULL WHERE id = :id'),
+            {'hash': _put(conn, _encode_json(json.loads(content))), 'id': revision_id}
+        )
+
+    with op.batch_alter_table('projects') as batch_op:
+        batch_op.drop_column('knowledge_base')
+    with op.batch_alter_table('documentation_items') as batch_op:
+        batch_op.drop_column('content_hash')
+        batch_op.drop_column('generated_content')
+
+    for statement in CREATE_STATEMENTS:
+        op.execute(statement)
+    for statement in BACKFILL_STATEMENTS:
+        op.execute(statement)
+    rows = conn.execute(sa.text(
+        'SELECT id, generated_content_hash FROM documentation_items WHERE generated_content_hash IS NOT NULL'
+    )).all()
+    for item_id, digest in rows:
+        conn.execute(
+            sa.text('UPDATE search_index SET content = :content WHERE rowid = :id * 4 + 2'),
+            {'content': _content_text(json.loads(_blob(conn, digest))), 'id': item_id}
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    conn = op.get_bind()
+
+    _drop_search_index()
+
+    with op.batch_alter_table('projects') as batch_op:
+        batch_op.add_column(sa.Column('knowledge_base', sa.Text(), nullable=True))
+    with op.batch_alter_table('documentation_items') as batch_op:
+        batch_op.add_column(sa.Column('generated_content', sa.JSON(), nullable=True))
+        batch_op.add_column(sa.Column('content_hash', sa.String(length=64), nullable=True))
+
+    conn.execute(sa.text("UPDATE projects SET knowledge_base = ''"))
+    rows = conn.execute(sa.text(
+        'SELECT id, knowledge_base_hash FROM projects WHERE knowledge_base_hash IS NOT NULL'
+    )).all()
+    for project_id, digest in rows:
+        conn.execute(
+            sa.text('UPDATE projects SET knowledge_base = :value WHERE id = :id'),
+            {'value': _blob(conn, digest).decode('utf-8'), 'id': project_id}
+        )
+
+    # The blob hash is the content hash the previous revision kept on the item
+    rows = conn.execute(sa.text(
+        'SELECT id, generated_content_hash FROM documentation_items WHERE generated_content_hash IS NOT NULL'
+    )).all()
+    for item_id, digest in rows:
+        conn.execute(
+            sa.text('UPDATE documentation_items SET generated_content = :value, content_hash = :hash WHERE id = :id'),
+            {'value': _blob(conn, digest).decode('utf-8'), 'hash': digest, 'id': item_id}
+        )
+
+    rows = conn.execute(sa.text('SELECT id, blob_hash FROM content_revisions WHERE blob_hash IS NOT NULL')).all()
+    for revision_id, digest in rows:
+        conn.execute(
+            sa.text('UPDATE content_revisions SET content = :value WHERE id = :id'),
+            {'value': _blob(conn, digest).decode('utf-8'), 'id': revision_id}
+        )
+
+    with op.batch_alter_table('content_revisions') as batch_op:
+        batch_op.drop_constraint('fk_content_revisions_blob_hash_blobs', type_='foreignkey')
+        batch_op.drop_column('blob_hash')
+        batch_op.alter_column('content', existing_type=sa.JSON(), nullable=False)
+    with op.batch_alter_table('documentation_items') as batch_op:
+        batch_op.drop_constraint('fk_documentation_items_generated_content_hash_blobs', type_='foreignkey')
+        batch_op.drop_column('generated_content_hash')
+    with op.batch_alter_table('projects') as batch_op:
+        batch_op.drop_constraint('fk_projects_knowledge_base_hash_blobs', type_='foreignkey')
+        batch_op.drop_column('knowledge_base_hash')
+
+    op.drop_table('blobs')
+
+    for statement in OLD_CREATE_STATEMENTS:
+        op.execute(statement)
+    for statement in OLD_BACKFILL_STATEMENTS:
+        op.execute(statement)
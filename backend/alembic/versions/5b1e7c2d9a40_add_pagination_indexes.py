@@ -0,0 +1,32 @@
+"""Add keyset pagination indexes
+
+Revision ID: 5b1e7c2d9a40
+Revises: 339006a91f59
+Create Date: 2026-10-19 09:12:04.118302
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b1e7c2d9a40'
+down_revision: Union[str, Sequence[str], None] = '339006a91f59'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_projects_updated_at_id', 'projects', ['updated_at', 'id'], unique=False)
+    op.create_index('ix_documentation_items_project_created_id', 'documentation_items', ['project_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_questions_item_order_id', 'questions', ['doc_item_id', 'display_order', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_questions_item_order_id', table_name='questions')
+    op.drop_index('ix_documentation_items_project_created_id', table_name='documentation_items')
+    op.drop_index('ix_projects_updated_at_id', table_name='projects')
@@ -0,0 +1,147 @@
+"""Use AUTOINCREMENT ids so archived rows keep their ids
+
+Revision ID: 85017d85c72b
+Revises: 36cd3f1befff
+Create Date: 2026-10-19 16:48:12.503117
+
+"""
+import json
+import zlib
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '85017d85c72b'
+down_revision: Union[str, Sequence[str], None] = '36cd3f1befff'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Projects move between these tables and the archive database with their ids,
+# so an id must never be handed out twice, even after its row has moved away.
+TABLES = ['projects', 'documentation_items', 'questions', 'content_revisions']
+
+# Frozen copy of app/models/search_index.py at this revision
+CREATE_STATEMENTS = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS search_index USING fts5(kind UNINDEXED, entity_id UNINDEXED, project_id UNINDEXED, item_id UNINDEXED, title, body, content, tokenize = 'unicode61 remove_diacritics 2')
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS search_projects_ai AFTER INSERT ON projects BEGIN
+        INSERT INTO search_index(rowid, kind, entity_id, project_id, item_id, title, body) VALUES (NEW.id * 4 + 1, 1, NEW.id, NEW.id, NULL, NEW.name, NEW.description || ' ' || coalesce(NEW.client, ''));
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS search_projects_au AFTER UPDATE OF name, description, client ON projects BEGIN
+        DELETE FROM search_index WHERE rowid = OLD.id * 4 + 1;
+        INSERT INTO search_index(rowid, kind, entity_id, project_id, item_id, title, body) VALUES (NEW.id * 4 + 1, 1, NEW.id, NEW.id, NULL, NEW.name, NEW.description || ' ' || coalesce(NEW.client, ''));
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS search_projects_ad AFTER DELETE ON projects BEGIN
+        DELETE FROM search_index WHERE rowid = OLD.id * 4 + 1;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS search_items_ai AFTER INSERT ON documentation_items BEGIN
+        INSERT INTO search_index(rowid, kind, entity_id, project_id, item_id, title, body) VALUES (NEW.id * 4 + 2, 2, NEW.id, NEW.project_id, NEW.id, NEW.title, NEW.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS search_items_au AFTER UPDATE OF title, description ON documentation_items BEGIN
+        UPDATE search_index SET title = NEW.title, body = NEW.description WHERE rowid = NEW.id * 4 + 2;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS search_items_ad AFTER DELETE ON documentation_items BEGIN
+        DELETE FROM search_index WHERE rowid = OLD.id * 4 + 2;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS search_questions_ai AFTER INSERT ON questions BEGIN
+        INSERT INTO search_index(rowid, kind, entity_id, project_id, item_id, title, body) VALUES (NEW.id * 4 + 3, 3, NEW.id, (SELECT project_id FROM documentation_items WHERE id = NEW.doc_item_id), NEW.doc_item_id, NEW.question_text, coalesce(NEW.answer, ''));
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS search_questions_au AFTER UPDATE OF question_text, answer ON questions BEGIN
+        DELETE FROM search_index WHERE rowid = OLD.id * 4 + 3;
+        INSERT INTO search_index(rowid, kind, entity_id, project_id, item_id, title, body) VALUES (NEW.id * 4 + 3, 3, NEW.id, (SELECT project_id FROM documentation_items WHERE id = NEW.doc_item_id), NEW.doc_item_id, NEW.question_text, coalesce(NEW.answer, ''));
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS search_questions_ad AFTER DELETE ON questions BEGIN
+        DELETE FROM search_index WHERE rowid = OLD.id * 4 + 3;
+    END
+    """,
+]
+
+BACKFILL_STATEMENTS = [
+    """
+    INSERT INTO search_index(rowid, kind, entity_id, project_id, item_id, title, body) SELECT id * 4 + 1, 1, id, id, NULL, name, description || ' ' || coalesce(client, '') FROM projects
+    """,
+    """
+    INSERT INTO search_index(rowid, kind, entity_id, project_id, item_id, title, body) SELECT id * 4 + 2, 2, id, project_id, id, title, description FROM documentation_items
+    """,
+    """
+    INSERT INTO search_index(rowid, kind, entity_id, project_id, item_id, title, body) SELECT q.id * 4 + 3, 3, q.id, i.project_id, q.doc_item_id, q.question_text, coalesce(q.answer, '') FROM questions q JOIN documentation_items i ON i.id = q.doc_item_id
+    """,
+]
+
+TRIGGERS = [
+    'search_projects_ai', 'search_projects_au', 'search_projects_ad',
+    'search_items_ai', 'search_items_au', 'search_items_ad',
+    'search_questions_ai', 'search_questions_au', 'search_questions_ad',
+]
+
+
+# Frozen copy of search_service.content_text
+
+def _content_text(content):
+    if isinstance(content, str):
+        return content
+    if isinstance(content, dict):
+        content = content.values()
+    elif not isinstance(content, list):
+        return ''
+    return ' '.join(text for text in map(_content_text, content) if text)
+
+
+def _recreate_tables(autoincrement):
+    # Batch mode recreates the tables, which drops the search triggers
+    for trigger in TRIGGERS:
+        op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+    op.execute("DROP TABLE IF EXISTS search_index")
+
+    for table in TABLES:
+        with op.batch_alter_table(
+            table, recreate='always', table_kwargs={'sqlite_autoincrement': autoincrement}
+        ):
+            pass
+
+    conn = op.get_bind()
+    for statement in CREATE_STATEMENTS:
+        op.execute(statement)
+    for statement in BACKFILL_STATEMENTS:
+        op.execute(statement)
+    rows = conn.execute(sa.text(
+        'SELECT i.id, b.codec, b.data FROM documentation_items i '
+        'JOIN blobs b ON b.hash = i.generated_content_hash'
+    )).all()
+    for item_id, codec, data in rows:
+        raw = zlib.decompress(data) if codec == 'zlib' else data
+        conn.execute(
+            sa.text('UPDATE search_index SET content = :content WHERE rowid = :id * 4 + 2'),
+            {'content': _content_text(json.loads(raw)), 'id': item_id}
+        )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    _recreate_tables(autoincrement=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    _recreate_tables(autoincrement=False)
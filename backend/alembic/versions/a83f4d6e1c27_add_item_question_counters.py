@@ -0,0 +1,53 @@
+"""Add denormalized question counters to documentation items
+
+Revision ID: a83f4d6e1c27
+Revises: 5b1e7c2d9a40
+Create Date: 2026-10-19 10:03:51.402715
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a83f4d6e1c27'
+down_revision: Union[str, Sequence[str], None] = '5b1e7c2d9a40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('documentation_items') as batch_op:
+        batch_op.add_column(sa.Column('total_questions', sa.Integer(), server_default='0', nullable=False))
+        batch_op.add_column(sa.Column('answered_questions', sa.Integer(), server_default='0', nullable=False))
+        batch_op.add_column(sa.Column('critical_questions', sa.Integer(), server_default='0', nullable=False))
+        batch_op.add_column(sa.Column('critical_answered', sa.Integer(), server_default='0', nullable=False))
+
+    # Backfill from existing questions
+    op.execute("""
+        UPDATE documentation_items SET
+            total_questions = (
+                SELECT COUNT(*) FROM questions WHERE questions.doc_item_id = documentation_items.id),
+            answered_questions = (
+                SELECT COUNT(*) FROM questions
+                WHERE questions.doc_item_id = documentation_items.id AND questions.is_answered),
+            critical_questions = (
+                SELECT COUNT(*) FROM questions
+                WHERE questions.doc_item_id = documentation_items.id AND questions.is_critical),
+            critical_answered = (
+                SELECT COUNT(*) FROM questions
+                WHERE questions.doc_item_id = documentation_items.id
+                AND questions.is_critical AND questions.is_answered)
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('documentation_items') as batch_op:
+        batch_op.drop_column('critical_answered')
+        batch_op.drop_column('critical_questions')
+        batch_op.drop_column('answered_questions')
+        batch_op.drop_column('total_questions')
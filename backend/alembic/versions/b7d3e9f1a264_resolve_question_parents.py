@@ -0,0 +1,121 @@
+"""Resolve conditional question triggers to parent_question_id
+
+Revision ID: b7d3e9f1a264
+Revises: 85017d85c72b
+Create Date: 2026-10-19 18:12:40.118245
+
+"""
+import json
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7d3e9f1a264'
+down_revision: Union[str, Sequence[str], None] = '85017d85c72b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Questions were created with display_order = position in the AI response + 1,
+# which is what trigger_condition.parent_question_index pointed into
+RESOLVE_PARENTS = """
+    UPDATE questions SET parent_question_id = (
+        SELECT parent.id FROM questions AS parent
+        WHERE parent.doc_item_id = questions.doc_item_id
+        AND parent.display_order = json_extract(questions.trigger_condition, '$.parent_question_index') + 1
+    )
+    WHERE parent_question_id IS NULL
+    AND json_extract(questions.trigger_condition, '$.parent_question_index') IS NOT NULL
+"""
+
+COUNT_ALL_QUESTIONS = """
+    UPDATE documentation_items SET
+        total_questions = (
+            SELECT COUNT(*) FROM questions WHERE questions.doc_item_id = documentation_items.id),
+        answered_questions = (
+            SELECT COUNT(*) FROM questions
+            WHERE questions.doc_item_id = documentation_items.id AND questions.is_answered),
+        critical_questions = (
+            SELECT COUNT(*) FROM questions
+            WHERE questions.doc_item_id = documentation_items.id AND questions.is_critical),
+        critical_answered = (
+            SELECT COUNT(*) FROM questions
+            WHERE questions.doc_item_id = documentation_items.id
+            AND questions.is_critical AND questions.is_answered)
+"""
+
+
+def _visible(questions):
+    """Frozen copy of app/services/visibility.py at this revision."""
+    ids = {q['id'] for q in questions}
+    children = {}
+    for q in questions:
+        parent = q['parent_question_id'] if q['parent_question_id'] in ids else None
+        children.setdefault(parent, []).append(q)
+
+    visible = set()
+    stack = list(children.get(None, ()))
+    while stack:
+        parent = stack.pop()
+        visible.add(parent['id'])
+        for child in children.get(parent['id'], ()):
+            if not parent['is_answered'] or parent['answer'] is None:
+                continue
+            required = json.loads(child['trigger_condition'] or '{}').get('required_answer')
+            if required is not None:
+                required = set(required) if isinstance(required, list) else {required}
+                answers = parent['answer'].split(', ') if parent['question_type'] == 'CHECKBOX' else [parent['answer']]
+                if required.isdisjoint(answers):
+                    continue
+            stack.append(child)
+    return [q for q in questions if q['id'] in visible]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Archived projects are upgraded by archive_service (archive schema version 2)
+    op.create_index('ix_questions_parent_question_id', 'questions', ['parent_question_id'])
+    op.execute(RESOLVE_PARENTS)
+    op.execute("""
+        UPDATE questions SET trigger_condition = json_remove(trigger_condition, '$.parent_question_index')
+        WHERE parent_question_id IS NOT NULL
+    """)
+
+    # Hidden questions no longer count toward completion
+    bind = op.get_bind()
+    item_ids = bind.execute(sa.text(
+        "SELECT DISTINCT doc_item_id FROM questions WHERE parent_question_id IS NOT NULL"
+    )).scalars().all()
+    for item_id in item_ids:
+        questions = bind.execute(sa.text("""
+            SELECT id, parent_question_id, question_type, is_critical, is_answered, answer, trigger_condition
+            FROM questions WHERE doc_item_id = :item_id
+        """), {'item_id': item_id}).mappings().all()
+        shown = _visible(questions)
+        bind.execute(sa.text("""
+            UPDATE documentation_items SET total_questions = :total, answered_questions = :answered,
+                critical_questions = :critical, critical_answered = :critical_answered
+            WHERE id = :item_id
+        """), {
+            'item_id': item_id,
+            'total': len(shown),
+            'answered': sum(1 for q in shown if q['is_answered']),
+            'critical': sum(1 for q in shown if q['is_critical']),
+            'critical_answered': sum(1 for q in shown if q['is_critical'] and q['is_answered']),
+        })
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("""
+        UPDATE questions SET trigger_condition = json_set(
+            coalesce(trigger_condition, '{}'), '$.parent_question_index',
+            (SELECT parent.display_order - 1 FROM questions AS parent WHERE parent.id = questions.parent_question_id)
+        )
+        WHERE parent_question_id IS NOT NULL
+    """)
+    op.execute("UPDATE questions SET parent_question_id = NULL")
+    op.execute(COUNT_ALL_QUESTIONS)
+    op.drop_index('ix_questions_parent_question_id', table_name='questions')
@@ -0,0 +1,55 @@
+"""Cascade deletes from projects to items and questions
+
+Revision ID: c2d95e0b7f13
+Revises: a83f4d6e1c27
+Create Date: 2026-10-19 11:20:37.905114
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c2d95e0b7f13'
+down_revision: Union[str, Sequence[str], None] = 'a83f4d6e1c27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# The initial migration created unnamed foreign keys; this convention lets
+# batch mode find them by name when the tables are recreated.
+naming_convention = {
+    "fk": "fk_%(table_name)s_%(column_0_name)s_%(referred_table_name)s",
+}
+
+
+def _replace_foreign_keys(ondelete_items, ondelete_questions, ondelete_parent) -> None:
+    with op.batch_alter_table('documentation_items', naming_convention=naming_convention) as batch_op:
+        batch_op.drop_constraint('fk_documentation_items_project_id_projects', type_='foreignkey')
+        batch_op.create_foreign_key(
+            'fk_documentation_items_project_id_projects', 'projects',
+            ['project_id'], ['id'], ondelete=ondelete_items
+        )
+
+    with op.batch_alter_table('questions', naming_convention=naming_convention) as batch_op:
+        batch_op.drop_constraint('fk_questions_doc_item_id_documentation_items', type_='foreignkey')
+        batch_op.drop_constraint('fk_questions_parent_question_id_questions', type_='foreignkey')
+        batch_op.create_foreign_key(
+            'fk_questions_doc_item_id_documentation_items', 'documentation_items',
+            ['doc_item_id'], ['id'], ondelete=ondelete_questions
+        )
+        batch_op.create_foreign_key(
+            'fk_questions_parent_question_id_questions', 'questions',
+            ['parent_question_id'], ['id'], ondelete=ondelete_parent
+        )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    _replace_foreign_keys('CASCADE', 'CASCADE', 'SET NULL')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    _replace_foreign_keys(None, None, None)
@@ -0,0 +1,31 @@
+"""Add insert sentinel columns to documentation_items and questions
+
+Revision ID: d4f2a7c9e8b1
+Revises: b7d3e9f1a264
+Create Date: 2026-10-19 21:05:37.402118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4f2a7c9e8b1'
+down_revision: Union[str, Sequence[str], None] = 'b7d3e9f1a264'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Archived projects are upgraded by archive_service (archive schema version 3)
+    op.add_column('documentation_items', sa.Column('_sentinel', sa.Integer(), nullable=True))
+    op.add_column('questions', sa.Column('_sentinel', sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('questions', '_sentinel')
+    op.drop_column('documentation_items', '_sentinel')
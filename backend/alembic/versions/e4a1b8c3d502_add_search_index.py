@@ -0,0 +1,106 @@
+"""Add FTS5 search index
+
+Revision ID: e4a1b8c3d502
+Revises: c2d95e0b7f13
+Create Date: 2026-10-19 12:41:09.553870
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4a1b8c3d502'
+down_revision: Union[str, Sequence[str], None] = 'c2d95e0b7f13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Frozen copy of app/models/search_index.py at this revision
+CREATE_STATEMENTS = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS search_index USING fts5(kind UNINDEXED, entity_id UNINDEXED, project_id UNINDEXED, item_id UNINDEXED, title, body, tokenize = 'unicode61 remove_diacritics 2')
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS search_projects_ai AFTER INSERT ON projects BEGIN
+        INSERT INTO search_index(rowid, kind, entity_id, project_id, item_id, title, body) VALUES (NEW.id * 4 + 1, 1, NEW.id, NEW.id, NULL, NEW.name, NEW.description || ' ' || coalesce(NEW.client, ''));
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS search_projects_au AFTER UPDATE OF name, description, client ON projects BEGIN
+        DELETE FROM search_index WHERE rowid = OLD.id * 4 + 1;
+        INSERT INTO search_index(rowid, kind, entity_id, project_id, item_id, title, body) VALUES (NEW.id * 4 + 1, 1, NEW.id, NEW.id, NULL, NEW.name, NEW.description || ' ' || coalesce(NEW.client, ''));
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS search_projects_ad AFTER DELETE ON projects BEGIN
+        DELETE FROM search_index WHERE rowid = OLD.id * 4 + 1;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS search_items_ai AFTER INSERT ON documentation_items BEGIN
+        INSERT INTO search_index(rowid, kind, entity_id, project_id, item_id, title, body) VALUES (NEW.id * 4 + 2, 2, NEW.id, NEW.project_id, NEW.id, NEW.title, NEW.description || ' ' || coalesce((SELECT group_concat(value, ' ') FROM json_tree(NEW.generated_content) WHERE type = 'text'), ''));
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS search_items_au AFTER UPDATE OF title, description, generated_content ON documentation_items BEGIN
+        DELETE FROM search_index WHERE rowid = OLD.id * 4 + 2;
+        INSERT INTO search_index(rowid, kind, entity_id, project_id, item_id, title, body) VALUES (NEW.id * 4 + 2, 2, NEW.id, NEW.project_id, NEW.id, NEW.title, NEW.description || ' ' || coalesce((SELECT group_concat(value, ' ') FROM json_tree(NEW.generated_content) WHERE type = 'text'), ''));
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS search_items_ad AFTER DELETE ON documentation_items BEGIN
+        DELETE FROM search_index WHERE rowid = OLD.id * 4 + 2;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS search_questions_ai AFTER INSERT ON questions BEGIN
+        INSERT INTO search_index(rowid, kind, entity_id, project_id, item_id, title, body) VALUES (NEW.id * 4 + 3, 3, NEW.id, (SELECT project_id FROM documentation_items WHERE id = NEW.doc_item_id), NEW.doc_item_id, NEW.question_text, coalesce(NEW.answer, ''));
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS search_questions_au AFTER UPDATE OF question_text, answer ON questions BEGIN
+        DELETE FROM search_index WHERE rowid = OLD.id * 4 + 3;
+        INSERT INTO search_index(rowid, kind, entity_id, project_id, item_id, title, body) VALUES (NEW.id * 4 + 3, 3, NEW.id, (SELECT project_id FROM documentation_items WHERE id = NEW.doc_item_id), NEW.doc_item_id, NEW.question_text, coalesce(NEW.answer, ''));
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS search_questions_ad AFTER DELETE ON questions BEGIN
+        DELETE FROM search_index WHERE rowid = OLD.id * 4 + 3;
+    END
+    """,
+]
+
+BACKFILL_STATEMENTS = [
+    """
+    INSERT INTO search_index(rowid, kind, entity_id, project_id, item_id, title, body) SELECT id * 4 + 1, 1, id, id, NULL, name, description || ' ' || coalesce(client, '') FROM projects
+    """,
+    """
+    INSERT INTO search_index(rowid, kind, entity_id, project_id, item_id, title, body) SELECT id * 4 + 2, 2, id, project_id, id, title, description || ' ' || coalesce((SELECT group_concat(value, ' ') FROM json_tree(documentation_items.generated_content) WHERE type = 'text'), '') FROM documentation_items
+    """,
+    """
+    INSERT INTO search_index(rowid, kind, entity_id, project_id, item_id, title, body) SELECT q.id * 4 + 3, 3, q.id, i.project_id, q.doc_item_id, q.question_text, coalesce(q.answer, '') FROM questions q JOIN documentation_items i ON i.id = q.doc_item_id
+    """,
+]
+
+TRIGGERS = [
+    'search_projects_ai', 'search_projects_au', 'search_projects_ad',
+    'search_items_ai', 'search_items_au', 'search_items_ad',
+    'search_questions_ai', 'search_questions_au', 'search_questions_ad',
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for statement in CREATE_STATEMENTS:
+        op.execute(statement)
+    for statement in BACKFILL_STATEMENTS:
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for trigger in TRIGGERS:
+        op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+    op.execute("DROP TABLE IF EXISTS search_index")
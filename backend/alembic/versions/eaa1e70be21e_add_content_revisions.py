@@ -0,0 +1,68 @@
+"""Add content revision history
+
+Revision ID: eaa1e70be21e
+Revises: e4a1b8c3d502
+Create Date: 2026-10-19 13:12:08.551930
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'eaa1e70be21e'
+down_revision: Union[str, Sequence[str], None] = 'e4a1b8c3d502'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'content_revisions',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('doc_item_id', sa.Integer(), nullable=False),
+        sa.Column('revision_number', sa.Integer(), nullable=False),
+        sa.Column('source', sa.Enum('GENERATE', 'REGENERATE', 'RESTORE', name='revisionsource'), nullable=False),
+        sa.Column('feedback', sa.Text(), nullable=True),
+        sa.Column('restored_from', sa.Integer(), nullable=True),
+        sa.Column('model', sa.String(length=100), nullable=True),
+        sa.Column('prompt_tokens', sa.Integer(), nullable=True),
+        sa.Column('completion_tokens', sa.Integer(), nullable=True),
+        sa.Column('total_tokens', sa.Integer(), nullable=True),
+        sa.Column('is_snapshot', sa.Boolean(), nullable=False),
+        sa.Column('content', sa.JSON(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['doc_item_id'], ['documentation_items.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('doc_item_id', 'revision_number', name='uq_content_revisions_item_number')
+    )
+    op.create_index(op.f('ix_content_revisions_id'), 'content_revisions', ['id'], unique=False)
+
+    # Plain ADD COLUMN rather than batch mode: recreating documentation_items
+    # would drop its search index triggers
+    op.add_column('documentation_items', sa.Column('revision_count', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('documentation_items', sa.Column('content_hash', sa.String(length=64), nullable=True))
+
+    # Existing content becomes revision 1. content_hash stays NULL, so the next
+    # generation stores a snapshot instead of a diff.
+    op.execute("""
+        INSERT INTO content_revisions (doc_item_id, revision_number, source, is_snapshot, content, created_at)
+        SELECT id, 1, 'GENERATE', 1, generated_content, updated_at
+        FROM documentation_items
+        WHERE generated_content IS NOT NULL AND generated_content != 'null'
+    """)
+    op.execute("""
+        UPDATE documentation_items SET revision_count = 1
+        WHERE generated_content IS NOT NULL AND generated_content != 'null'
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('documentation_items', 'content_hash')
+    op.drop_column('documentation_items', 'revision_count')
+    op.drop_index(op.f('ix_content_revisions_id'), table_name='content_revisions')
+    op.drop_table('content_revisions')
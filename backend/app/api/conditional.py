@@ -0,0 +1,86 @@
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from fastapi import Request, Response
+from typing import Hashable, Iterable, Optional, Tuple
+from app.services.response_cache import CachedResponse, response_cache
+
+# Clients may keep the body but must revalidate before reusing it; without
+# this, browsers apply heuristic freshness to responses with Last-Modified
+CACHE_CONTROL = "no-cache"
+
+
+def make_etag(*parts) -> str:
+    """
+    Build a weak ETag from version fingerprint parts (timestamps, counts, ids).
+
+    Weak, because the fingerprint identifies the data, not the exact bytes.
+    """
+    digest = hashlib.blake2b(repr(parts).encode(), digest_size=12).hexdigest()
+    return f'W/"{digest}"'
+
+
+def check_not_modified(
+    request: Request,
+    response: Response,
+    etag: str,
+    last_modified: Optional[datetime] = None
+) -> Optional[Response]:
+    """
+    Set the validators on response and answer a matching If-None-Match.
+
+    Returns a 304 response to send instead of the body, or None if the client
+    needs the full response. If-Modified-Since is not honoured: its one second
+    resolution would hide edits made within the same second.
+    """
+    headers = {"etag": etag, "cache-control": CACHE_CONTROL}
+    if last_modified is not None:
+        # Timestamps are stored as naive UTC
+        headers["last-modified"] = format_datetime(last_modified.replace(tzinfo=timezone.utc), usegmt=True)
+    response.headers.update(headers)
+
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return None
+
+
+def serve_cached(key: Hashable) -> Optional[Response]:
+    """
+    Answer a GET from the response cache, or return None on a miss.
+
+    key must include the ETag of the data, so an entry is only ever served
+    for the version it was built from.
+    """
+    cached = response_cache.get(key)
+    if cached is None:
+        return None
+    return Response(cached.body, media_type="application/json", headers=cached.headers)
+
+
+def cache_json(
+    key: Hashable,
+    tags: Iterable[Tuple[str, int]],
+    token: int,
+    response: Response,
+    body: bytes
+) -> Response:
+    """
+    Store a serialised JSON body with the headers set on response, and return
+    it as the response.
+
+    Take token from response_cache.token() before reading the data; tags
+    name the entities whose change events must drop the entry.
+    """
+    headers = {name: value for name, value in response.headers.items() if name != "content-length"}
+    response_cache.set(key, CachedResponse(body, headers), tags, token)
+    return Response(body, media_type="application/json", headers=headers)
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against etag."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(","))
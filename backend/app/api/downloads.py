@@ -0,0 +1,31 @@
+import re
+from urllib.parse import quote
+
+
+def sanitize_filename(name: str) -> str:
+    """
+    Sanitize a string for use in a filename.
+    Removes or replaces characters that are invalid in filenames.
+    """
+    # Replace characters that are invalid in filenames
+    invalid_chars = r'[<>:"/\\|?*]'
+    sanitized = re.sub(invalid_chars, '_', name)
+    # Remove leading/trailing spaces and dots
+    sanitized = sanitized.strip(' .')
+    return sanitized
+
+
+def content_disposition(filename: str) -> str:
+    """
+    Content-Disposition header for downloading a file as filename.
+
+    Uses RFC 5987 encoding for non-ASCII characters: filename* carries the
+    UTF-8 name, filename an ASCII fallback.
+    """
+    ascii_filename = filename.encode('ascii', 'replace').decode('ascii')
+    encoded_filename = quote(filename, safe='')
+    return (
+        f"attachment; "
+        f"filename=\"{ascii_filename}\"; "
+        f"filename*=UTF-8''{encoded_filename}"
+    )
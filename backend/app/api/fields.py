@@ -0,0 +1,35 @@
+from fastapi import HTTPException
+from datetime import datetime
+from typing import Iterable, List, Optional
+
+
+def parse_fields(fields: Optional[str], allowed: Iterable[str], default: Iterable[str]) -> List[str]:
+    """
+    Resolve a `fields=` sparse-fieldset parameter into a list of column names.
+
+    `id` is always included. Without the parameter the default projection is
+    used.
+
+    Raises:
+        HTTPException: If an unknown field is requested
+    """
+    if not fields:
+        return list(default)
+
+    requested = [f.strip() for f in fields.split(",") if f.strip()]
+    unknown = [f for f in requested if f not in allowed]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+
+    return ["id"] + [f for f in requested if f != "id"]
+
+
+def serialize_columns(row, columns: List[str]) -> dict:
+    """Serialize only the selected columns of a row."""
+    data = {}
+    for column in columns:
+        value = getattr(row, column)
+        if isinstance(value, datetime):
+            value = value.isoformat()
+        data[column] = value
+    return data
@@ -1,14 +1,17 @@
-from fastapi import APIRouter, Depends, HTTPException
-from fastapi.responses import Response
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import FileResponse, Response, StreamingResponse
 from sqlalchemy.orm import Session
-from typing import Optional
+from typing import Literal, Optional
 from pydantic import BaseModel
-from urllib.parse import quote
-import re
+from app.api.conditional import check_not_modified, make_etag
+from app.api.downloads import content_disposition, sanitize_filename
+from app.compression import DOCX_MEDIA_TYPE
 from app.database import get_db
-from app.services import item_service, project_service, question_service
+from app.services import export_cache, item_service, project_service, question_service, text_export, visibility
 from app.services.ai_service import ai_service
-from app.services.export_service import export_to_word
+from app.services.prerender import prerenderer
+from app.services.render_pool import RenderPoolBusy, RenderTimeout, export_pool, render_docx
+from app.models.enums import ProjectStatus, RevisionSource
 from app.prompts import doc_generation, knowledge_base
 
 router = APIRouter(prefix="/api/items", tags=["generation"])
@@ -41,23 +44,30 @@ def generate_documentation(
     """
     Generate documentation for a documentation item using AI.
     """
-    # Get the item
-    item = item_service.get_item(db, item_id)
+    # Get the item with its project and questions
+    item = item_service.get_item_context(db, item_id)
     if not item:
         raise HTTPException(status_code=404, detail="Documentation item not found")
 
-    # Get the project
-    project = project_service.get_project(db, item.project_id)
+    project = item.project
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
 
-    # Get all questions
-    questions = question_service.get_questions_by_item(db, item_id)
-    if not questions:
+    if project.status == ProjectStatus.ARCHIVED:
+        raise HTTPException(status_code=409, detail="Project is archived; unarchive it to generate documentation")
+
+    if not item.questions:
         raise HTTPException(status_code=400, detail="No questions found for this item")
+    # Hidden conditional questions do not apply and stay out of the prompt
+    questions = visibility.visible_questions(item.questions)
 
     # Check if all critical questions are answered
-    status = question_service.get_completion_status(db, item_id)
+    status = question_service.completion_status(
+        item.total_questions,
+        item.answered_questions,
+        item.critical_questions,
+        item.critical_answered
+    )
     if not status["all_critical_answered"]:
         raise HTTPException(
             status_code=400,
@@ -70,17 +80,30 @@ def generate_documentation(
         user_prompt = doc_generation.get_user_prompt(project, item, questions)
         response_schema = doc_generation.get_response_schema(item.type.value)
 
+        usage = {}
         generated_content = ai_service.generate_structured_response(
             system_prompt=system_prompt,
             user_prompt=user_prompt,
-            response_format=response_schema
+            response_format=response_schema,
+            usage=usage
         )
 
-        # Update the item with generated content
-        item_service.update_generated_content(db, item_id, generated_content)
+        # Collect the Q&A before the commit below expires the loaded questions
+        qa_list = _answered_pairs(questions)
+
+        # Update the item with generated content and record the revision
+        updated = item_service.update_generated_content(
+            db, item_id, generated_content,
+            source=RevisionSource.GENERATE,
+            model=ai_service.model,
+            usage=usage,
+            item=item
+        )
+        # Have the .docx ready by the time it is downloaded
+        prerenderer.schedule(updated, generated_content)
 
         # Update knowledge base
-        _update_knowledge_base(db, project, item, questions, generated_content)
+        _update_knowledge_base(db, project, item, qa_list, generated_content)
 
         return GenerateResponse(
             item_id=item_id,
@@ -101,21 +124,22 @@ def regenerate_documentation(
     """
     Regenerate documentation with user feedback.
     """
-    # Get the item
-    item = item_service.get_item(db, item_id)
+    # Get the item with its project and questions
+    item = item_service.get_item_context(db, item_id)
     if not item:
         raise HTTPException(status_code=404, detail="Documentation item not found")
 
     if not item.generated_content:
         raise HTTPException(status_code=400, detail="No existing documentation to regenerate")
 
-    # Get the project
-    project = project_service.get_project(db, item.project_id)
+    project = item.project
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
 
-    # Get all questions
-    questions = question_service.get_questions_by_item(db, item_id)
+    if project.status == ProjectStatus.ARCHIVED:
+        raise HTTPException(status_code=409, detail="Project is archived; unarchive it to generate documentation")
+
+    questions = visibility.visible_questions(item.questions)
 
     try:
         # Generate documentation with feedback
@@ -125,14 +149,24 @@ def regenerate_documentation(
         )
         response_schema = doc_generation.get_response_schema(item.type.value)
 
+        usage = {}
         generated_content = ai_service.generate_structured_response(
             system_prompt=system_prompt,
             user_prompt=user_prompt,
-            response_format=response_schema
+            response_format=response_schema,
+            usage=usage
         )
 
-        # Update the item with regenerated content
-        item_service.update_generated_content(db, item_id, generated_content)
+        # Update the item with regenerated content and record the revision
+        updated = item_service.update_generated_content(
+            db, item_id, generated_content,
+            source=RevisionSource.REGENERATE,
+            feedback=request.feedback,
+            model=ai_service.model,
+            usage=usage,
+            item=item
+        )
+        prerenderer.schedule(updated, generated_content)
 
         return GenerateResponse(
             item_id=item_id,
@@ -144,40 +178,45 @@ def regenerate_documentation(
         raise HTTPException(status_code=500, detail=f"Failed to regenerate documentation: {str(e)}")
 
 
-def sanitize_filename(name: str) -> str:
-    """
-    Sanitize a string for use in a filename.
-    Removes or replaces characters that are invalid in filenames.
-    """
-    # Replace characters that are invalid in filenames
-    invalid_chars = r'[<>:"/\\|?*]'
-    sanitized = re.sub(invalid_chars, '_', name)
-    # Remove leading/trailing spaces and dots
-    sanitized = sanitized.strip(' .')
-    return sanitized
-
-
 @router.get("/{item_id}/export")
 def export_documentation(
     item_id: int,
+    request: Request,
+    response: Response,
+    format: Literal["docx", "markdown", "html"] = "docx",
     db: Session = Depends(get_db)
 ):
     """
-    Export documentation as Word document (.docx).
+    Export documentation as a Word document (.docx), Markdown or standalone HTML.
+
+    Rendered Word documents are cached on disk by content; an unchanged
+    document is served from its file. Markdown and HTML are cheap enough to
+    render on every request and are streamed. A matching If-None-Match gets
+    a 304 in every format.
     """
-    item = item_service.get_item(db, item_id)
+    # The content is only decoded if the document has to be rendered
+    item = item_service.get_item_context(db, item_id, with_questions=False, with_content=False)
     if not item:
         raise HTTPException(status_code=404, detail="Documentation item not found")
 
-    if not item.generated_content:
+    if not item.generated_content_hash:
         raise HTTPException(status_code=400, detail="No generated content to export")
 
-    # Get the project for filename
-    project = project_service.get_project(db, item.project_id)
+    # The project is loaded with the item and only needed for the filename
+    project = item.project
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
 
-    try:
+    key = export_cache.document_key(item.generated_content_hash, item.title, item.description, item.type.value)
+    if format != "docx":
+        return _export_text(request, response, item, project, key, format)
+
+    not_modified = check_not_modified(request, response, make_etag(key))
+    if not_modified:
+        return not_modified
+
+    cached = export_cache.export_cache.get(key)
+    if cached is None:
         # Prepare item data for export
         item_data = {
             "title": item.title,
@@ -185,40 +224,62 @@ def export_documentation(
             "type": item.type.value
         }
 
-        # Generate Word document
-        buffer = export_to_word(item_data, item.generated_content, item.type.value)
-
-        # Read the complete content from the buffer
-        content = buffer.getvalue()
-
-        # Create filename: project_name - documentation_name.docx
-        project_name = sanitize_filename(project.name)
-        item_title = sanitize_filename(item.title)
-        filename = f"{project_name} - {item_title}.docx"
-
-        # Create Content-Disposition header with RFC 5987 encoding for non-ASCII characters
-        # filename* uses UTF-8 encoding, filename is ASCII fallback
-        ascii_filename = filename.encode('ascii', 'replace').decode('ascii')
-        encoded_filename = quote(filename, safe='')
-
-        content_disposition = (
-            f"attachment; "
-            f"filename=\"{ascii_filename}\"; "
-            f"filename*=UTF-8''{encoded_filename}"
-        )
-
-        # Return as Response with complete content (not streaming)
-        return Response(
-            content=content,
-            media_type="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-            headers={"Content-Disposition": content_disposition}
-        )
-
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to export document: {str(e)}")
-
-
-def _update_knowledge_base(db: Session, project, item, questions, generated_content):
+        # Render the Word document in a worker process, straight into the cache
+        partial = export_cache.export_cache.partial_path(key)
+        try:
+            export_pool.run(render_docx, str(partial), item_data, item.generated_content, item.type.value)
+            cached = export_cache.export_cache.add(key, partial)
+        except RenderPoolBusy:
+            raise HTTPException(
+                status_code=503,
+                detail="Too many exports in progress, try again shortly",
+                headers={"Retry-After": "5"}
+            )
+        except RenderTimeout as e:
+            raise HTTPException(status_code=504, detail=f"Failed to export document: {str(e)}")
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Failed to export document: {str(e)}")
+        finally:
+            partial.unlink(missing_ok=True)
+    path, stat = cached
+
+    # Create filename: project_name - documentation_name.docx
+    project_name = sanitize_filename(project.name)
+    item_title = sanitize_filename(item.title)
+    filename = f"{project_name} - {item_title}.docx"
+
+    # Carry over the validators set by check_not_modified
+    headers = {name: value for name, value in response.headers.items() if name != "content-length"}
+    headers["Content-Disposition"] = content_disposition(filename)
+    return FileResponse(path, stat_result=stat, media_type=DOCX_MEDIA_TYPE, headers=headers)
+
+
+def _export_text(request: Request, response: Response, item, project, key: str, fmt: str):
+    """Stream a Markdown or HTML export of item."""
+    not_modified = check_not_modified(request, response, make_etag(key, fmt, text_export.VERSION))
+    if not_modified:
+        return not_modified
+
+    project_name = sanitize_filename(project.name)
+    item_title = sanitize_filename(item.title)
+    filename = f"{project_name} - {item_title}{text_export.EXTENSIONS[fmt]}"
+
+    headers = {name: value for name, value in response.headers.items() if name != "content-length"}
+    headers["Content-Disposition"] = content_disposition(filename)
+    chunks = text_export.render(item.generated_content, item.type.value, fmt, title=item.title)
+    return StreamingResponse(chunks, media_type=text_export.MEDIA_TYPES[fmt], headers=headers)
+
+
+def _answered_pairs(questions) -> list:
+    """Collect the answered questions as question/answer dicts for the knowledge base prompt."""
+    return [
+        {"question": q.question_text, "answer": q.answer}
+        for q in questions
+        if q.is_answered
+    ]
+
+
+def _update_knowledge_base(db: Session, project, item, qa_list, generated_content):
     """
     Update the project knowledge base after generating documentation.
 
@@ -226,19 +287,10 @@ def _update_knowledge_base(db: Session, project, item, questions, generated_cont
         db: Database session
         project: The project
         item: The documentation item
-        questions: List of questions
+        qa_list: Answered questions as question/answer dicts
         generated_content: The generated documentation
     """
     try:
-        # Prepare Q&A for knowledge base
-        qa_list = []
-        for q in questions:
-            if q.is_answered:
-                qa_list.append({
-                    "question": q.question_text,
-                    "answer": q.answer
-                })
-
         # Generate updated knowledge base using AI
         system_prompt = knowledge_base.get_system_prompt()
         user_prompt = knowledge_base.get_user_prompt(
@@ -254,7 +306,7 @@ def _update_knowledge_base(db: Session, project, item, questions, generated_cont
 
         # Update the project's knowledge base
         new_kb = kb_response["knowledge_base"]
-        project_service.update_knowledge_base(db, project.id, new_kb)
+        project_service.update_knowledge_base(db, project.id, new_kb, project=project)
 
     except Exception as e:
         # Knowledge base update is not critical, just log the error
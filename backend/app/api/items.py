@@ -1,13 +1,18 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.orm import Session
 from typing import Optional, List
 from pydantic import BaseModel
 from datetime import date
 from app.database import get_db
-from app.services import item_service, project_service, question_service
+from app.services import events, item_service, project_service, question_service
 from app.services.ai_service import ai_service
+from app.services.pagination import InvalidCursorError, MAX_PAGE_SIZE
+from app.services.response_cache import response_cache
+from app.api.conditional import cache_json, check_not_modified, make_etag, serve_cached
+from app.api.fields import parse_fields, serialize_columns
+from app.api.responses import Timestamp, dump_json, render
 from app.prompts import question_generation
-from app.models.enums import DocumentationItemStatus, DocumentationType, QuestionType
+from app.models.enums import DocumentationItemStatus, DocumentationType, ProjectStatus, QuestionType
 
 router = APIRouter(prefix="/api", tags=["documentation_items"])
 
@@ -38,32 +43,86 @@ class ItemResponse(BaseModel):
     status: DocumentationItemStatus
     deadline: Optional[date]
     generated_content: Optional[dict]
-    created_at: str
-    updated_at: str
+    created_at: Timestamp
+    updated_at: Timestamp
 
 
-@router.get("/projects/{project_id}/items", response_model=List[ItemResponse])
+class ItemSummaryResponse(BaseModel):
+    """Documentation item list entry. Fields left out of the projection are omitted."""
+    id: int
+    project_id: Optional[int] = None
+    type: Optional[DocumentationType] = None
+    title: Optional[str] = None
+    description: Optional[str] = None
+    status: Optional[DocumentationItemStatus] = None
+    deadline: Optional[date] = None
+    generated_content: Optional[dict] = None
+    total_questions: Optional[int] = None
+    answered_questions: Optional[int] = None
+    critical_questions: Optional[int] = None
+    critical_answered: Optional[int] = None
+    created_at: Optional[str] = None
+    updated_at: Optional[str] = None
+
+
+# generated_content is only needed on the item page, so lists skip it by default
+SUMMARY_FIELDS = [
+    "id", "project_id", "type", "title", "description", "status", "deadline",
+    "total_questions", "answered_questions", "critical_questions", "critical_answered",
+    "created_at", "updated_at"
+]
+
+@router.get(
+    "/projects/{project_id}/items",
+    response_model=List[ItemSummaryResponse],
+    response_model_exclude_unset=True
+)
 def list_items(
     project_id: int,
+    request: Request,
+    response: Response,
+    cursor: Optional[str] = Query(None),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    include_total: bool = Query(False),
+    fields: Optional[str] = Query(None),
     db: Session = Depends(get_db)
 ):
-    """List all documentation items for a project."""
-    items = item_service.get_items_by_project(db, project_id)
-    return [
-        ItemResponse(
-            id=item.id,
-            project_id=item.project_id,
-            type=item.type,
-            title=item.title,
-            description=item.description,
-            status=item.status,
-            deadline=item.deadline,
-            generated_content=item.generated_content,
-            created_at=item.created_at.isoformat(),
-            updated_at=item.updated_at.isoformat()
+    """
+    List documentation items for a project, newest first.
+
+    Supports the same cursor pagination and `fields` projection as the
+    project list. A matching If-None-Match is answered with 304, otherwise the
+    response cache is used when possible.
+    """
+    columns = parse_fields(fields, ItemSummaryResponse.model_fields, SUMMARY_FIELDS)
+    token = response_cache.token()
+    count, last_id, last_modified = item_service.get_items_version(db, project_id)
+    etag = make_etag(count, last_id, last_modified)
+    not_modified = check_not_modified(request, response, etag, last_modified)
+    if not_modified:
+        return not_modified
+    key = ("items", project_id, request.url.query, etag)
+    cached = serve_cached(key)
+    if cached:
+        return cached
+
+    try:
+        items, next_cursor = item_service.get_items_page(
+            db, project_id, cursor=cursor, limit=limit, columns=columns
         )
-        for item in items
-    ]
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    if include_total:
+        response.headers["X-Total-Count"] = str(item_service.count_items(db, project_id))
+
+    rows = [serialize_columns(item, columns) for item in items]
+    body = dump_json(List[ItemSummaryResponse], rows, exclude_unset=True)
+    tags = [(events.PROJECT, project_id), (events.PROJECT_ITEMS, project_id)]
+    tags += [(events.ITEM, item.id) for item in items]
+    return cache_json(key, tags, token, response, body)
 
 
 @router.post("/projects/{project_id}/items", response_model=ItemResponse, status_code=201)
@@ -79,6 +138,8 @@ def create_item(
     project = project_service.get_project(db, project_id)
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
+    if project.status == ProjectStatus.ARCHIVED:
+        raise HTTPException(status_code=409, detail="Project is archived; unarchive it to add items")
 
     # Create the item
     new_item = item_service.create_item(
@@ -118,12 +179,12 @@ def create_item(
 
             # Handle conditional questions
             if q_data.get("parent_question_index") is not None:
-                # Parent question index is 0-based in AI response
+                # Parent question index is 0-based in AI response; the batch
+                # insert resolves it to parent_question_id
                 parent_idx = q_data["parent_question_index"]
                 if parent_idx < len(questions_data):
-                    # Store trigger condition
+                    question_data["parent_question_index"] = parent_idx
                     question_data["trigger_condition"] = {
-                        "parent_question_index": parent_idx,
                         "required_answer": q_data.get("required_answer")
                     }
 
@@ -140,45 +201,42 @@ def create_item(
         print(f"Failed to generate questions: {str(e)}")
         # Item stays in DRAFT status
 
-    # Refresh to get latest state
-    db.refresh(new_item)
-
-    return ItemResponse(
-        id=new_item.id,
-        project_id=new_item.project_id,
-        type=new_item.type,
-        title=new_item.title,
-        description=new_item.description,
-        status=new_item.status,
-        deadline=new_item.deadline,
-        generated_content=new_item.generated_content,
-        created_at=new_item.created_at.isoformat(),
-        updated_at=new_item.updated_at.isoformat()
-    )
+    return render(ItemResponse, new_item, status_code=201)
 
 
 @router.get("/items/{item_id}", response_model=ItemResponse)
 def get_item(
     item_id: int,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db)
 ):
-    """Get a specific documentation item by ID."""
+    """
+    Get a specific documentation item by ID.
+
+    A matching If-None-Match is answered with 304 before the item is loaded,
+    otherwise the response cache is used when possible.
+    """
+    token = response_cache.token()
+    version = item_service.get_item_version(db, item_id)
+    if version is None:
+        raise HTTPException(status_code=404, detail="Documentation item not found")
+    etag = make_etag(version)
+    not_modified = check_not_modified(request, response, etag, version)
+    if not_modified:
+        return not_modified
+    key = ("item", item_id, etag)
+    cached = serve_cached(key)
+    if cached:
+        return cached
+
     item = item_service.get_item(db, item_id)
     if not item:
         raise HTTPException(status_code=404, detail="Documentation item not found")
 
-    return ItemResponse(
-        id=item.id,
-        project_id=item.project_id,
-        type=item.type,
-        title=item.title,
-        description=item.description,
-        status=item.status,
-        deadline=item.deadline,
-        generated_content=item.generated_content,
-        created_at=item.created_at.isoformat(),
-        updated_at=item.updated_at.isoformat()
-    )
+    body = dump_json(ItemResponse, item)
+    tags = [(events.PROJECT, item.project_id), (events.ITEM, item_id)]
+    return cache_json(key, tags, token, response, body)
 
 
 @router.put("/items/{item_id}", response_model=ItemResponse)
@@ -199,18 +257,7 @@ def update_item(
     if not updated:
         raise HTTPException(status_code=404, detail="Documentation item not found")
 
-    return ItemResponse(
-        id=updated.id,
-        project_id=updated.project_id,
-        type=updated.type,
-        title=updated.title,
-        description=updated.description,
-        status=updated.status,
-        deadline=updated.deadline,
-        generated_content=updated.generated_content,
-        created_at=updated.created_at.isoformat(),
-        updated_at=updated.updated_at.isoformat()
-    )
+    return render(ItemResponse, updated)
 
 
 @router.delete("/items/{item_id}", status_code=204)
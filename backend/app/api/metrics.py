@@ -0,0 +1,23 @@
+from fastapi import APIRouter
+from pydantic import BaseModel
+from app.services.response_cache import response_cache
+
+router = APIRouter(prefix="/api/metrics", tags=["metrics"])
+
+
+# Pydantic schemas
+class CacheStatsResponse(BaseModel):
+    hits: int
+    misses: int
+    hit_rate: float
+    evictions: int
+    expirations: int
+    invalidations: int
+    entries: int
+    bytes: int
+
+
+@router.get("/cache", response_model=CacheStatsResponse)
+def cache_stats():
+    """Hit rate and counters of this worker's response cache."""
+    return response_cache.stats()
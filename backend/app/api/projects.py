@@ -1,9 +1,19 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+import tempfile
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from typing import Optional, List
 from pydantic import BaseModel
 from app.database import get_db
-from app.services import project_service
+from app.services import events, export_bundle, project_service, transfer_service
+from app.services.response_cache import response_cache
+from app.services.pagination import InvalidCursorError, MAX_PAGE_SIZE
+from app.services.transfer_service import InvalidDumpError
+from app.api.conditional import cache_json, check_not_modified, make_etag, serve_cached
+from app.api.downloads import content_disposition, sanitize_filename
+from app.api.fields import parse_fields, serialize_columns
+from app.api.responses import Timestamp, dump_json, render
 from app.models.enums import ProjectStatus
 
 router = APIRouter(prefix="/api/projects", tags=["projects"])
@@ -33,30 +43,83 @@ class ProjectResponse(BaseModel):
     client: Optional[str]
     status: ProjectStatus
     knowledge_base: str
-    created_at: str
-    updated_at: str
+    created_at: Timestamp
+    updated_at: Timestamp
 
 
-@router.get("", response_model=List[ProjectResponse])
+class ProjectSummaryResponse(BaseModel):
+    """Project list entry. Fields left out of the projection are omitted."""
+    id: int
+    name: Optional[str] = None
+    description: Optional[str] = None
+    client: Optional[str] = None
+    status: Optional[ProjectStatus] = None
+    knowledge_base: Optional[str] = None
+    created_at: Optional[str] = None
+    updated_at: Optional[str] = None
+
+
+# knowledge_base is only shown on the detail page, so lists skip it by default
+SUMMARY_FIELDS = ["id", "name", "description", "client", "status", "created_at", "updated_at"]
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+# Uploaded dumps are buffered in memory up to this size, then on disk
+LOAD_SPOOL_BYTES = 8 * 1024 * 1024
+
+
+@router.get(
+    "",
+    response_model=List[ProjectSummaryResponse],
+    response_model_exclude_unset=True
+)
 def list_projects(
+    request: Request,
+    response: Response,
     status: Optional[ProjectStatus] = Query(None),
+    cursor: Optional[str] = Query(None),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    include_total: bool = Query(False),
+    fields: Optional[str] = Query(None),
     db: Session = Depends(get_db)
 ):
-    """List all projects, optionally filtered by status."""
-    projects = project_service.get_projects(db, status=status)
-    return [
-        ProjectResponse(
-            id=p.id,
-            name=p.name,
-            description=p.description,
-            client=p.client,
-            status=p.status,
-            knowledge_base=p.knowledge_base,
-            created_at=p.created_at.isoformat(),
-            updated_at=p.updated_at.isoformat()
+    """
+    List projects, optionally filtered by status.
+
+    Pass `limit` to page through results; the cursor for the next page is
+    returned in the X-Next-Cursor header and `include_total` adds X-Total-Count.
+    `fields` is a comma-separated list of columns to return instead of the
+    default summary (e.g. `fields=name,knowledge_base`). A matching
+    If-None-Match is answered with 304, otherwise the response cache is used
+    when possible.
+    """
+    columns = parse_fields(fields, ProjectSummaryResponse.model_fields, SUMMARY_FIELDS)
+    token = response_cache.token()
+    count, last_id, last_modified = project_service.get_projects_version(db, status=status)
+    etag = make_etag(count, last_id, last_modified)
+    not_modified = check_not_modified(request, response, etag, last_modified)
+    if not_modified:
+        return not_modified
+    key = ("projects", request.url.query, etag)
+    cached = serve_cached(key)
+    if cached:
+        return cached
+
+    try:
+        projects, next_cursor = project_service.get_projects_page(
+            db, status=status, cursor=cursor, limit=limit, columns=columns
         )
-        for p in projects
-    ]
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    if include_total:
+        response.headers["X-Total-Count"] = str(project_service.count_projects(db, status=status))
+
+    rows = [serialize_columns(p, columns) for p in projects]
+    body = dump_json(List[ProjectSummaryResponse], rows, exclude_unset=True)
+    return cache_json(key, [(events.PROJECT, p.id) for p in projects], token, response, body)
 
 
 @router.post("", response_model=ProjectResponse, status_code=201)
@@ -72,38 +135,103 @@ def create_project(
         client=project.client,
         status=project.status
     )
-    return ProjectResponse(
-        id=new_project.id,
-        name=new_project.name,
-        description=new_project.description,
-        client=new_project.client,
-        status=new_project.status,
-        knowledge_base=new_project.knowledge_base,
-        created_at=new_project.created_at.isoformat(),
-        updated_at=new_project.updated_at.isoformat()
+    return render(ProjectResponse, new_project, status_code=201)
+
+
+@router.post("/load", response_model=ProjectResponse, status_code=201)
+async def load_project(request: Request, db: Session = Depends(get_db)):
+    """
+    Create a new project from an NDJSON dump sent as the request body.
+
+    The project and everything in it get new ids.
+    """
+    with tempfile.SpooledTemporaryFile(max_size=LOAD_SPOOL_BYTES) as dump:
+        async for chunk in request.stream():
+            dump.write(chunk)
+        dump.seek(0)
+        try:
+            project = await run_in_threadpool(transfer_service.load_project, db, dump)
+        except InvalidDumpError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    return render(ProjectResponse, project, status_code=201)
+
+
+@router.get("/{project_id}/dump")
+def dump_project(
+    project_id: int,
+    db: Session = Depends(get_db)
+):
+    """
+    Stream a project with its items and their questions as NDJSON, for
+    backup or for loading into another instance with POST /load.
+    """
+    lines = transfer_service.dump_project(db, project_id)
+    if lines is None:
+        raise HTTPException(status_code=404, detail="Project not found")
+    return StreamingResponse(
+        lines,
+        media_type=NDJSON_MEDIA_TYPE,
+        headers={"Content-Disposition": f'attachment; filename="project-{project_id}.ndjson"'}
+    )
+
+
+@router.get("/{project_id}/export")
+def export_project(
+    project_id: int,
+    db: Session = Depends(get_db)
+):
+    """
+    Export every generated document of a project as a ZIP of Word files.
+
+    Documents are rendered in parallel and streamed into the ZIP as they
+    finish; entries are named like single-item exports.
+    """
+    project = project_service.get_project(db, project_id)
+    if not project:
+        raise HTTPException(status_code=404, detail="Project not found")
+    if project.status == ProjectStatus.ARCHIVED:
+        raise HTTPException(status_code=409, detail="Project is archived; unarchive it to export documentation")
+
+    chunks = export_bundle.project_bundle(db, project_id, lambda item: f"{sanitize_filename(item.title)}.docx")
+    return StreamingResponse(
+        chunks,
+        media_type="application/zip",
+        headers={"Content-Disposition": content_disposition(f"{sanitize_filename(project.name)}.zip")}
     )
 
 
 @router.get("/{project_id}", response_model=ProjectResponse)
 def get_project(
     project_id: int,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db)
 ):
-    """Get a specific project by ID."""
+    """
+    Get a specific project by ID.
+
+    A matching If-None-Match is answered with 304 before the project is
+    loaded, otherwise the response cache is used when possible.
+    """
+    token = response_cache.token()
+    version = project_service.get_project_version(db, project_id)
+    if version is None:
+        raise HTTPException(status_code=404, detail="Project not found")
+    etag = make_etag(version)
+    not_modified = check_not_modified(request, response, etag, version)
+    if not_modified:
+        return not_modified
+    key = ("project", project_id, etag)
+    cached = serve_cached(key)
+    if cached:
+        return cached
+
     project = project_service.get_project(db, project_id)
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
 
-    return ProjectResponse(
-        id=project.id,
-        name=project.name,
-        description=project.description,
-        client=project.client,
-        status=project.status,
-        knowledge_base=project.knowledge_base,
-        created_at=project.created_at.isoformat(),
-        updated_at=project.updated_at.isoformat()
-    )
+    body = dump_json(ProjectResponse, project)
+    return cache_json(key, [(events.PROJECT, project_id)], token, response, body)
 
 
 @router.put("/{project_id}", response_model=ProjectResponse)
@@ -124,16 +252,7 @@ def update_project(
     if not updated:
         raise HTTPException(status_code=404, detail="Project not found")
 
-    return ProjectResponse(
-        id=updated.id,
-        name=updated.name,
-        description=updated.description,
-        client=updated.client,
-        status=updated.status,
-        knowledge_base=updated.knowledge_base,
-        created_at=updated.created_at.isoformat(),
-        updated_at=updated.updated_at.isoformat()
-    )
+    return render(ProjectResponse, updated)
 
 
 @router.delete("/{project_id}", status_code=204)
@@ -157,13 +276,4 @@ def toggle_archive(
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
 
-    return ProjectResponse(
-        id=project.id,
-        name=project.name,
-        description=project.description,
-        client=project.client,
-        status=project.status,
-        knowledge_base=project.knowledge_base,
-        created_at=project.created_at.isoformat(),
-        updated_at=project.updated_at.isoformat()
-    )
+    return render(ProjectResponse, project)
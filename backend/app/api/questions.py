@@ -1,9 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from pydantic import BaseModel
 from app.database import get_db
-from app.services import question_service
+from app.services import events, question_service
+from app.services.response_cache import response_cache
+from app.services.pagination import InvalidCursorError, MAX_PAGE_SIZE
+from app.api.conditional import cache_json, check_not_modified, make_etag, serve_cached
+from app.api.responses import dump_json, render
 from app.models.enums import QuestionType
 
 router = APIRouter(prefix="/api", tags=["questions"])
@@ -14,6 +18,15 @@ class AnswerUpdate(BaseModel):
     answer: str
 
 
+class AnswerItem(BaseModel):
+    question_id: int
+    answer: str
+
+
+class BatchAnswerUpdate(BaseModel):
+    answers: List[AnswerItem]
+
+
 class QuestionResponse(BaseModel):
     model_config = {"from_attributes": True}
 
@@ -28,6 +41,8 @@ class QuestionResponse(BaseModel):
     answer: str | None
     is_answered: bool
     trigger_condition: dict | None
+    # Conditional questions are hidden until their parent has the required answer
+    is_visible: bool
 
 
 class CompletionStatusResponse(BaseModel):
@@ -39,29 +54,58 @@ class CompletionStatusResponse(BaseModel):
     all_answered: bool
 
 
+class BatchAnswerResponse(BaseModel):
+    questions: List[QuestionResponse]
+    status: CompletionStatusResponse
+
+
 @router.get("/items/{item_id}/questions", response_model=List[QuestionResponse])
 def list_questions(
     item_id: int,
+    request: Request,
+    response: Response,
+    cursor: Optional[str] = Query(None),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    include_total: bool = Query(False),
     db: Session = Depends(get_db)
 ):
-    """Get all questions for a documentation item."""
-    questions = question_service.get_questions_by_item(db, item_id)
-    return [
-        QuestionResponse(
-            id=q.id,
-            doc_item_id=q.doc_item_id,
-            parent_question_id=q.parent_question_id,
-            question_text=q.question_text,
-            question_type=q.question_type,
-            options=q.options,
-            is_critical=q.is_critical,
-            display_order=q.display_order,
-            answer=q.answer,
-            is_answered=q.is_answered,
-            trigger_condition=q.trigger_condition
+    """
+    Get the questions for a documentation item in display order.
+
+    Supports the same cursor pagination as the project list. A matching
+    If-None-Match is answered with 304 before any question is loaded,
+    otherwise the response cache is used when possible.
+    """
+    token = response_cache.token()
+    version = question_service.get_questions_version(db, item_id)
+    etag = make_etag(version)
+    not_modified = check_not_modified(request, response, etag, version[0] if version else None)
+    if not_modified:
+        return not_modified
+    key = ("questions", item_id, request.url.query, etag)
+    cached = serve_cached(key)
+    if cached:
+        return cached
+
+    try:
+        questions, next_cursor = question_service.get_questions_page(
+            db, item_id, cursor=cursor, limit=limit
         )
-        for q in questions
-    ]
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    if include_total:
+        response.headers["X-Total-Count"] = str(question_service.count_questions(db, item_id))
+
+    if version is None:
+        # Unknown items are not cached: they have no version to key the entry by
+        return questions
+
+    _, _, project_id = version
+    tags = [(events.PROJECT, project_id), (events.ITEM, item_id)]
+    return cache_json(key, tags, token, response, dump_json(List[QuestionResponse], questions))
 
 
 @router.put("/questions/{question_id}", response_model=QuestionResponse)
@@ -75,19 +119,7 @@ def update_answer(
     if not updated:
         raise HTTPException(status_code=404, detail="Question not found")
 
-    return QuestionResponse(
-        id=updated.id,
-        doc_item_id=updated.doc_item_id,
-        parent_question_id=updated.parent_question_id,
-        question_text=updated.question_text,
-        question_type=updated.question_type,
-        options=updated.options,
-        is_critical=updated.is_critical,
-        display_order=updated.display_order,
-        answer=updated.answer,
-        is_answered=updated.is_answered,
-        trigger_condition=updated.trigger_condition
-    )
+    return render(QuestionResponse, updated)
 
 
 @router.post("/items/{item_id}/validate", response_model=CompletionStatusResponse)
@@ -98,3 +130,24 @@ def validate_completeness(
     """Check if all critical questions are answered and if ready for generation."""
     status = question_service.get_completion_status(db, item_id)
     return CompletionStatusResponse(**status)
+
+
+@router.patch("/items/{item_id}/answers", response_model=BatchAnswerResponse)
+def update_answers(
+    item_id: int,
+    batch: BatchAnswerUpdate,
+    db: Session = Depends(get_db)
+):
+    """
+    Update several answers of a documentation item at once.
+
+    Returns the changed questions together with the new completion status so
+    clients can update their cache without refetching.
+    """
+    answers = {a.question_id: a.answer for a in batch.answers}
+    result = question_service.update_answers_batch(db, item_id, answers)
+    if result is None:
+        raise HTTPException(status_code=404, detail="Question not found for this item")
+
+    updated, status = result
+    return render(BatchAnswerResponse, {"questions": updated, "status": status})
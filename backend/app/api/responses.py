@@ -0,0 +1,72 @@
+"""
+Fast path for serialising API responses.
+
+A router that builds `ItemResponse(...)` by hand and returns it under
+`response_model=ItemResponse` pays for validation twice: once building the
+model, and again when FastAPI checks the returned value against the response
+model. render() validates the ORM object once, from its attributes, and
+returns an ORJSONResponse, which FastAPI sends as is. Routers keep declaring
+response_model for the OpenAPI schema.
+"""
+from datetime import datetime
+from functools import lru_cache
+from typing import Annotated, Any, Mapping, Optional
+import orjson
+from fastapi.responses import JSONResponse
+from pydantic import BeforeValidator, TypeAdapter
+
+
+def _isoformat(value):
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+# A timestamp sent as its ISO 8601 string; validates straight from the model's datetime
+Timestamp = Annotated[str, BeforeValidator(_isoformat)]
+
+
+def _dumps(content: Any) -> bytes:
+    return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
+class ORJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson."""
+
+    def render(self, content: Any) -> bytes:
+        return _dumps(content)
+
+
+@lru_cache(maxsize=None)
+def _adapter(schema) -> TypeAdapter:
+    return TypeAdapter(schema)
+
+
+def to_jsonable(schema, obj, exclude_unset: bool = False):
+    """
+    Validate obj against schema (a model or a type such as List[Model]) and
+    return it as plain data for orjson.
+
+    ORM objects are read through their attributes.
+    """
+    adapter = _adapter(schema)
+    value = adapter.validate_python(obj, from_attributes=True)
+    return adapter.dump_python(value, exclude_unset=exclude_unset)
+
+
+def dump_json(schema, obj, exclude_unset: bool = False) -> bytes:
+    """Validate obj against schema and serialise it to JSON bytes."""
+    return _dumps(to_jsonable(schema, obj, exclude_unset))
+
+
+def render(
+    schema,
+    obj,
+    status_code: int = 200,
+    headers: Optional[Mapping[str, str]] = None
+) -> ORJSONResponse:
+    """
+    Validate obj against schema and return it as the response.
+
+    The route decorator's status_code does not apply to a returned response,
+    so pass it here.
+    """
+    return ORJSONResponse(to_jsonable(schema, obj), status_code=status_code, headers=headers)
@@ -0,0 +1,93 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy.orm import Session
+from typing import List, Optional
+from datetime import datetime
+from pydantic import BaseModel
+from app.database import get_db
+from app.services import item_service, revision_service
+from app.services.pagination import InvalidCursorError, MAX_PAGE_SIZE
+from app.services.prerender import prerenderer
+from app.api.responses import ORJSONResponse, to_jsonable
+from app.models.enums import RevisionSource
+
+router = APIRouter(prefix="/api/items", tags=["revisions"])
+
+
+# Pydantic schemas
+class RevisionSummaryResponse(BaseModel):
+    model_config = {"from_attributes": True}
+
+    revision_number: int
+    source: RevisionSource
+    feedback: Optional[str]
+    restored_from: Optional[int]
+    model: Optional[str]
+    prompt_tokens: Optional[int]
+    completion_tokens: Optional[int]
+    total_tokens: Optional[int]
+    created_at: datetime
+
+
+class RevisionResponse(RevisionSummaryResponse):
+    content: dict
+
+
+@router.get("/{item_id}/revisions", response_model=List[RevisionSummaryResponse])
+def list_revisions(
+    item_id: int,
+    response: Response,
+    cursor: Optional[str] = Query(None),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    db: Session = Depends(get_db)
+):
+    """
+    Get the generation history of a documentation item, newest first.
+
+    Supports the same cursor pagination as the project list.
+    """
+    try:
+        revisions, next_cursor = revision_service.get_revisions_page(
+            db, item_id, cursor=cursor, limit=limit
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return revisions
+
+
+@router.get("/{item_id}/revisions/{revision_number}", response_model=RevisionResponse)
+def get_revision(
+    item_id: int,
+    revision_number: int,
+    db: Session = Depends(get_db)
+):
+    """Get one revision with its full generated content."""
+    found = revision_service.get_revision(db, item_id, revision_number)
+    if not found:
+        raise HTTPException(status_code=404, detail="Revision not found")
+
+    revision, content = found
+    # The content is decoded from its blob and needs no validation
+    return ORJSONResponse({**to_jsonable(RevisionSummaryResponse, revision), "content": content})
+
+
+@router.post("/{item_id}/revisions/{revision_number}/restore", response_model=RevisionResponse)
+def restore_revision(
+    item_id: int,
+    revision_number: int,
+    db: Session = Depends(get_db)
+):
+    """
+    Make an earlier revision the current generated content.
+
+    No AI call is made; the restore is recorded as a new revision.
+    """
+    item = item_service.restore_revision(db, item_id, revision_number)
+    if not item:
+        raise HTTPException(status_code=404, detail="Revision not found")
+
+    response = get_revision(item_id, item.revision_count, db)
+    prerenderer.schedule(item, item.generated_content)
+    return response
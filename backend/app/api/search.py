@@ -0,0 +1,48 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy.orm import Session
+from typing import Literal, List, Optional
+from pydantic import BaseModel
+from app.database import get_db
+from app.services import search_service
+from app.services.pagination import InvalidCursorError, MAX_PAGE_SIZE
+
+router = APIRouter(prefix="/api/search", tags=["search"])
+
+
+# Pydantic schemas
+class SearchResult(BaseModel):
+    type: str
+    id: int
+    project_id: Optional[int]
+    item_id: Optional[int]
+    title: str
+    snippet: str
+    score: float
+
+
+@router.get("", response_model=List[SearchResult])
+def search(
+    response: Response,
+    q: str = Query(..., min_length=1),
+    type: Optional[Literal["project", "item", "question"]] = Query(None),
+    project_id: Optional[int] = Query(None),
+    cursor: Optional[str] = Query(None),
+    limit: int = Query(20, ge=1, le=MAX_PAGE_SIZE),
+    db: Session = Depends(get_db)
+):
+    """
+    Search projects, documentation items, questions and generated documents.
+
+    `title` and `snippet` are HTML-escaped, with matches wrapped in <mark>
+    tags. The cursor for the next page is returned in the X-Next-Cursor header.
+    """
+    try:
+        results, next_cursor = search_service.search(
+            db, q, kind=type, project_id=project_id, cursor=cursor, limit=limit
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return results
@@ -0,0 +1,28 @@
+"""
+Move projects with the Archived status into the archive database.
+
+Projects archived through the API are moved immediately; this sweeps the ones
+archived before the archive existed.
+
+Usage:
+    python -m app.commands.archive_projects
+"""
+from app.database import SessionLocal, engine
+from app.services import archive_service
+
+
+def main():
+    archive_service.create_schema(engine)
+    db = SessionLocal()
+    try:
+        project_ids = archive_service.get_archived_project_ids(db)
+        for project_id in project_ids:
+            archive_service.archive_project(db, project_id)
+            db.commit()
+        print(f"Archived {len(project_ids)} project(s)")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,21 @@
+"""
+Delete stored documents no longer referenced by any item, project or revision.
+
+Usage:
+    python -m app.commands.collect_blobs
+"""
+from app.database import SessionLocal
+from app.services import blob_service
+
+
+def main():
+    db = SessionLocal()
+    try:
+        count = blob_service.collect_garbage(db)
+        print(f"Deleted {count} unreferenced blob(s)")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,21 @@
+"""
+Write .br and .gz variants of the built frontend assets.
+
+The server does this on startup too; run it in the build instead to keep the
+first start fast.
+
+Usage:
+    python -m app.commands.precompress_static [directory]
+"""
+import sys
+from pathlib import Path
+from app.compression import precompress
+
+
+def main():
+    directory = Path(sys.argv[1]) if len(sys.argv) > 1 else Path(__file__).parents[2] / "static"
+    print(f"Wrote {precompress(directory)} precompressed file(s) in {directory}")
+
+
+if __name__ == "__main__":
+    main()
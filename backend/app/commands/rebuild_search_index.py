@@ -0,0 +1,21 @@
+"""
+Rebuild the full-text search index from the base tables.
+
+Usage:
+    python -m app.commands.rebuild_search_index
+"""
+from app.database import SessionLocal
+from app.services import search_service
+
+
+def main():
+    db = SessionLocal()
+    try:
+        count = search_service.rebuild_index(db)
+        print(f"Indexed {count} row(s)")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,26 @@
+"""
+Recompute the denormalized question counters on documentation items.
+
+Usage:
+    python -m app.commands.repair_counters [--item-id ID]
+"""
+import argparse
+from app.database import SessionLocal
+from app.services import question_service
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Repair documentation item question counters.")
+    parser.add_argument("--item-id", type=int, default=None, help="Only repair this item")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        changed = question_service.recount_completion(db, item_id=args.item_id)
+        print(f"Repaired counters on {changed} item(s)")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
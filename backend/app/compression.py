@@ -0,0 +1,267 @@
+"""
+Negotiated response compression.
+
+API responses are compressed on the fly with brotli or gzip, whichever the
+client prefers, once they pass a size threshold. Bodies that are already
+compressed (.docx and .zip downloads, images, fonts) are left alone.
+
+The built SPA assets are compressed once, ahead of time, at the highest
+levels; PrecompressedStaticFiles serves those files directly, and
+InMemoryFile keeps index.html and its variants in memory.
+
+Brotli needs the optional `brotli` package; without it only gzip is offered.
+"""
+import gzip
+import hashlib
+import mimetypes
+import os
+from pathlib import Path
+from typing import List, Optional
+from starlette.datastructures import Headers
+from starlette.middleware.gzip import DEFAULT_EXCLUDED_CONTENT_TYPES, GZipResponder, IdentityResponder
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from starlette.types import ASGIApp, Receive, Scope, Send
+from app.api.conditional import etag_matches
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+# Smaller bodies don't fit in fewer packets once compressed
+MINIMUM_SIZE = 1024
+
+# Fast levels for per-request compression; static assets use the maximum
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+DOCX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+EXCLUDED_CONTENT_TYPES = DEFAULT_EXCLUDED_CONTENT_TYPES + (DOCX_MEDIA_TYPE,)
+
+# File suffix of each precompressed variant, in order of preference
+_VARIANTS = {"br": ".br", "gzip": ".gz"}
+
+_PRECOMPRESSED_TYPES = {".html", ".js", ".mjs", ".css", ".json", ".svg", ".txt", ".map", ".xml", ".ico"}
+
+# Vite puts a content hash in every asset's filename, so a URL never changes content
+IMMUTABLE = "public, max-age=31536000, immutable"
+# Clients keep the copy but revalidate it; for entry points such as index.html
+NO_CACHE = "no-cache"
+
+
+def supported_encodings() -> List[str]:
+    """Encodings this server can produce, best first."""
+    return ["br", "gzip"] if brotli is not None else ["gzip"]
+
+
+def negotiate_encoding(accept_encoding: str, available: List[str]) -> Optional[str]:
+    """
+    Pick the first of available that the Accept-Encoding header allows.
+
+    Codings with q=0 are refused; a `*` entry allows anything not listed.
+    """
+    qualities = {}
+    for part in accept_encoding.lower().split(","):
+        coding, _, params = part.strip().partition(";")
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[coding.strip()] = quality
+
+    wildcard = qualities.get("*", 0.0)
+    accepted = [coding for coding in available if qualities.get(coding, wildcard) > 0]
+    if not accepted:
+        return None
+    # Equal preference goes to the order of available
+    return max(accepted, key=lambda coding: qualities.get(coding, wildcard))
+
+
+class BrotliResponder(IdentityResponder):
+    content_encoding = "br"
+
+    def __init__(self, app: ASGIApp, minimum_size: int, quality: int, exclude_content_types: tuple):
+        super().__init__(app, minimum_size, exclude_content_types=exclude_content_types)
+        self.quality = quality
+        self._compressor = None
+
+    async def apply_compression(self, body: bytes, *, more_body: bool) -> bytes:
+        if self._compressor is None:
+            self._compressor = brotli.Compressor(quality=self.quality)
+        data = self._compressor.process(body)
+        return data + (self._compressor.flush() if more_body else self._compressor.finish())
+
+
+class CompressionMiddleware:
+    """Compress responses with brotli or gzip according to Accept-Encoding."""
+
+    def __init__(self, app: ASGIApp, minimum_size: int = MINIMUM_SIZE):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate_encoding(
+            Headers(scope=scope).get("accept-encoding", ""), supported_encodings()
+        )
+        if encoding == "br":
+            responder = BrotliResponder(self.app, self.minimum_size, BROTLI_QUALITY, EXCLUDED_CONTENT_TYPES)
+        elif encoding == "gzip":
+            responder = GZipResponder(
+                self.app, self.minimum_size, compresslevel=GZIP_LEVEL,
+                exclude_content_types=EXCLUDED_CONTENT_TYPES
+            )
+        else:
+            responder = IdentityResponder(self.app, self.minimum_size, exclude_content_types=EXCLUDED_CONTENT_TYPES)
+        await responder(scope, receive, send)
+
+
+def precompress(directory: Path) -> int:
+    """
+    Write .br and .gz variants next to the compressible files under directory.
+
+    Variants that are up to date or would not be smaller are skipped, so this
+    is cheap to run on every start. Returns the number of files written.
+    """
+    written = 0
+    for path in directory.rglob("*"):
+        if not path.is_file() or path.suffix not in _PRECOMPRESSED_TYPES:
+            continue
+        stat = path.stat()
+        if stat.st_size < MINIMUM_SIZE:
+            continue
+        raw = None
+        for encoding in supported_encodings():
+            target = path.with_name(path.name + _VARIANTS[encoding])
+            if target.exists() and target.stat().st_mtime >= stat.st_mtime:
+                continue
+            raw = raw if raw is not None else path.read_bytes()
+            data = brotli.compress(raw, quality=11) if encoding == "br" else gzip.compress(raw, 9, mtime=0)
+            if len(data) >= len(raw):
+                continue
+            # Write then rename, so concurrent workers never serve a partial file
+            partial = target.with_name(f"{target.name}.{os.getpid()}.tmp")
+            partial.write_bytes(data)
+            os.replace(partial, target)
+            written += 1
+    return written
+
+
+def precompressed_response(full_path: str, accept_encoding: str) -> FileResponse:
+    """
+    FileResponse for full_path, using its best precompressed variant that the
+    client accepts.
+
+    The served file is stat'ed up front, so the response carries its ETag and
+    Last-Modified for conditional requests.
+    """
+    stat = os.stat(full_path)
+    available = [encoding for encoding in _VARIANTS if _is_current(full_path + _VARIANTS[encoding], stat.st_mtime)]
+    encoding = negotiate_encoding(accept_encoding, available) if available else None
+    media_type = mimetypes.guess_type(full_path)[0] or "text/plain"
+    if encoding is None:
+        return FileResponse(full_path, stat_result=stat, media_type=media_type, headers={"Vary": "Accept-Encoding"})
+    variant = full_path + _VARIANTS[encoding]
+    return FileResponse(
+        variant,
+        stat_result=os.stat(variant),
+        media_type=media_type,
+        headers={"Content-Encoding": encoding, "Vary": "Accept-Encoding"}
+    )
+
+
+def _is_current(variant: str, source_mtime: float) -> bool:
+    """Whether a precompressed variant exists and is not older than its source."""
+    try:
+        return os.stat(variant).st_mtime >= source_mtime
+    except OSError:
+        return False
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    """
+    StaticFiles that serves the .br/.gz variant written by precompress(), and
+    sends cache_control with every file when given.
+    """
+
+    def __init__(self, *args, cache_control: Optional[str] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.cache_control = cache_control
+
+    def file_response(self, full_path, stat_result, scope, status_code=200):
+        request_headers = Headers(scope=scope)
+        if str(full_path).endswith(tuple(_VARIANTS.values())):
+            response = FileResponse(full_path, status_code=status_code, stat_result=stat_result)
+        else:
+            response = precompressed_response(str(full_path), request_headers.get("accept-encoding", ""))
+            response.status_code = status_code
+        if self.cache_control:
+            response.headers["cache-control"] = self.cache_control
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+        return response
+
+
+class InMemoryFile:
+    """
+    A small static file held in memory with its precompressed variants.
+
+    Meant for index.html, which answers every client-side route: it is read
+    once, on load() or the first request, after precompress() has run. Every
+    encoding shares one weak ETag, a digest of the contents, so with
+    Cache-Control: no-cache returning clients get a 304 until the next build.
+    """
+
+    def __init__(self, path: Path, cache_control: str = NO_CACHE):
+        self.path = Path(path)
+        self.cache_control = cache_control
+        # (bodies by encoding, None for identity; response headers)
+        self._loaded = None
+
+    def exists(self) -> bool:
+        """Whether there is a file to serve; no stat once loaded."""
+        return self._loaded is not None or self.path.exists()
+
+    def load(self):
+        """(Re)read the file and its current variants."""
+        raw = self.path.read_bytes()
+        mtime = self.path.stat().st_mtime
+        bodies = {None: raw}
+        for encoding, suffix in _VARIANTS.items():
+            variant = str(self.path) + suffix
+            if _is_current(variant, mtime):
+                bodies[encoding] = Path(variant).read_bytes()
+        digest = hashlib.blake2b(raw, digest_size=12).hexdigest()
+        headers = {
+            "etag": f'W/"{digest}"',
+            "cache-control": self.cache_control,
+            "vary": "Accept-Encoding",
+        }
+        self._loaded = (bodies, headers)
+
+    def response(self, request_headers: Headers) -> Response:
+        """The file in the best encoding request_headers accept, or a 304."""
+        if self._loaded is None:
+            self.load()
+        bodies, headers = self._loaded
+        headers = dict(headers)
+        if etag_matches(request_headers.get("if-none-match"), headers["etag"]):
+            return Response(status_code=304, headers=headers)
+
+        available = [encoding for encoding in _VARIANTS if encoding in bodies]
+        encoding = negotiate_encoding(request_headers.get("accept-encoding", ""), available) if available else None
+        if encoding is not None:
+            headers["content-encoding"] = encoding
+        media_type = mimetypes.guess_type(str(self.path))[0] or "text/plain"
+        return Response(bodies[encoding], media_type=media_type, headers=headers)
+
@@ -7,5 +7,22 @@ class Settings:
     OPENAI_API_KEY: str = os.getenv("OPENAI_API_KEY", "")
     OPENAI_MODEL: str = os.getenv("OPENAI_MODEL", "gpt-4o-2024-08-06")
     DATABASE_URL: str = "sqlite:///./data/ba-ai.db"
+    # Archived projects are moved to this database, attached as schema "archive"
+    ARCHIVE_DATABASE_PATH: str = os.getenv("ARCHIVE_DATABASE_PATH", "./data/ba-ai-archive.db")
+    # Serialised GET responses; use "sqlite" when running several workers
+    CACHE_BACKEND: str = os.getenv("CACHE_BACKEND", "local")
+    CACHE_MAX_ENTRIES: int = int(os.getenv("CACHE_MAX_ENTRIES", "1024"))
+    CACHE_MAX_BYTES: int = int(os.getenv("CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+    CACHE_TTL_SECONDS: float = float(os.getenv("CACHE_TTL_SECONDS", "60"))
+    # Rendered .docx exports, shared by all workers
+    EXPORT_CACHE_DIR: str = os.getenv("EXPORT_CACHE_DIR", "./data/export-cache")
+    EXPORT_CACHE_MAX_BYTES: int = int(os.getenv("EXPORT_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+    # Processes rendering exports; 0 renders on the request thread
+    EXPORT_WORKERS: int = int(os.getenv("EXPORT_WORKERS", "2"))
+    # Renders running or waiting before further exports get a 503
+    EXPORT_QUEUE_DEPTH: int = int(os.getenv("EXPORT_QUEUE_DEPTH", "8"))
+    EXPORT_TIMEOUT_SECONDS: float = float(os.getenv("EXPORT_TIMEOUT_SECONDS", "60"))
+    # Render exports in the background whenever content is generated
+    EXPORT_PRERENDER: bool = os.getenv("EXPORT_PRERENDER", "true").lower() == "true"
 
 settings = Settings()
@@ -1,4 +1,4 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import declarative_base, sessionmaker
 from app.config import settings
 
@@ -7,7 +7,31 @@ engine = create_engine(
     connect_args={"check_same_thread": False}
 )
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+def set_sqlite_pragma(dbapi_connection, connection_record):
+    """Enforce foreign keys so ON DELETE CASCADE runs inside SQLite."""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.close()
+
+
+ARCHIVE_SCHEMA = "archive"
+
+
+def attach_archive(path: str):
+    """Build a connect listener that attaches the archive database at path."""
+    def listener(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute(f"ATTACH DATABASE ? AS {ARCHIVE_SCHEMA}", (path,))
+        cursor.close()
+    return listener
+
+
+event.listen(engine, "connect", set_sqlite_pragma)
+event.listen(engine, "connect", attach_archive(settings.ARCHIVE_DATABASE_PATH))
+
+# Objects stay usable after commit, so writes don't need a refresh SELECT
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
 
 Base = declarative_base()
 
@@ -1,14 +1,20 @@
-from app.models.enums import ProjectStatus, DocumentationItemStatus, DocumentationType, QuestionType
+from app.models.enums import ProjectStatus, DocumentationItemStatus, DocumentationType, QuestionType, RevisionSource
+from app.models.blob import Blob
 from app.models.project import Project
 from app.models.documentation_item import DocumentationItem
 from app.models.question import Question
+from app.models.revision import ContentRevision
+from app.models import search_index  # noqa: F401 - registers the FTS5 DDL
 
 __all__ = [
     'ProjectStatus',
     'DocumentationItemStatus',
     'DocumentationType',
     'QuestionType',
+    'RevisionSource',
+    'Blob',
     'Project',
     'DocumentationItem',
     'Question',
+    'ContentRevision',
 ]
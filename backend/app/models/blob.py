@@ -0,0 +1,49 @@
+import json
+import zlib
+from typing import Any, Tuple
+from sqlalchemy import Column, Integer, String, LargeBinary
+from app.database import Base
+
+# Codecs a blob's data can be stored with
+CODEC_IDENTITY = "identity"
+CODEC_ZLIB = "zlib"
+
+
+class Blob(Base):
+    """
+    Content-addressed storage for large JSON and text values.
+
+    Rows are keyed by the SHA-256 of the uncompressed bytes, so identical
+    values are stored once however many rows reference them.
+    """
+    __tablename__ = "blobs"
+
+    hash = Column(String(64), primary_key=True)
+    codec = Column(String(16), nullable=False)
+    size = Column(Integer, nullable=False)
+    data = Column(LargeBinary, nullable=False)
+
+    def raw(self) -> bytes:
+        """Return the uncompressed bytes."""
+        if self.codec == CODEC_ZLIB:
+            return zlib.decompress(self.data)
+        return self.data
+
+    def text(self) -> str:
+        return self.raw().decode("utf-8")
+
+    def json(self) -> Any:
+        return json.loads(self.raw())
+
+
+def compress(raw: bytes) -> Tuple[str, bytes]:
+    """Compress raw bytes, keeping them as they are when that does not save space."""
+    data = zlib.compress(raw, 9)
+    if len(data) < len(raw):
+        return CODEC_ZLIB, data
+    return CODEC_IDENTITY, raw
+
+
+def encode_json(value: Any) -> bytes:
+    """Canonical JSON encoding, so equal documents hash to the same blob."""
+    return json.dumps(value, sort_keys=True, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
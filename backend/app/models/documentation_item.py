@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, Enum, Date, ForeignKey, JSON
+from sqlalchemy import Column, Integer, String, Text, DateTime, Enum, Date, ForeignKey, Index, insert_sentinel
 from sqlalchemy.orm import relationship
 from datetime import datetime, timezone
 from app.database import Base
@@ -6,17 +6,51 @@ from app.models.enums import DocumentationItemStatus, DocumentationType
 
 class DocumentationItem(Base):
     __tablename__ = "documentation_items"
+    __table_args__ = (
+        Index("ix_documentation_items_project_created_id", "project_id", "created_at", "id"),
+        {"sqlite_autoincrement": True},
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    project_id = Column(Integer, ForeignKey("projects.id"), nullable=False)
+    project_id = Column(Integer, ForeignKey("projects.id", ondelete="CASCADE"), nullable=False)
     type = Column(Enum(DocumentationType), nullable=False)
     title = Column(String(255), nullable=False)
     description = Column(Text, nullable=False)
     status = Column(Enum(DocumentationItemStatus), default=DocumentationItemStatus.DRAFT, nullable=False)
     deadline = Column(Date, nullable=True)
-    generated_content = Column(JSON, nullable=True)
+    generated_content_hash = Column(String(64), ForeignKey("blobs.hash"), nullable=True)
+    # Denormalized question counters, maintained by question_service
+    total_questions = Column(Integer, default=0, server_default="0", nullable=False)
+    answered_questions = Column(Integer, default=0, server_default="0", nullable=False)
+    critical_questions = Column(Integer, default=0, server_default="0", nullable=False)
+    critical_answered = Column(Integer, default=0, server_default="0", nullable=False)
+    # Revision bookkeeping, maintained by revision_service
+    revision_count = Column(Integer, default=0, server_default="0", nullable=False)
     created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
     updated_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
+    # Lets bulk INSERT ... RETURNING hand rows back in parameter order
+    _sentinel = insert_sentinel("_sentinel")
 
     project = relationship("Project", back_populates="documentation_items")
-    questions = relationship("Question", back_populates="documentation_item", cascade="all, delete-orphan")
+    # Stored out of row in the blobs table and only loaded when accessed
+    generated_content_blob = relationship("Blob", lazy="select")
+    questions = relationship(
+        "Question",
+        back_populates="documentation_item",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+        order_by="Question.display_order"
+    )
+    revisions = relationship(
+        "ContentRevision",
+        back_populates="documentation_item",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+        order_by="ContentRevision.revision_number"
+    )
+
+    @property
+    def generated_content(self):
+        """The generated document, decoded from its blob."""
+        blob = self.generated_content_blob
+        return blob.json() if blob is not None else None
@@ -22,3 +22,8 @@ class QuestionType(enum.Enum):
     TEXT = "Text"
     MULTIPLE_CHOICE = "MultipleChoice"
     CHECKBOX = "Checkbox"
+
+class RevisionSource(enum.Enum):
+    GENERATE = "Generate"
+    REGENERATE = "Regenerate"
+    RESTORE = "Restore"
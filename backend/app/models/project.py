@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, Enum
+from sqlalchemy import Column, Integer, String, Text, DateTime, Enum, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime, timezone
 from app.database import Base
@@ -6,14 +6,34 @@ from app.models.enums import ProjectStatus
 
 class Project(Base):
     __tablename__ = "projects"
+    __table_args__ = (
+        Index("ix_projects_updated_at_id", "updated_at", "id"),
+        # Ids are never reused, so archived rows can always be restored
+        {"sqlite_autoincrement": True},
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(255), nullable=False)
     client = Column(String(255), nullable=True)
     description = Column(Text, nullable=False)
     status = Column(Enum(ProjectStatus), default=ProjectStatus.ACTIVE, nullable=False)
-    knowledge_base = Column(Text, nullable=True, default="")
+    knowledge_base_hash = Column(String(64), ForeignKey("blobs.hash"), nullable=True)
     created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
     updated_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
 
-    documentation_items = relationship("DocumentationItem", back_populates="project", cascade="all, delete-orphan")
+    # Stored out of row in the blobs table and only loaded when accessed
+    knowledge_base_blob = relationship("Blob", lazy="select")
+
+    # Children are removed by ON DELETE CASCADE in the database, not loaded and deleted one by one
+    documentation_items = relationship(
+        "DocumentationItem",
+        back_populates="project",
+        cascade="all, delete-orphan",
+        passive_deletes=True
+    )
+
+    @property
+    def knowledge_base(self) -> str:
+        """The project knowledge base, decoded from its blob."""
+        blob = self.knowledge_base_blob
+        return blob.text() if blob is not None else ""
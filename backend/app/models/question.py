@@ -1,14 +1,20 @@
-from sqlalchemy import Column, Integer, String, Text, Boolean, ForeignKey, Enum, JSON
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Text, Boolean, ForeignKey, Enum, JSON, Index, insert_sentinel
+from sqlalchemy.orm import relationship, backref
 from app.database import Base
 from app.models.enums import QuestionType
 
 class Question(Base):
     __tablename__ = "questions"
+    __table_args__ = (
+        Index("ix_questions_item_order_id", "doc_item_id", "display_order", "id"),
+        # Children of a question, for visibility
+        Index("ix_questions_parent_question_id", "parent_question_id"),
+        {"sqlite_autoincrement": True},
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    doc_item_id = Column(Integer, ForeignKey("documentation_items.id"), nullable=False)
-    parent_question_id = Column(Integer, ForeignKey("questions.id"), nullable=True)
+    doc_item_id = Column(Integer, ForeignKey("documentation_items.id", ondelete="CASCADE"), nullable=False)
+    parent_question_id = Column(Integer, ForeignKey("questions.id", ondelete="SET NULL"), nullable=True)
     question_text = Column(Text, nullable=False)
     question_type = Column(Enum(QuestionType), nullable=False)
     options = Column(JSON, nullable=True)
@@ -16,7 +22,18 @@ class Question(Base):
     display_order = Column(Integer, nullable=False)
     answer = Column(Text, nullable=True)
     is_answered = Column(Boolean, default=False, nullable=False)
+    # {"required_answer": str | [str] | None}; see app/services/visibility.py
     trigger_condition = Column(JSON, nullable=True)
+    # Lets bulk INSERT ... RETURNING hand rows back in parameter order
+    _sentinel = insert_sentinel("_sentinel")
 
     documentation_item = relationship("DocumentationItem", back_populates="questions")
-    parent_question = relationship("Question", remote_side=[id], backref="child_questions")
+    parent_question = relationship(
+        "Question",
+        remote_side=[id],
+        backref=backref("child_questions", passive_deletes=True)
+    )
+
+    # Not stored: whether the question is shown depends on other questions'
+    # answers. question_service sets it where it has evaluated them.
+    is_visible = True
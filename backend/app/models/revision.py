@@ -0,0 +1,32 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime, Enum, Boolean, ForeignKey, JSON, UniqueConstraint
+from sqlalchemy.orm import relationship
+from datetime import datetime, timezone
+from app.database import Base
+from app.models.enums import RevisionSource
+
+class ContentRevision(Base):
+    __tablename__ = "content_revisions"
+    __table_args__ = (
+        UniqueConstraint("doc_item_id", "revision_number", name="uq_content_revisions_item_number"),
+        {"sqlite_autoincrement": True},
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    doc_item_id = Column(Integer, ForeignKey("documentation_items.id", ondelete="CASCADE"), nullable=False)
+    revision_number = Column(Integer, nullable=False)
+    source = Column(Enum(RevisionSource), nullable=False)
+    feedback = Column(Text, nullable=True)
+    restored_from = Column(Integer, nullable=True)
+    model = Column(String(100), nullable=True)
+    prompt_tokens = Column(Integer, nullable=True)
+    completion_tokens = Column(Integer, nullable=True)
+    total_tokens = Column(Integer, nullable=True)
+    # Snapshots reference the full document in the blobs table; other revisions
+    # store a json_diff against the previous revision in content
+    is_snapshot = Column(Boolean, nullable=False)
+    blob_hash = Column(String(64), ForeignKey("blobs.hash"), nullable=True)
+    content = Column(JSON, nullable=True)
+    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+
+    documentation_item = relationship("DocumentationItem", back_populates="revisions")
+    blob = relationship("Blob", lazy="select")
@@ -0,0 +1,98 @@
+from sqlalchemy import DDL, event
+from app.database import Base
+
+# SQLite FTS5 index over projects, documentation items and questions.
+#
+# Rows are keyed by rowid = entity_id * 4 + kind code, so triggers can replace
+# or remove a single entity's row with an indexed rowid lookup. Triggers keep
+# the index in sync for every write path, including bulk Core statements and
+# ON DELETE CASCADE.
+#
+# Generated documents live compressed in the blobs table, out of reach of
+# SQL, so item_service writes their text to the `content` column itself.
+
+KIND_PROJECT = 1
+KIND_ITEM = 2
+KIND_QUESTION = 3
+
+KIND_NAMES = {
+    KIND_PROJECT: "project",
+    KIND_ITEM: "item",
+    KIND_QUESTION: "question",
+}
+
+_INSERT = "INSERT INTO search_index(rowid, kind, entity_id, project_id, item_id, title, body) "
+
+_PROJECT_ROW = _INSERT + (
+    f"VALUES (NEW.id * 4 + {KIND_PROJECT}, {KIND_PROJECT}, NEW.id, NEW.id, NULL, "
+    "NEW.name, NEW.description || ' ' || coalesce(NEW.client, ''))"
+)
+
+_ITEM_ROW = _INSERT + (
+    f"VALUES (NEW.id * 4 + {KIND_ITEM}, {KIND_ITEM}, NEW.id, NEW.project_id, NEW.id, "
+    "NEW.title, NEW.description)"
+)
+
+# Updated in place so the content column written by item_service is kept
+_ITEM_UPDATE = (
+    "UPDATE search_index SET title = NEW.title, body = NEW.description "
+    f"WHERE rowid = NEW.id * 4 + {KIND_ITEM}"
+)
+
+_QUESTION_ROW = _INSERT + (
+    f"VALUES (NEW.id * 4 + {KIND_QUESTION}, {KIND_QUESTION}, NEW.id, "
+    "(SELECT project_id FROM documentation_items WHERE id = NEW.doc_item_id), "
+    "NEW.doc_item_id, NEW.question_text, coalesce(NEW.answer, ''))"
+)
+
+
+def _delete_row(kind: int) -> str:
+    return f"DELETE FROM search_index WHERE rowid = OLD.id * 4 + {kind}"
+
+
+def _trigger(name: str, when: str, *statements: str) -> str:
+    body = "\n".join(f"    {statement};" for statement in statements)
+    return f"CREATE TRIGGER IF NOT EXISTS {name} {when} BEGIN\n{body}\nEND"
+
+
+SEARCH_INDEX_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS search_index USING fts5("
+    "kind UNINDEXED, entity_id UNINDEXED, project_id UNINDEXED, item_id UNINDEXED, "
+    "title, body, content, tokenize = 'unicode61 remove_diacritics 2')",
+    _trigger("search_projects_ai", "AFTER INSERT ON projects", _PROJECT_ROW),
+    _trigger(
+        "search_projects_au", "AFTER UPDATE OF name, description, client ON projects",
+        _delete_row(KIND_PROJECT), _PROJECT_ROW
+    ),
+    _trigger("search_projects_ad", "AFTER DELETE ON projects", _delete_row(KIND_PROJECT)),
+    _trigger("search_items_ai", "AFTER INSERT ON documentation_items", _ITEM_ROW),
+    _trigger("search_items_au", "AFTER UPDATE OF title, description ON documentation_items", _ITEM_UPDATE),
+    _trigger("search_items_ad", "AFTER DELETE ON documentation_items", _delete_row(KIND_ITEM)),
+    _trigger("search_questions_ai", "AFTER INSERT ON questions", _QUESTION_ROW),
+    _trigger(
+        "search_questions_au", "AFTER UPDATE OF question_text, answer ON questions",
+        _delete_row(KIND_QUESTION), _QUESTION_ROW
+    ),
+    _trigger("search_questions_ad", "AFTER DELETE ON questions", _delete_row(KIND_QUESTION)),
+]
+
+SEARCH_INDEX_DROP = "DROP TABLE IF EXISTS search_index"
+
+# Rebuild the index from the base tables; item content is filled in by
+# search_service.rebuild_index
+SEARCH_INDEX_BACKFILL = [
+    _INSERT
+    + f"SELECT id * 4 + {KIND_PROJECT}, {KIND_PROJECT}, id, id, NULL, "
+    "name, description || ' ' || coalesce(client, '') FROM projects",
+    _INSERT
+    + f"SELECT id * 4 + {KIND_ITEM}, {KIND_ITEM}, id, project_id, id, title, description "
+    "FROM documentation_items",
+    _INSERT
+    + f"SELECT q.id * 4 + {KIND_QUESTION}, {KIND_QUESTION}, q.id, i.project_id, q.doc_item_id, "
+    "q.question_text, coalesce(q.answer, '') "
+    "FROM questions q JOIN documentation_items i ON i.id = q.doc_item_id",
+]
+
+for statement in SEARCH_INDEX_DDL:
+    event.listen(Base.metadata, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+event.listen(Base.metadata, "before_drop", DDL(SEARCH_INDEX_DROP).execute_if(dialect="sqlite"))
@@ -1,4 +1,4 @@
-from openai import OpenAI
+from functools import cached_property
 from app.config import settings
 from typing import Dict, Any, Optional
 import json
@@ -8,16 +8,27 @@ class AIService:
     """Service for interacting with OpenAI API."""
 
     def __init__(self):
-        """Initialize OpenAI client."""
-        self.client = OpenAI(api_key=settings.OPENAI_API_KEY)
         self.model = settings.OPENAI_MODEL  # Model from environment variable
 
+    @cached_property
+    def client(self):
+        """
+        OpenAI client, created on first use.
+
+        The SDK takes longer to import than the rest of the API together, so
+        processes that never call the model (tests, CLI commands, export
+        workers) don't import it.
+        """
+        from openai import OpenAI
+        return OpenAI(api_key=settings.OPENAI_API_KEY)
+
     def generate_structured_response(
         self,
         system_prompt: str,
         user_prompt: str,
         response_format: Dict[str, Any],
-        temperature: float = 0.7
+        temperature: float = 0.7,
+        usage: Optional[Dict[str, int]] = None
     ) -> Dict[str, Any]:
         """
         Generate a structured response using OpenAI's structured outputs feature.
@@ -27,6 +38,7 @@ class AIService:
             user_prompt: User message with the task
             response_format: JSON schema for the expected response
             temperature: Sampling temperature (0-2), ignored for models that don't support it
+            usage: Optional dict that receives the token usage of the call
 
         Returns:
             Parsed JSON response matching the schema
@@ -58,6 +70,13 @@ class AIService:
 
             response = self.client.chat.completions.create(**params)
 
+            if usage is not None and response.usage is not None:
+                usage.update({
+                    "prompt_tokens": response.usage.prompt_tokens,
+                    "completion_tokens": response.usage.completion_tokens,
+                    "total_tokens": response.usage.total_tokens
+                })
+
             # Parse the JSON response
             content = response.choices[0].message.content
             return json.loads(content)
@@ -0,0 +1,327 @@
+"""
+Cold storage for archived projects.
+
+Archived projects, with their items, questions, revisions and documents, are
+moved out of the live tables into a separate SQLite database attached to every
+connection as the "archive" schema, and moved back when they are unarchived.
+Both moves are set-based INSERT ... SELECT / DELETE statements in the caller's
+transaction, so their cost does not grow with the number of rows.
+
+Reads that find nothing in the live tables are retried against the archive by
+functions decorated with read_through; the archive has the same tables, so the
+same queries run there through a schema_translate_map. Archived data is read
+only: writes only ever touch the live tables.
+
+The archive is not managed by Alembic. Its schema version is kept in the
+archive database's user_version and brought up to ARCHIVE_VERSION at startup,
+so a migration that changes one of the archived tables needs a matching step
+in _UPGRADES.
+"""
+import functools
+from itertools import groupby
+from operator import attrgetter
+from sqlalchemy import MetaData, bindparam, delete, exists, func, insert, inspect, select, union, update
+from sqlalchemy.orm import Session, joinedload
+from app.database import ARCHIVE_SCHEMA
+from app.models.blob import Blob
+from app.models.documentation_item import DocumentationItem
+from app.models.enums import ProjectStatus
+from app.models.project import Project
+from app.models.question import Question
+from app.models.revision import ContentRevision
+from app.services import blob_service, search_service, visibility
+from typing import Callable, List
+
+# Parents first, so inserts satisfy foreign keys
+_LIVE_TABLES = [
+    Blob.__table__,
+    Project.__table__,
+    DocumentationItem.__table__,
+    Question.__table__,
+    ContentRevision.__table__,
+]
+
+_archive_metadata = MetaData()
+ARCHIVE_TABLES = {
+    table.name: table.to_metadata(_archive_metadata, schema=ARCHIVE_SCHEMA)
+    for table in _LIVE_TABLES
+}
+
+_TRANSLATE_MAP = {None: ARCHIVE_SCHEMA}
+
+
+def _resolve_question_parents(connection):
+    """
+    Version 2, the archive side of migration b7d3e9f1a264: link conditional
+    questions to their parent by id and count only the shown questions.
+    """
+    questions = ARCHIVE_TABLES["questions"]
+    items = ARCHIVE_TABLES["documentation_items"]
+    for index in questions.indexes:
+        index.create(connection, checkfirst=True)
+
+    # Questions were created with display_order = position in the AI response
+    # + 1, which is what trigger_condition.parent_question_index pointed into
+    parent = questions.alias("parent")
+    parent_index = func.json_extract(questions.c.trigger_condition, "$.parent_question_index")
+    connection.execute(
+        update(questions)
+        .where(questions.c.parent_question_id.is_(None), parent_index.is_not(None))
+        .values(parent_question_id=select(parent.c.id).where(
+            parent.c.doc_item_id == questions.c.doc_item_id,
+            parent.c.display_order == parent_index + 1
+        ).scalar_subquery())
+    )
+    connection.execute(
+        update(questions)
+        .where(questions.c.parent_question_id.is_not(None))
+        .values(trigger_condition=func.json_remove(questions.c.trigger_condition, "$.parent_question_index"))
+    )
+
+    conditional = select(questions.c.doc_item_id).where(questions.c.parent_question_id.is_not(None))
+    rows = connection.execute(
+        select(questions).where(questions.c.doc_item_id.in_(conditional)).order_by(questions.c.doc_item_id)
+    )
+    counts = [
+        dict(zip(("total", "answered", "critical", "critical_answered"), visibility.counters(group)), item_id=item_id)
+        for item_id, group in groupby(rows, key=attrgetter("doc_item_id"))
+    ]
+    if counts:
+        connection.execute(
+            update(items)
+            .where(items.c.id == bindparam("item_id"))
+            .values(
+                total_questions=bindparam("total"),
+                answered_questions=bindparam("answered"),
+                critical_questions=bindparam("critical"),
+                critical_answered=bindparam("critical_answered")
+            ),
+            counts
+        )
+
+
+def _add_insert_sentinels(connection):
+    """Version 3, the archive side of migration d4f2a7c9e8b1."""
+    inspector = inspect(connection)
+    for name in ("documentation_items", "questions"):
+        # Unversioned archives made by newer code already have it
+        if "_sentinel" not in {column["name"] for column in inspector.get_columns(name, schema=ARCHIVE_SCHEMA)}:
+            connection.exec_driver_sql(f"ALTER TABLE {ARCHIVE_SCHEMA}.{name} ADD COLUMN _sentinel INTEGER")
+
+
+# _UPGRADES[n - 1] takes an archive at version n to version n + 1
+_UPGRADES: List[Callable] = [_resolve_question_parents, _add_insert_sentinels]
+ARCHIVE_VERSION = len(_UPGRADES) + 1
+
+
+class ArchiveSchemaError(RuntimeError):
+    """The archive database does not match the tables this code archives."""
+
+
+def create_schema(bind):
+    """
+    Create the archive tables, or upgrade existing ones to ARCHIVE_VERSION.
+
+    Raises ArchiveSchemaError if the archive is newer than this code or its
+    columns have drifted from the live tables, rather than failing on the next
+    archive or unarchive.
+    """
+    with bind.begin() as connection:
+        version = _get_version(connection)
+        if version == 0:
+            if inspect(connection).get_table_names(schema=ARCHIVE_SCHEMA):
+                # Created before the archive schema was versioned
+                version = 1
+            else:
+                for table in ARCHIVE_TABLES.values():
+                    table.create(connection)
+                version = ARCHIVE_VERSION
+        if version > ARCHIVE_VERSION:
+            raise ArchiveSchemaError(
+                f"Archive schema version {version} is newer than this code's {ARCHIVE_VERSION}"
+            )
+        for upgrade in _UPGRADES[version - 1:]:
+            upgrade(connection)
+        _set_version(connection, ARCHIVE_VERSION)
+        _check_columns(connection)
+
+
+def drop_schema(bind):
+    """Drop the archive tables."""
+    with bind.begin() as connection:
+        for table in reversed(list(ARCHIVE_TABLES.values())):
+            table.drop(connection, checkfirst=True)
+        _set_version(connection, 0)
+
+
+def is_archive_session(db: Session) -> bool:
+    """Whether db reads from the archive rather than the live tables."""
+    return db.info.get(ARCHIVE_SCHEMA, False)
+
+
+def archive_session(db: Session) -> Session:
+    """
+    Open a session that runs the models' queries against the archive.
+
+    Objects it returns are detached once it is closed, so callers must eager
+    load everything they use.
+    """
+    bind = db.get_bind().execution_options(schema_translate_map=_TRANSLATE_MAP)
+    return Session(bind=bind, autoflush=False, expire_on_commit=False, info={ARCHIVE_SCHEMA: True})
+
+
+def read_through(is_empty: Callable = lambda result: result is None):
+    """
+    Decorate a read function taking the session as its first argument so that
+    an empty result from the live tables is retried against the archive.
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(db: Session, *args, **kwargs):
+            result = fn(db, *args, **kwargs)
+            if is_empty(result) and not is_archive_session(db):
+                with archive_session(db) as archive:
+                    result = fn(archive, *args, **kwargs)
+            return result
+        return wrapper
+    return decorator
+
+
+def empty_page(page) -> bool:
+    """read_through predicate for (rows, next_cursor) results."""
+    return not page[0]
+
+
+def archive_project(db: Session, project_id: int) -> bool:
+    """
+    Move a project and everything under it to the archive, without committing.
+
+    Returns False if the project is not in the live tables.
+    """
+    return _move(db, project_id, source=_LIVE_TABLES, target=list(ARCHIVE_TABLES.values()))
+
+
+def restore_project(db: Session, project_id: int) -> bool:
+    """
+    Move an archived project back to the live tables, without committing.
+
+    Returns False if the project is not in the archive.
+    """
+    moved = _move(db, project_id, source=list(ARCHIVE_TABLES.values()), target=_LIVE_TABLES)
+    if moved:
+        _index_restored_content(db, project_id)
+    return moved
+
+
+def delete_archived_project(db: Session, project_id: int) -> bool:
+    """Delete an archived project and commit. Returns False if it is not archived."""
+    projects = ARCHIVE_TABLES["projects"]
+    hashes = _referenced_hashes(db, project_id, ARCHIVE_TABLES)
+    result = db.execute(delete(projects).where(projects.c.id == project_id))
+    blob_service.delete_unreferenced(db, hashes, tables=ARCHIVE_TABLES)
+    db.commit()
+    return result.rowcount > 0
+
+
+def get_archived_project_ids(db: Session) -> List[int]:
+    """Projects with the archived status that are still in the live tables."""
+    return list(db.scalars(select(Project.id).where(Project.status == ProjectStatus.ARCHIVED)))
+
+
+def collect_garbage(db: Session) -> int:
+    """Delete archive blobs no longer referenced by any archived row and commit."""
+    return blob_service.collect_garbage(db, tables=ARCHIVE_TABLES)
+
+
+def _move(db: Session, project_id: int, source: list, target: list) -> bool:
+    src = {table.name: table for table in source}
+    dst = {table.name: table for table in target}
+
+    projects = src["projects"]
+    if not db.scalar(select(exists().where(projects.c.id == project_id))):
+        return False
+
+    item_ids = select(src["documentation_items"].c.id)\
+        .where(src["documentation_items"].c.project_id == project_id)
+    selections = {
+        "projects": projects.c.id == project_id,
+        "documentation_items": src["documentation_items"].c.project_id == project_id,
+        "questions": src["questions"].c.doc_item_id.in_(item_ids),
+        "content_revisions": src["content_revisions"].c.doc_item_id.in_(item_ids),
+    }
+
+    # Documents are content-addressed and may be shared, so they are copied
+    # rather than moved and only deleted from the source once unreferenced
+    hashes = _referenced_hashes(db, project_id, src)
+    blobs = src["blobs"]
+    db.execute(
+        insert(dst["blobs"])
+        .from_select(list(blobs.c.keys()), select(blobs).where(blobs.c.hash.in_(hashes)))
+        .prefix_with("OR IGNORE")
+    )
+    for name, criteria in selections.items():
+        columns = list(src[name].c.keys())
+        db.execute(
+            insert(dst[name]).from_select(
+                columns,
+                select(*[src[name].c[c] for c in columns]).where(criteria).order_by(src[name].c.id)
+            )
+        )
+
+    # Items, questions and revisions follow through ON DELETE CASCADE
+    db.execute(
+        delete(projects).where(projects.c.id == project_id),
+        execution_options={"synchronize_session": False}
+    )
+    blob_service.delete_unreferenced(db, hashes, tables=src)
+    return True
+
+
+def _get_version(connection) -> int:
+    return connection.exec_driver_sql(f"PRAGMA {ARCHIVE_SCHEMA}.user_version").scalar()
+
+
+def _set_version(connection, version: int):
+    connection.exec_driver_sql(f"PRAGMA {ARCHIVE_SCHEMA}.user_version = {int(version)}")
+
+
+def _check_columns(connection):
+    """Moves copy rows by the live column lists, so both tiers need the same columns."""
+    inspector = inspect(connection)
+    for name, table in ARCHIVE_TABLES.items():
+        archived = {column["name"] for column in inspector.get_columns(name, schema=ARCHIVE_SCHEMA)}
+        if archived != set(table.c.keys()):
+            raise ArchiveSchemaError(
+                f"Archive table {name} has columns {sorted(archived)}, expected "
+                f"{sorted(table.c.keys())}; add a step to _UPGRADES"
+            )
+
+
+def _referenced_hashes(db: Session, project_id: int, tables: dict) -> List[str]:
+    projects = tables["projects"]
+    items = tables["documentation_items"]
+    revisions = tables["content_revisions"]
+    item_ids = select(items.c.id).where(items.c.project_id == project_id)
+    return list(db.scalars(union(
+        select(projects.c.knowledge_base_hash).where(
+            projects.c.id == project_id, projects.c.knowledge_base_hash.is_not(None)
+        ),
+        select(items.c.generated_content_hash).where(
+            items.c.project_id == project_id, items.c.generated_content_hash.is_not(None)
+        ),
+        select(revisions.c.blob_hash).where(
+            revisions.c.doc_item_id.in_(item_ids), revisions.c.blob_hash.is_not(None)
+        )
+    )))
+
+
+def _index_restored_content(db: Session, project_id: int):
+    """Put the documents of restored items back into the search index."""
+    items = db.query(DocumentationItem)\
+        .options(joinedload(DocumentationItem.generated_content_blob))\
+        .filter(
+            DocumentationItem.project_id == project_id,
+            DocumentationItem.generated_content_hash.is_not(None)
+        )\
+        .all()
+    search_service.index_items_content(db, [(item.id, item.generated_content) for item in items])
@@ -0,0 +1,76 @@
+import hashlib
+from sqlalchemy import delete, exists
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.orm import Session
+from app.models.blob import Blob, compress, encode_json
+from app.models.documentation_item import DocumentationItem
+from app.models.project import Project
+from app.models.revision import ContentRevision
+from typing import Any, List, Optional
+
+LIVE_TABLES = {
+    table.name: table
+    for table in (Blob.__table__, Project.__table__, DocumentationItem.__table__, ContentRevision.__table__)
+}
+
+
+def put(db: Session, raw: bytes) -> str:
+    """
+    Store bytes as a blob without committing and return its hash.
+
+    Storing a value that already exists is a no-op.
+    """
+    digest = hashlib.sha256(raw).hexdigest()
+    codec, data = compress(raw)
+    db.execute(
+        insert(Blob)
+        .values(hash=digest, codec=codec, size=len(raw), data=data)
+        .on_conflict_do_nothing()
+    )
+    return digest
+
+
+def put_json(db: Session, value: Any) -> str:
+    """Store a JSON document as a blob and return its hash."""
+    return put(db, encode_json(value))
+
+
+def put_text(db: Session, value: str) -> str:
+    """Store text as a blob and return its hash."""
+    return put(db, value.encode("utf-8"))
+
+
+def collect_garbage(db: Session, tables: Optional[dict] = None) -> int:
+    """
+    Delete blobs no longer referenced by any item, project or revision and commit.
+
+    Returns the number of deleted blobs.
+    """
+    count = delete_unreferenced(db, tables=tables)
+    db.commit()
+    return count
+
+
+def delete_unreferenced(
+    db: Session,
+    hashes: Optional[List[str]] = None,
+    tables: Optional[dict] = None
+) -> int:
+    """
+    Delete unreferenced blobs, optionally only among hashes, without committing.
+
+    tables maps table names to the Table objects to check, e.g. the archive's;
+    it defaults to the live tables.
+    """
+    tables = tables or LIVE_TABLES
+    blobs = tables["blobs"]
+    criteria = [
+        ~exists().where(tables["projects"].c.knowledge_base_hash == blobs.c.hash),
+        ~exists().where(tables["documentation_items"].c.generated_content_hash == blobs.c.hash),
+        ~exists().where(tables["content_revisions"].c.blob_hash == blobs.c.hash),
+    ]
+    if hashes is not None:
+        if not hashes:
+            return 0
+        criteria.append(blobs.c.hash.in_(hashes))
+    return db.execute(delete(blobs).where(*criteria)).rowcount
@@ -0,0 +1,29 @@
+"""
+Change notifications from the service layer.
+
+Write functions call changed() after they commit, naming what they touched;
+listeners such as the response cache subscribe to drop what became stale.
+"""
+from typing import Callable, List
+
+# A project's own row; everything under it is affected too
+PROJECT = "project"
+# A documentation item's row, its questions or its generated content
+ITEM = "item"
+# The set of items in a project (an item was added or removed)
+PROJECT_ITEMS = "project_items"
+
+Listener = Callable[[str, int], None]
+
+_listeners: List[Listener] = []
+
+
+def subscribe(listener: Listener):
+    """Call listener(kind, entity_id) after every committed change."""
+    _listeners.append(listener)
+
+
+def changed(kind: str, entity_id: int):
+    """Notify listeners that an entity of kind was written."""
+    for listener in _listeners:
+        listener(kind, entity_id)
@@ -0,0 +1,175 @@
+"""
+ZIP bundles of a project's Word exports.
+
+Every item with generated content becomes one .docx entry. Documents in the
+export cache are added straight away; the others are rendered through the
+export pool, several at once, and added in the order they finish. Entries
+are stored, not deflated (a .docx is already a ZIP), and the archive is
+written to an unseekable stream and yielded chunk by chunk, so memory stays
+bounded by a few render jobs and one read buffer, however large the
+project.
+
+Items that fail to render are listed in an export-errors.txt entry at the
+end, since the response has long started by then.
+"""
+import time
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Callable, Iterator, List
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from app.models.documentation_item import DocumentationItem
+from app.services.export_cache import document_key, export_cache
+from app.services.render_pool import RenderPoolBusy, export_pool, render_docx
+
+# Bytes copied from a cached document into the archive at a time
+CHUNK_SIZE = 64 * 1024
+
+# Pause before asking a full render pool again
+BUSY_RETRY_SECONDS = 0.5
+
+ERRORS_FILENAME = "export-errors.txt"
+
+
+class _ChunkWriter:
+    """Unseekable file object for zipfile; collects what it writes until drained."""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def project_bundle(
+    db: Session,
+    project_id: int,
+    filename: Callable[[DocumentationItem], str]
+) -> Iterator[bytes]:
+    """
+    Stream a ZIP of a live project's generated documents.
+
+    filename(item) names each entry; repeated names get a " (2)" suffix.
+    Content is read while the returned iterator is consumed, so db must
+    stay usable until then.
+    """
+    items = db.scalars(
+        select(DocumentationItem)
+        .where(DocumentationItem.project_id == project_id)
+        .where(DocumentationItem.generated_content_hash.is_not(None))
+        .order_by(DocumentationItem.created_at, DocumentationItem.id)
+    ).all()
+    return _bundle(items, filename)
+
+
+def _bundle(items: List[DocumentationItem], filename: Callable) -> Iterator[bytes]:
+    out = _ChunkWriter()
+    archive = zipfile.ZipFile(out, "w", compression=zipfile.ZIP_STORED)
+    names = set()
+    errors = []
+    # Each job holds a pool slot, so a bundle never takes more than the workers
+    workers = max(export_pool.workers, 1)
+    renders = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bundle")
+    pending = {}
+    try:
+        queue = iter(items)
+        while True:
+            # Keep the workers busy, loading content only for the next few jobs
+            while len(pending) < workers * 2:
+                item = next(queue, None)
+                if item is None:
+                    break
+                key = document_key(item.generated_content_hash, item.title, item.description, item.type.value)
+                cached = export_cache.get(key)
+                if cached is not None:
+                    yield from _add_file(archive, out, names, filename(item), *cached, errors)
+                    continue
+                item_data = {"title": item.title, "description": item.description, "type": item.type.value}
+                future = renders.submit(_render, key, item_data, item.generated_content)
+                pending[future] = item
+
+            if not pending:
+                break
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                item = pending.pop(future)
+                try:
+                    path, stat = future.result()
+                except Exception as e:
+                    errors.append(f"{item.title}: {e}")
+                    continue
+                yield from _add_file(archive, out, names, filename(item), path, stat, errors)
+
+        if errors:
+            archive.writestr(ERRORS_FILENAME, "\n".join(errors) + "\n")
+        archive.close()
+        yield out.drain()
+    finally:
+        # Also reached when the client disconnects mid-download
+        renders.shutdown(wait=False, cancel_futures=True)
+
+
+def _render(key: str, item_data: dict, content: dict):
+    """Render one document into the export cache, waiting while the pool is full."""
+    cached = export_cache.get(key)
+    if cached is not None:
+        return cached
+    partial = export_cache.partial_path(key)
+    deadline = time.monotonic() + export_pool.timeout
+    try:
+        while True:
+            try:
+                export_pool.run(render_docx, str(partial), item_data, content, item_data["type"])
+                break
+            except RenderPoolBusy:
+                if time.monotonic() > deadline:
+                    raise
+                time.sleep(BUSY_RETRY_SECONDS)
+        return export_cache.add(key, partial)
+    finally:
+        partial.unlink(missing_ok=True)
+
+
+def _unique(names: set, name: str) -> str:
+    stem, dot, suffix = name.rpartition(".")
+    candidate, n = name, 1
+    while candidate in names:
+        n += 1
+        candidate = f"{stem} ({n}){dot}{suffix}" if dot else f"{name} ({n})"
+    names.add(candidate)
+    return candidate
+
+
+def _add_file(
+    archive: zipfile.ZipFile,
+    out: _ChunkWriter,
+    names: set,
+    name: str,
+    path: Path,
+    stat,
+    errors: List[str]
+) -> Iterator[bytes]:
+    try:
+        source = open(path, "rb")
+    except OSError as e:
+        # Evicted from the cache since it was found
+        errors.append(f"{name}: {e}")
+        return
+    info = zipfile.ZipInfo(_unique(names, name), date_time=time.localtime(stat.st_mtime)[:6])
+    info.compress_type = zipfile.ZIP_STORED
+    # Known up front, so entries over 2 GB get their ZIP64 header
+    info.file_size = stat.st_size
+    with source, archive.open(info, "w") as entry:
+        while chunk := source.read(CHUNK_SIZE):
+            entry.write(chunk)
+            yield out.drain()
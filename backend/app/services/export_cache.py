@@ -0,0 +1,156 @@
+"""
+On-disk cache of rendered Word exports.
+
+A document is keyed by everything it is rendered from: the hash of the
+generated content's blob, the item's title, description and type, and
+EXPORTER_VERSION. An unchanged document is served from its file after a
+single stat; any edit produces a new key, so entries are never invalidated,
+only evicted least recently used first once the cache outgrows its size
+budget.
+
+Files record their last use in their mtime, so the LRU order survives
+restarts and is shared by every worker using the directory.
+
+Partial files count toward the budget too. Those older than
+STALE_PARTIAL_SECONDS were left behind by a render that crashed or was
+killed, and are deleted at startup and whenever the cache evicts.
+"""
+import hashlib
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Optional, Tuple
+from app.config import settings
+
+# Bump whenever export_service renders a document differently
+EXPORTER_VERSION = 1
+
+SUFFIX = ".docx"
+PARTIAL_SUFFIX = ".tmp"
+
+# Far longer than any render may take
+STALE_PARTIAL_SECONDS = 3600.0
+
+# Hits refresh a file's mtime at most this often, so most hits cost no write
+TOUCH_INTERVAL = 60.0
+
+
+def document_key(content_hash: str, title: str, description: str, doc_type: str) -> str:
+    """Cache key of a rendered document."""
+    parts = (str(EXPORTER_VERSION), content_hash, doc_type, title, description)
+    return hashlib.sha256("\0".join(parts).encode("utf-8")).hexdigest()
+
+
+class ExportCache:
+    """Size-bounded LRU directory of rendered documents, one file per key."""
+
+    def __init__(self, directory: str, max_bytes: int = 256 * 1024 * 1024):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        # Total size as last scanned plus what this process wrote since;
+        # None until the first write
+        self._bytes: Optional[int] = None
+
+    def path(self, key: str) -> Path:
+        return self.directory / f"{key}{SUFFIX}"
+
+    def get(self, key: str) -> Optional[Tuple[Path, os.stat_result]]:
+        """Return the file of key and its stat, or None on a miss."""
+        path = self.path(key)
+        try:
+            stat = path.stat()
+        except OSError:
+            return None
+        now = time.time()
+        if now - stat.st_mtime > TOUCH_INTERVAL:
+            try:
+                os.utime(path, (now, now))
+            except OSError:
+                # Evicted since the stat
+                return None
+            stat = path.stat()
+        return path, stat
+
+    def put(self, key: str, data) -> Tuple[Path, os.stat_result]:
+        """Store the rendered bytes (any buffer) under key and return the file and its stat."""
+        partial = self.partial_path(key)
+        with open(partial, "wb") as f:
+            f.write(data)
+        return self.add(key, partial)
+
+    def partial_path(self, key: str) -> Path:
+        """A private file to render key into before add()."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        return self.path(key).with_name(f"{key}.{os.getpid()}.{threading.get_ident()}{PARTIAL_SUFFIX}")
+
+    def add(self, key: str, partial: Path) -> Tuple[Path, os.stat_result]:
+        """Move a file written at partial_path(key) into place and return the file and its stat."""
+        path = self.path(key)
+        # Write then rename, so concurrent workers never serve a partial file
+        os.replace(partial, path)
+        stat = path.stat()
+
+        with self._lock:
+            if self._bytes is None:
+                self._bytes = self._scan_size()
+            else:
+                self._bytes += stat.st_size
+            if self._bytes > self.max_bytes:
+                self._bytes = self._evict(keep=path)
+        return path, stat
+
+    def clear(self):
+        """Delete every cached document."""
+        with self._lock:
+            for path in self._files():
+                path.unlink(missing_ok=True)
+            self._bytes = 0
+
+    def remove_stale_partials(self) -> int:
+        """Delete partial files abandoned by renders that never finished; returns their total size."""
+        removed = 0
+        for path, stat in self._stat_all(PARTIAL_SUFFIX):
+            if time.time() - stat.st_mtime > STALE_PARTIAL_SECONDS:
+                path.unlink(missing_ok=True)
+                removed += stat.st_size
+        return removed
+
+    def _files(self, suffix: str = SUFFIX):
+        if not self.directory.exists():
+            return []
+        return [path for path in self.directory.iterdir() if path.suffix == suffix]
+
+    def _stat_all(self, suffix: str = SUFFIX):
+        for path in self._files(suffix):
+            try:
+                yield path, path.stat()
+            except OSError:
+                pass
+
+    def _scan_size(self) -> int:
+        return sum(stat.st_size for suffix in (SUFFIX, PARTIAL_SUFFIX) for _, stat in self._stat_all(suffix))
+
+    def _evict(self, keep: Path) -> int:
+        """
+        Delete stale partial files, then the least recently used documents
+        until the cache fits, and return its new size. Other workers' writes
+        are picked up by the scan.
+        """
+        self.remove_stale_partials()
+        # Renders still in progress can't be evicted, but take up room
+        rendering = sum(stat.st_size for _, stat in self._stat_all(PARTIAL_SUFFIX))
+        entries = sorted((stat.st_mtime, path, stat.st_size) for path, stat in self._stat_all())
+        total = rendering + sum(size for _, _, size in entries)
+        for _, path, size in entries:
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            path.unlink(missing_ok=True)
+            total -= size
+        return total
+
+
+export_cache = ExportCache(settings.EXPORT_CACHE_DIR, settings.EXPORT_CACHE_MAX_BYTES)
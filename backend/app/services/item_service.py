@@ -1,7 +1,11 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.orm import Session, load_only, joinedload, selectinload
 from app.models.documentation_item import DocumentationItem
-from app.models.enums import DocumentationItemStatus, DocumentationType
-from typing import List, Optional
+from app.models.enums import DocumentationItemStatus, DocumentationType, RevisionSource
+from app.models.project import Project
+from app.services import archive_service, blob_service, events, revision_service, search_service
+from app.services.pagination import paginate
+from typing import List, Optional, Tuple
 from datetime import datetime, date, timezone
 
 
@@ -13,9 +17,94 @@ def get_items_by_project(db: Session, project_id: int) -> List[DocumentationItem
         .all()
 
 
+@archive_service.read_through(is_empty=archive_service.empty_page)
+def get_items_page(
+    db: Session,
+    project_id: int,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = None,
+    columns: Optional[List[str]] = None
+) -> Tuple[List[DocumentationItem], Optional[str]]:
+    """
+    Get a page of documentation items ordered by (created_at, id), newest first.
+
+    When columns is given only those columns (plus the sort key) are loaded.
+    """
+    query = db.query(DocumentationItem).filter(DocumentationItem.project_id == project_id)
+    if columns:
+        loaded = set(columns) | {"id", "created_at"}
+        options = []
+        if "generated_content" in loaded:
+            loaded.remove("generated_content")
+            loaded.add("generated_content_hash")
+            options.append(selectinload(DocumentationItem.generated_content_blob))
+        query = query.options(load_only(*[getattr(DocumentationItem, c) for c in loaded]), *options)
+    return paginate(
+        query, [DocumentationItem.created_at, DocumentationItem.id], cursor, limit, descending=True
+    )
+
+
+@archive_service.read_through(is_empty=lambda count: count == 0)
+def count_items(db: Session, project_id: int) -> int:
+    """Count documentation items for a project."""
+    return db.query(DocumentationItem).filter(DocumentationItem.project_id == project_id).count()
+
+
+@archive_service.read_through(is_empty=lambda version: version[0] == 0)
+def get_items_version(db: Session, project_id: int) -> Tuple[int, Optional[int], Optional[datetime]]:
+    """
+    Fingerprint a project's item list as (count, max id, max updated_at).
+
+    Any insert, delete or update of an item changes at least one of them.
+    """
+    return tuple(db.execute(
+        select(
+            func.count(DocumentationItem.id),
+            func.max(DocumentationItem.id),
+            func.max(DocumentationItem.updated_at)
+        ).where(DocumentationItem.project_id == project_id)
+    ).one())
+
+
+@archive_service.read_through()
+def get_item_version(db: Session, item_id: int) -> Optional[datetime]:
+    """Get an item's updated_at without loading the row, for cache validation."""
+    return db.scalar(select(DocumentationItem.updated_at).where(DocumentationItem.id == item_id))
+
+
+@archive_service.read_through()
 def get_item(db: Session, item_id: int) -> Optional[DocumentationItem]:
-    """Get a single documentation item by ID."""
-    return db.query(DocumentationItem).filter(DocumentationItem.id == item_id).first()
+    """Get a single documentation item by ID, with its generated content."""
+    return db.get(
+        DocumentationItem, item_id,
+        options=[joinedload(DocumentationItem.generated_content_blob)]
+    )
+
+
+@archive_service.read_through()
+def get_item_context(
+    db: Session,
+    item_id: int,
+    with_questions: bool = True,
+    with_content: bool = True
+) -> Optional[DocumentationItem]:
+    """
+    Get a documentation item with its project and ordered questions loaded.
+
+    The project and both documents are joined into the item SELECT and the
+    questions are fetched with a single SELECT ... IN, so generation and
+    export need no further lookups. Without with_content the generated
+    content is loaded on first access instead.
+    """
+    options = [joinedload(DocumentationItem.project).joinedload(Project.knowledge_base_blob)]
+    if with_content:
+        options.append(joinedload(DocumentationItem.generated_content_blob))
+    if with_questions:
+        options.append(selectinload(DocumentationItem.questions))
+    return db.query(DocumentationItem)\
+        .options(*options)\
+        .filter(DocumentationItem.id == item_id)\
+        .first()
 
 
 def create_item(
@@ -27,17 +116,20 @@ def create_item(
     deadline: Optional[date] = None
 ) -> DocumentationItem:
     """Create a new documentation item."""
-    item = DocumentationItem(
-        project_id=project_id,
-        type=doc_type,
-        title=title,
-        description=description,
-        status=DocumentationItemStatus.DRAFT,
-        deadline=deadline
+    item = db.scalar(
+        insert(DocumentationItem)
+        .values(
+            project_id=project_id,
+            type=doc_type,
+            title=title,
+            description=description,
+            status=DocumentationItemStatus.DRAFT,
+            deadline=deadline
+        )
+        .returning(DocumentationItem)
     )
-    db.add(item)
     db.commit()
-    db.refresh(item)
+    events.changed(events.PROJECT_ITEMS, project_id)
     return item
 
 
@@ -50,58 +142,124 @@ def update_item(
     status: Optional[DocumentationItemStatus] = None
 ) -> Optional[DocumentationItem]:
     """Update an existing documentation item."""
-    item = get_item(db, item_id)
-    if not item:
-        return None
-
+    values = {}
     if title is not None:
-        item.title = title
+        values["title"] = title
     if description is not None:
-        item.description = description
+        values["description"] = description
     if deadline is not None:
-        item.deadline = deadline
+        values["deadline"] = deadline
     if status is not None:
-        item.status = status
+        values["status"] = status
 
-    item.updated_at = datetime.now(timezone.utc)
-    db.commit()
-    db.refresh(item)
-    return item
+    return _update(db, item_id, values)
 
 
 def delete_item(db: Session, item_id: int) -> bool:
-    """Delete a documentation item."""
-    item = get_item(db, item_id)
-    if not item:
-        return False
-
-    db.delete(item)
+    """Delete a documentation item. Its questions go with it via ON DELETE CASCADE."""
+    project_id = db.scalar(
+        delete(DocumentationItem)
+        .where(DocumentationItem.id == item_id)
+        .returning(DocumentationItem.project_id)
+    )
     db.commit()
+    if project_id is None:
+        return False
+    events.changed(events.ITEM, item_id)
+    events.changed(events.PROJECT_ITEMS, project_id)
     return True
 
 
 def update_status(db: Session, item_id: int, status: DocumentationItemStatus) -> Optional[DocumentationItem]:
     """Update the status of a documentation item."""
-    item = get_item(db, item_id)
-    if not item:
-        return None
+    return _update(db, item_id, {"status": status})
 
-    item.status = status
-    item.updated_at = datetime.now(timezone.utc)
-    db.commit()
-    db.refresh(item)
-    return item
+
+def update_generated_content(
+    db: Session,
+    item_id: int,
+    content: dict,
+    source: RevisionSource = RevisionSource.GENERATE,
+    feedback: Optional[str] = None,
+    model: Optional[str] = None,
+    usage: Optional[dict] = None,
+    item: Optional[DocumentationItem] = None,
+    restored_from: Optional[int] = None
+) -> Optional[DocumentationItem]:
+    """
+    Update the generated content of a documentation item and record it as a
+    new revision in the same transaction.
+
+    Pass the already loaded item to avoid reading it again.
+    """
+    if item is None:
+        # Only live items can be written, so don't read through to the archive
+        item = db.get(
+            DocumentationItem, item_id,
+            options=[joinedload(DocumentationItem.generated_content_blob)]
+        )
+        if item is None:
+            return None
+
+    replaced_hash = item.generated_content_hash
+    blob_hash = blob_service.put_json(db, content)
+    revision_number = revision_service.add_revision(
+        db, item, content, blob_hash, source,
+        feedback=feedback, model=model, usage=usage, restored_from=restored_from
+    )
+    search_service.index_item_content(db, item_id, content)
+    return _update(
+        db, item_id,
+        {
+            "generated_content_hash": blob_hash,
+            "revision_count": revision_number,
+            "status": DocumentationItemStatus.GENERATED
+        },
+        # Kept while a revision snapshot still points at it
+        replaced_hashes=[replaced_hash]
+    )
 
 
-def update_generated_content(db: Session, item_id: int, content: dict) -> Optional[DocumentationItem]:
-    """Update the generated content of a documentation item."""
-    item = get_item(db, item_id)
-    if not item:
+def restore_revision(db: Session, item_id: int, revision_number: int) -> Optional[DocumentationItem]:
+    """
+    Make an earlier revision the current content again.
+
+    The restore is recorded as a new revision, so no history is lost. Returns
+    None if the item or revision does not exist.
+    """
+    found = revision_service.get_revision(db, item_id, revision_number)
+    if found is None:
         return None
+    _, content = found
+    return update_generated_content(
+        db, item_id, content, source=RevisionSource.RESTORE, restored_from=revision_number
+    )
+
 
-    item.generated_content = content
-    item.status = DocumentationItemStatus.GENERATED
-    item.updated_at = datetime.now(timezone.utc)
+def _update(
+    db: Session,
+    item_id: int,
+    values: dict,
+    replaced_hashes: Optional[List[Optional[str]]] = None
+) -> Optional[DocumentationItem]:
+    """
+    Apply values to an item with a single UPDATE ... RETURNING and commit.
+
+    replaced_hashes are blobs the values stop referencing; they are deleted in
+    the same transaction unless something else still references them.
+
+    Returns None if the item does not exist.
+    """
+    values["updated_at"] = datetime.now(timezone.utc)
+    item = db.scalar(
+        update(DocumentationItem)
+        .where(DocumentationItem.id == item_id)
+        .values(**values)
+        .returning(DocumentationItem)
+        .execution_options(populate_existing=True)
+    )
+    blob_service.delete_unreferenced(db, [h for h in replaced_hashes or () if h])
     db.commit()
-    db.refresh(item)
+    if item is not None:
+        events.changed(events.ITEM, item_id)
     return item
@@ -0,0 +1,97 @@
+import copy
+from typing import Any, List
+
+# A diff is a list of operations applied in order. Paths are lists of dict keys
+# and list indices from the document root:
+#   {"op": "add" | "replace", "path": [...], "value": ...}
+#   {"op": "remove", "path": [...]}
+#   {"op": "splice", "path": [...], "index": i, "remove": n, "insert": [...]}
+
+
+def diff(old: Any, new: Any) -> List[dict]:
+    """Compute the operations that turn old into new."""
+    ops = []
+    _diff(old, new, [], ops)
+    return ops
+
+
+def patch(document: Any, ops: List[dict]) -> Any:
+    """Apply operations produced by diff to a copy of document."""
+    document = copy.deepcopy(document)
+    for op in ops:
+        path = op["path"]
+        if not path and op["op"] == "replace":
+            document = copy.deepcopy(op["value"])
+            continue
+
+        if op["op"] == "splice":
+            target = _resolve(document, path)
+            target[op["index"]:op["index"] + op["remove"]] = copy.deepcopy(op["insert"])
+            continue
+
+        parent = _resolve(document, path[:-1])
+        key = path[-1]
+        if op["op"] == "remove":
+            del parent[key]
+        else:
+            parent[key] = copy.deepcopy(op["value"])
+    return document
+
+
+def _resolve(document: Any, path: list) -> Any:
+    for key in path:
+        document = document[key]
+    return document
+
+
+def _equal(old: Any, new: Any) -> bool:
+    """Equality that, like JSON, tells True, 1 and 1.0 apart at any depth."""
+    if type(old) is not type(new):
+        return False
+    if isinstance(old, dict):
+        return old.keys() == new.keys() and all(_equal(value, new[key]) for key, value in old.items())
+    if isinstance(old, list):
+        return len(old) == len(new) and all(map(_equal, old, new))
+    return old == new
+
+
+def _diff(old: Any, new: Any, path: list, ops: List[dict]):
+    if _equal(old, new):
+        return
+
+    if isinstance(old, dict) and isinstance(new, dict):
+        for key in old:
+            if key not in new:
+                ops.append({"op": "remove", "path": path + [key]})
+        for key, value in new.items():
+            if key in old:
+                _diff(old[key], value, path + [key], ops)
+            else:
+                ops.append({"op": "add", "path": path + [key], "value": value})
+        return
+
+    if isinstance(old, list) and isinstance(new, list):
+        # Keep the unchanged head and tail, then diff the middle element-wise
+        # when it has the same length or replace it as one splice otherwise
+        start = 0
+        while start < len(old) and start < len(new) and _equal(old[start], new[start]):
+            start += 1
+        end_old, end_new = len(old), len(new)
+        while end_old > start and end_new > start and _equal(old[end_old - 1], new[end_new - 1]):
+            end_old -= 1
+            end_new -= 1
+
+        if end_old - start == end_new - start:
+            for i in range(start, end_old):
+                _diff(old[i], new[i], path + [i], ops)
+        else:
+            ops.append({
+                "op": "splice",
+                "path": path,
+                "index": start,
+                "remove": end_old - start,
+                "insert": new[start:end_new],
+            })
+        return
+
+    ops.append({"op": "replace", "path": path, "value": new})
@@ -0,0 +1,125 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, List, Optional, Tuple
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Query
+
+MAX_PAGE_SIZE = 500
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor cannot be decoded."""
+    pass
+
+
+def encode_cursor(values: List[Any]) -> str:
+    """
+    Encode the sort key of the last row of a page into an opaque cursor.
+
+    Datetimes are stored as ISO strings and restored by decode_cursor.
+    """
+    payload = [
+        {"dt": v.isoformat()} if isinstance(v, datetime) else v
+        for v in values
+    ]
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> List[Any]:
+    """Decode a cursor produced by encode_cursor into its sort key values."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        if not isinstance(payload, list) or len(payload) != size:
+            raise ValueError("unexpected cursor shape")
+        return [
+            datetime.fromisoformat(v["dt"]) if isinstance(v, dict) else v
+            for v in payload
+        ]
+    except (ValueError, TypeError, KeyError) as e:
+        raise InvalidCursorError(f"Invalid cursor: {cursor}") from e
+
+
+def paginate(
+    query: Query,
+    sort_columns: list,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = None,
+    descending: bool = False
+) -> Tuple[list, Optional[str]]:
+    """
+    Apply keyset pagination to a query.
+
+    Rows are ordered by sort_columns (the last column must be unique, e.g. the
+    primary key). Instead of OFFSET, the page starts strictly after the key
+    stored in the cursor, so every page costs the same index range scan
+    regardless of depth.
+
+    Args:
+        query: Base query, already filtered
+        sort_columns: Columns forming the sort key, most significant first
+        cursor: Opaque cursor returned with the previous page
+        limit: Maximum rows per page; None returns every remaining row
+        descending: Sort newest/highest first
+
+    Returns:
+        Tuple of (rows, next_cursor); next_cursor is None on the last page
+
+    Raises:
+        InvalidCursorError: If the cursor is malformed
+    """
+    if cursor:
+        values = decode_cursor(cursor, len(sort_columns))
+        query = query.filter(_after(sort_columns, values, descending))
+
+    order = [c.desc() if descending else c.asc() for c in sort_columns]
+    query = query.order_by(*order)
+
+    if limit is None:
+        return query.all(), None
+
+    rows = query.limit(limit + 1).all()
+    if len(rows) <= limit:
+        return rows, None
+
+    rows = rows[:limit]
+    last = rows[-1]
+    next_cursor = encode_cursor([getattr(last, c.key) for c in sort_columns])
+    return rows, next_cursor
+
+
+def merge_pages(
+    pages: List[Tuple[list, Optional[str]]],
+    sort_columns: list,
+    limit: Optional[int] = None,
+    descending: bool = False
+) -> Tuple[list, Optional[str]]:
+    """
+    Merge pages taken with the same cursor and limit from several sources.
+
+    The first `limit` rows of the merged sort order are always among the
+    first `limit` rows of each source, so the result is exactly the page the
+    union of the sources would have returned.
+    """
+    def key(row):
+        return tuple(getattr(row, c.key) for c in sort_columns)
+
+    rows = sorted((row for page, _ in pages for row in page), key=key, reverse=descending)
+    has_more = any(next_cursor for _, next_cursor in pages)
+    if limit is None or (len(rows) <= limit and not has_more):
+        return rows, None
+
+    rows = rows[:limit]
+    return rows, encode_cursor(list(key(rows[-1])))
+
+
+def _after(sort_columns: list, values: List[Any], descending: bool):
+    """Build the row-value predicate (a, b) > (x, y) as portable OR/AND terms."""
+    clauses = []
+    for i, column in enumerate(sort_columns):
+        equal_prefix = [sort_columns[j] == values[j] for j in range(i)]
+        beyond = column < values[i] if descending else column > values[i]
+        clauses.append(and_(*equal_prefix, beyond))
+    return or_(*clauses)
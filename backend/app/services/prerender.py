@@ -0,0 +1,83 @@
+"""
+Background rendering of Word exports.
+
+Generating, regenerating or restoring content schedules a render of the new
+document into the export cache, so the first download is served from a file.
+Renders run one at a time on a background thread, through the export pool,
+so they never hold more than one of its slots and on-demand exports keep
+priority.
+
+Only an item's latest content is rendered: a queued render is dropped if
+the item's content changed again before it started, and content that is
+already cached is not rendered twice. A render that fails or finds the pool
+full is dropped; the download then renders on demand as before.
+"""
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Optional
+from app.config import settings
+from app.services.export_cache import ExportCache, document_key, export_cache
+from app.services.render_pool import RenderPool, RenderPoolBusy, export_pool, render_docx
+
+
+class Prerenderer:
+    """Single background thread rendering the latest document of each item."""
+
+    def __init__(self, cache: ExportCache, pool: RenderPool, enabled: bool = True):
+        self.cache = cache
+        self.pool = pool
+        self.enabled = enabled
+        self._executor: Optional[ThreadPoolExecutor] = None
+        # Key of each item's newest scheduled document
+        self._latest: Dict[int, str] = {}
+        self._lock = threading.Lock()
+
+    def schedule(self, item, content: dict) -> Optional[Future]:
+        """
+        Queue a render of item with its new generated content.
+
+        Call after the content is committed. Returns the queued render, or
+        None if nothing needs rendering.
+        """
+        if not self.enabled or item.generated_content_hash is None:
+            return None
+        key = document_key(item.generated_content_hash, item.title, item.description, item.type.value)
+        item_data = {"title": item.title, "description": item.description, "type": item.type.value}
+        with self._lock:
+            self._latest[item.id] = key
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="prerender")
+            return self._executor.submit(self._render, item.id, key, item_data, content)
+
+    def shutdown(self):
+        """Drop queued renders and wait for the running one."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+            self._latest.clear()
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def _render(self, item_id: int, key: str, item_data: dict, content: dict) -> bool:
+        """Render one document unless it was superseded or is cached; returns whether it rendered."""
+        with self._lock:
+            superseded = self._latest.get(item_id) != key
+            if not superseded:
+                del self._latest[item_id]
+        if superseded or self.cache.get(key) is not None:
+            return False
+
+        partial = self.cache.partial_path(key)
+        try:
+            self.pool.run(render_docx, str(partial), item_data, content, item_data["type"])
+            self.cache.add(key, partial)
+            return True
+        except RenderPoolBusy:
+            return False
+        except Exception as e:
+            print(f"Failed to pre-render export of item {item_id}: {str(e)}")
+            return False
+        finally:
+            partial.unlink(missing_ok=True)
+
+
+prerenderer = Prerenderer(export_cache, export_pool, enabled=settings.EXPORT_PRERENDER)
@@ -1,7 +1,10 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import case, delete, func, insert, literal, select, update
+from sqlalchemy.orm import Session, joinedload, load_only, selectinload
 from app.models.project import Project
 from app.models.enums import ProjectStatus
-from typing import List, Optional
+from app.services import archive_service, blob_service, events
+from app.services.pagination import merge_pages, paginate
+from typing import List, Optional, Tuple
 from datetime import datetime, timezone
 
 
@@ -13,9 +16,97 @@ def get_projects(db: Session, status: Optional[ProjectStatus] = None) -> List[Pr
     return query.order_by(Project.updated_at.desc()).all()
 
 
+def get_projects_page(
+    db: Session,
+    status: Optional[ProjectStatus] = None,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = None,
+    columns: Optional[List[str]] = None
+) -> Tuple[List[Project], Optional[str]]:
+    """
+    Get a page of projects ordered by (updated_at, id), newest first.
+
+    Live and archived projects are paged together. When columns is given only
+    those columns (plus the sort key) are loaded; other attributes must not be
+    accessed on the returned rows.
+    """
+    live = _projects_page(db, status, cursor, limit, columns)
+    with archive_service.archive_session(db) as archive:
+        archived = _projects_page(archive, status, cursor, limit, columns)
+    return merge_pages([live, archived], [Project.updated_at, Project.id], limit, descending=True)
+
+
+def _projects_page(
+    db: Session,
+    status: Optional[ProjectStatus],
+    cursor: Optional[str],
+    limit: Optional[int],
+    columns: Optional[List[str]]
+) -> Tuple[List[Project], Optional[str]]:
+    query = db.query(Project)
+    if columns:
+        loaded = set(columns) | {"id", "updated_at"}
+        options = []
+        if "knowledge_base" in loaded:
+            loaded.remove("knowledge_base")
+            loaded.add("knowledge_base_hash")
+            options.append(selectinload(Project.knowledge_base_blob))
+        query = query.options(load_only(*[getattr(Project, c) for c in loaded]), *options)
+    if status:
+        query = query.filter(Project.status == status)
+    return paginate(query, [Project.updated_at, Project.id], cursor, limit, descending=True)
+
+
+def count_projects(db: Session, status: Optional[ProjectStatus] = None) -> int:
+    """Count live and archived projects, optionally filtered by status."""
+    with archive_service.archive_session(db) as archive:
+        return _count_projects(db, status) + _count_projects(archive, status)
+
+
+def _count_projects(db: Session, status: Optional[ProjectStatus]) -> int:
+    query = db.query(Project)
+    if status:
+        query = query.filter(Project.status == status)
+    return query.count()
+
+
+def get_projects_version(
+    db: Session,
+    status: Optional[ProjectStatus] = None
+) -> Tuple[int, Optional[int], Optional[datetime]]:
+    """
+    Fingerprint the project list as (count, max id, max updated_at) over live
+    and archived projects, optionally filtered by status.
+
+    Any insert, delete or update of a project changes at least one of them;
+    moving a project between the tiers updates it too.
+    """
+    with archive_service.archive_session(db) as archive:
+        versions = [_projects_version(db, status), _projects_version(archive, status)]
+    return (
+        sum(count for count, _, _ in versions),
+        max((last_id for _, last_id, _ in versions if last_id is not None), default=None),
+        max((last_modified for _, _, last_modified in versions if last_modified is not None), default=None)
+    )
+
+
+def _projects_version(db: Session, status: Optional[ProjectStatus]) -> Tuple[int, Optional[int], Optional[datetime]]:
+    query = select(func.count(Project.id), func.max(Project.id), func.max(Project.updated_at))
+    if status:
+        query = query.where(Project.status == status)
+    return tuple(db.execute(query).one())
+
+
+@archive_service.read_through()
 def get_project(db: Session, project_id: int) -> Optional[Project]:
-    """Get a single project by ID."""
-    return db.query(Project).filter(Project.id == project_id).first()
+    """Get a single project by ID, with its knowledge base."""
+    return db.get(Project, project_id, options=[joinedload(Project.knowledge_base_blob)])
+
+
+@archive_service.read_through()
+def get_project_version(db: Session, project_id: int) -> Optional[datetime]:
+    """Get a project's updated_at without loading the row, for cache validation."""
+    return db.scalar(select(Project.updated_at).where(Project.id == project_id))
 
 
 def create_project(
@@ -26,16 +117,17 @@ def create_project(
     status: ProjectStatus = ProjectStatus.ACTIVE
 ) -> Project:
     """Create a new project."""
-    project = Project(
-        name=name,
-        description=description,
-        client=client,
-        status=status,
-        knowledge_base=""
+    project = db.scalar(
+        insert(Project)
+        .values(
+            name=name,
+            description=description,
+            client=client,
+            status=status
+        )
+        .returning(Project)
     )
-    db.add(project)
     db.commit()
-    db.refresh(project)
     return project
 
 
@@ -48,61 +140,134 @@ def update_project(
     status: Optional[ProjectStatus] = None
 ) -> Optional[Project]:
     """Update an existing project."""
-    project = get_project(db, project_id)
-    if not project:
-        return None
-
+    values = {}
     if name is not None:
-        project.name = name
+        values["name"] = name
     if description is not None:
-        project.description = description
+        values["description"] = description
     if client is not None:
-        project.client = client
+        values["client"] = client
     if status is not None:
-        project.status = status
+        values["status"] = status
 
-    project.updated_at = datetime.now(timezone.utc)
-    db.commit()
-    db.refresh(project)
-    return project
+    return _update_and_place(db, project_id, values)
 
 
 def delete_project(db: Session, project_id: int) -> bool:
-    """Delete a project."""
-    project = get_project(db, project_id)
-    if not project:
-        return False
+    """
+    Delete a project.
 
-    db.delete(project)
+    Items and questions are removed by the database's ON DELETE CASCADE, so
+    this is a single statement however large the project is.
+    """
+    result = db.execute(
+        delete(Project)
+        .where(Project.id == project_id)
+    )
     db.commit()
-    return True
+    deleted = result.rowcount > 0 or archive_service.delete_archived_project(db, project_id)
+    if deleted:
+        events.changed(events.PROJECT, project_id)
+    return deleted
 
 
 def toggle_archive(db: Session, project_id: int) -> Optional[Project]:
-    """Toggle project archive status."""
-    project = get_project(db, project_id)
-    if not project:
-        return None
+    """
+    Toggle project archive status.
+
+    Archiving moves the project to the archive database; unarchiving moves it
+    back.
+    """
+    status_type = Project.__table__.c.status.type
+    return _update_and_place(db, project_id, {
+        "status": case(
+            (Project.status == ProjectStatus.ARCHIVED, literal(ProjectStatus.ACTIVE, status_type)),
+            else_=literal(ProjectStatus.ARCHIVED, status_type)
+        )
+    })
+
 
-    if project.status == ProjectStatus.ARCHIVED:
-        project.status = ProjectStatus.ACTIVE
+def update_knowledge_base(
+    db: Session,
+    project_id: int,
+    knowledge_base: str,
+    project: Optional[Project] = None
+) -> Optional[Project]:
+    """
+    Update project knowledge base, deleting the blob of the one it replaces.
+
+    Pass the already loaded project to avoid reading its current knowledge
+    base hash again.
+    """
+    if project is not None:
+        replaced_hash = project.knowledge_base_hash
     else:
-        project.status = ProjectStatus.ARCHIVED
+        replaced_hash = _get_knowledge_base_hash(db, project_id)
+    blob_hash = blob_service.put_text(db, knowledge_base) if knowledge_base else None
+    return _update_and_place(db, project_id, {"knowledge_base_hash": blob_hash}, replaced_hashes=[replaced_hash])
 
-    project.updated_at = datetime.now(timezone.utc)
-    db.commit()
-    db.refresh(project)
-    return project
 
+def _get_knowledge_base_hash(db: Session, project_id: int) -> Optional[str]:
+    row = _get_knowledge_base_row(db, project_id)
+    return row.knowledge_base_hash if row is not None else None
 
-def update_knowledge_base(db: Session, project_id: int, knowledge_base: str) -> Optional[Project]:
-    """Update project knowledge base."""
-    project = get_project(db, project_id)
-    if not project:
-        return None
 
-    project.knowledge_base = knowledge_base
-    project.updated_at = datetime.now(timezone.utc)
+@archive_service.read_through()
+def _get_knowledge_base_row(db: Session, project_id: int):
+    # A row, so projects without a knowledge base aren't looked up in the archive
+    return db.execute(select(Project.knowledge_base_hash).where(Project.id == project_id)).first()
+
+
+def _update_and_place(
+    db: Session,
+    project_id: int,
+    values: dict,
+    replaced_hashes: Optional[List[Optional[str]]] = None
+) -> Optional[Project]:
+    """
+    Apply values to a project wherever it is stored, then keep it in the tier
+    its status belongs to: archived projects in the archive, others live.
+
+    replaced_hashes are blobs the values stop referencing; they are deleted in
+    the same transaction unless something else still references them.
+
+    Returns None if the project does not exist.
+    """
+    project = _update(db, project_id, values, commit=False)
+    if project is None:
+        # Archived projects are read only, so edits restore them first
+        if not archive_service.restore_project(db, project_id):
+            return None
+        project = _update(db, project_id, values, commit=False)
+    blob_service.delete_unreferenced(db, [h for h in replaced_hashes or () if h])
+
+    if project.status != ProjectStatus.ARCHIVED:
+        db.commit()
+        events.changed(events.PROJECT, project_id)
+        return project
+
+    archive_service.archive_project(db, project_id)
     db.commit()
-    db.refresh(project)
+    events.changed(events.PROJECT, project_id)
+    db.expunge(project)
+    with archive_service.archive_session(db) as archive:
+        return get_project(archive, project_id)
+
+
+def _update(db: Session, project_id: int, values: dict, commit: bool = True) -> Optional[Project]:
+    """
+    Apply values to a project with a single UPDATE ... RETURNING and commit.
+
+    Returns None if the project does not exist.
+    """
+    values["updated_at"] = datetime.now(timezone.utc)
+    project = db.scalar(
+        update(Project)
+        .where(Project.id == project_id)
+        .values(**values)
+        .returning(Project)
+        .execution_options(populate_existing=True)
+    )
+    if commit:
+        db.commit()
     return project
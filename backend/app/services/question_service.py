@@ -1,7 +1,39 @@
-from sqlalchemy.orm import Session
+from itertools import groupby
+from operator import attrgetter
+from sqlalchemy import bindparam, case, exists, func, insert, literal_column, select, update
+from sqlalchemy.orm import Session, aliased
+from sqlalchemy.orm.attributes import set_committed_value
 from app.models.question import Question
+from app.models.documentation_item import DocumentationItem
 from app.models.enums import QuestionType
-from typing import List, Optional
+from app.services import archive_service, events, visibility
+from app.services.pagination import paginate
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from datetime import datetime
+
+# What the visibility evaluator reads of each question
+_VISIBILITY_COLUMNS = (
+    Question.doc_item_id,
+    Question.id,
+    Question.parent_question_id,
+    Question.question_type,
+    Question.is_critical,
+    Question.is_answered,
+    Question.answer,
+    Question.trigger_condition,
+)
+
+_Child = aliased(Question)
+
+# RETURNING columns are rendered without their table name, which inside the
+# subquery would resolve to the alias; spell the correlation out
+_HAS_CHILDREN = exists().where(
+    _Child.parent_question_id == literal_column(f"{Question.__tablename__}.id")
+).label("has_children")
+
+# Questions whose answer cannot show or hide another; only these are counted
+# incrementally
+_STANDALONE = (Question.parent_question_id.is_(None), ~exists().where(_Child.parent_question_id == Question.id))
 
 
 def get_questions_by_item(db: Session, item_id: int) -> List[Question]:
@@ -12,9 +44,58 @@ def get_questions_by_item(db: Session, item_id: int) -> List[Question]:
         .all()
 
 
+@archive_service.read_through(is_empty=archive_service.empty_page)
+def get_questions_page(
+    db: Session,
+    item_id: int,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = None
+) -> Tuple[List[Question], Optional[str]]:
+    """
+    Get a page of questions for a documentation item ordered by (display_order, id).
+
+    Each question's is_visible is evaluated against the whole item, not just
+    the page.
+    """
+    query = db.query(Question).filter(Question.doc_item_id == item_id)
+    questions, next_cursor = paginate(query, [Question.display_order, Question.id], cursor, limit)
+    if questions:
+        _annotate_visibility(questions, get_visible_ids(db, item_id))
+    return questions, next_cursor
+
+
+def get_visible_ids(db: Session, item_id: int) -> Set[int]:
+    """Ids of the questions of an item that are currently shown."""
+    return visibility.visible_ids(
+        db.execute(select(*_VISIBILITY_COLUMNS).where(Question.doc_item_id == item_id)).all()
+    )
+
+
+@archive_service.read_through(is_empty=lambda count: count == 0)
+def count_questions(db: Session, item_id: int) -> int:
+    """Count questions for a documentation item."""
+    return db.query(Question).filter(Question.doc_item_id == item_id).count()
+
+
+@archive_service.read_through()
+def get_questions_version(db: Session, item_id: int) -> Optional[Tuple[datetime, int, int]]:
+    """
+    Fingerprint an item's questions as the item's (updated_at,
+    total_questions, project_id).
+
+    Every question write also updates the item's counters, which bumps its
+    updated_at, so the questions themselves need not be read.
+    """
+    row = db.execute(
+        select(DocumentationItem.updated_at, DocumentationItem.total_questions, DocumentationItem.project_id)
+        .where(DocumentationItem.id == item_id)
+    ).first()
+    return tuple(row) if row else None
+
+
 def get_question(db: Session, question_id: int) -> Optional[Question]:
     """Get a single question by ID."""
-    return db.query(Question).filter(Question.id == question_id).first()
+    return db.get(Question, question_id)
 
 
 def create_question(
@@ -29,73 +110,197 @@ def create_question(
     trigger_condition: Optional[dict] = None
 ) -> Question:
     """Create a new question."""
-    question = Question(
-        doc_item_id=doc_item_id,
-        parent_question_id=parent_question_id,
-        question_text=question_text,
-        question_type=question_type,
-        options=options,
-        is_critical=is_critical,
-        display_order=display_order,
-        trigger_condition=trigger_condition,
-        is_answered=False
+    question = db.scalar(
+        insert(Question)
+        .values(
+            doc_item_id=doc_item_id,
+            parent_question_id=parent_question_id,
+            question_text=question_text,
+            question_type=question_type,
+            options=options,
+            is_critical=is_critical,
+            display_order=display_order,
+            trigger_condition=trigger_condition,
+            is_answered=False
+        )
+        .returning(Question)
     )
-    db.add(question)
+    if parent_question_id is not None:
+        refresh_counters(db, [doc_item_id])
+    else:
+        _adjust_counters(db, doc_item_id, total=1, critical=1 if is_critical else 0)
     db.commit()
-    db.refresh(question)
+    events.changed(events.ITEM, doc_item_id)
     return question
 
 
 def create_questions_batch(db: Session, questions_data: List[dict]) -> List[Question]:
-    """Create multiple questions at once."""
-    questions = []
-    for data in questions_data:
-        question = Question(**data)
-        questions.append(question)
-        db.add(question)
+    """
+    Create multiple questions at once.
 
-    db.commit()
-    for question in questions:
-        db.refresh(question)
+    Uses a bulk INSERT ... RETURNING, so the new rows come back without a
+    SELECT per question. A question may name its parent by position in the
+    batch with a "parent_question_index" key instead of parent_question_id;
+    those are resolved to ids in one more statement.
+    """
+    if not questions_data:
+        return []
+
+    rows = [{k: v for k, v in data.items() if k != "parent_question_index"} for data in questions_data]
+    questions = db.scalars(insert(Question).returning(Question, sort_by_parameter_order=True), rows).all()
+    _link_parents(db, questions, [data.get("parent_question_index") for data in questions_data])
+
+    item_ids = list(dict.fromkeys(data["doc_item_id"] for data in questions_data))
+    conditional = [q.doc_item_id for q in questions if q.parent_question_id is not None]
+    if conditional:
+        # New conditional questions start hidden unless their parent already
+        # has the required answer; let the evaluator decide
+        refresh_counters(db, item_ids)
+    else:
+        deltas = {}
+        for data in questions_data:
+            delta = deltas.setdefault(
+                data["doc_item_id"],
+                {"total": 0, "answered": 0, "critical": 0, "critical_answered": 0}
+            )
+            is_critical = data.get("is_critical", True)
+            is_answered = data.get("is_answered", False)
+            delta["total"] += 1
+            delta["answered"] += 1 if is_answered else 0
+            delta["critical"] += 1 if is_critical else 0
+            delta["critical_answered"] += 1 if is_critical and is_answered else 0
+
+        for item_id, delta in deltas.items():
+            _adjust_counters(db, item_id, **delta)
 
+    db.commit()
+    for item_id in item_ids:
+        events.changed(events.ITEM, item_id)
     return questions
 
 
+def _link_parents(db: Session, questions: List[Question], parent_indexes: List[Optional[int]]):
+    """
+    Set parent_question_id from batch positions, without committing.
+
+    Only earlier questions of the same item can be parents; other indexes are
+    ignored and leave the question unconditional.
+    """
+    links = []
+    for position, (question, parent_index) in enumerate(zip(questions, parent_indexes)):
+        if parent_index is None or not 0 <= parent_index < position:
+            continue
+        parent = questions[parent_index]
+        if parent.doc_item_id == question.doc_item_id:
+            links.append((question, parent.id))
+    if not links:
+        return
+
+    table = Question.__table__
+    db.execute(
+        update(table).where(table.c.id == bindparam("question_id")).values(parent_question_id=bindparam("parent_id")),
+        [{"question_id": question.id, "parent_id": parent_id} for question, parent_id in links]
+    )
+    for question, parent_id in links:
+        set_committed_value(question, "parent_question_id", parent_id)
+
+
 def update_answer(db: Session, question_id: int, answer: str) -> Optional[Question]:
     """Update the answer for a question."""
-    question = get_question(db, question_id)
-    if not question:
+    return _set_answer(db, question_id, answer)
+
+
+def update_answers_batch(
+    db: Session,
+    item_id: int,
+    answers: Dict[int, str]
+) -> Optional[Tuple[List[Question], dict]]:
+    """
+    Update many answers of a documentation item in one transaction.
+
+    The item counters are adjusted first (counting the questions that flip to
+    answered in SQL), then all answers are written with a single
+    UPDATE ... CASE ... RETURNING. If a conditional question or a parent was
+    answered, the counters are recomputed from the shown questions instead.
+    Returns the updated questions in display order with the new completion
+    status, or None if any question does not belong to the item.
+    """
+    if not answers:
+        return [], get_completion_status(db, item_id)
+
+    ids = list(answers.keys())
+    in_item = (Question.doc_item_id == item_id, Question.id.in_(ids))
+
+    counters = db.execute(
+        update(DocumentationItem)
+        .where(DocumentationItem.id == item_id)
+        .values(
+            answered_questions=DocumentationItem.answered_questions
+            + _count_questions(*in_item, *_STANDALONE, Question.is_answered == False),
+            critical_answered=DocumentationItem.critical_answered
+            + _count_questions(*in_item, *_STANDALONE, Question.is_answered == False, Question.is_critical == True)
+        )
+        .returning(
+            DocumentationItem.total_questions,
+            DocumentationItem.answered_questions,
+            DocumentationItem.critical_questions,
+            DocumentationItem.critical_answered
+        )
+        .execution_options(synchronize_session="fetch")
+    ).first()
+
+    rows = db.execute(
+        update(Question)
+        .where(*in_item)
+        .values(answer=case(answers, value=Question.id), is_answered=True)
+        .returning(Question, _HAS_CHILDREN)
+        .execution_options(populate_existing=True)
+    ).all()
+
+    if counters is None or len(rows) != len(ids):
+        db.rollback()
         return None
 
-    question.answer = answer
-    question.is_answered = True
+    questions = [question for question, _ in rows]
+    if any(question.parent_question_id is not None or has_children for question, has_children in rows):
+        counters, visible = _refresh_item(db, item_id)
+        _annotate_visibility(questions, visible)
+
     db.commit()
-    db.refresh(question)
-    return question
+    events.changed(events.ITEM, item_id)
+    questions = sorted(questions, key=lambda q: q.display_order)
+    return questions, completion_status(*counters)
 
 
 def clear_answer(db: Session, question_id: int) -> Optional[Question]:
     """Clear the answer for a question."""
-    question = get_question(db, question_id)
-    if not question:
-        return None
-
-    question.answer = None
-    question.is_answered = False
-    db.commit()
-    db.refresh(question)
-    return question
+    return _set_answer(db, question_id, None)
 
 
 def get_completion_status(db: Session, item_id: int) -> dict:
-    """Get the completion status for all questions in a documentation item."""
-    questions = get_questions_by_item(db, item_id)
+    """
+    Get the completion status over the shown questions of a documentation item.
 
-    total = len(questions)
-    answered = sum(1 for q in questions if q.is_answered)
-    critical = sum(1 for q in questions if q.is_critical)
-    critical_answered = sum(1 for q in questions if q.is_critical and q.is_answered)
+    Reads the denormalized counters on the item row instead of loading the
+    questions.
+    """
+    counters = _get_counters(db, item_id)
+    total, answered, critical, critical_answered = counters or (0, 0, 0, 0)
+    return completion_status(total, answered, critical, critical_answered)
 
+
+@archive_service.read_through()
+def _get_counters(db: Session, item_id: int):
+    return db.query(
+        DocumentationItem.total_questions,
+        DocumentationItem.answered_questions,
+        DocumentationItem.critical_questions,
+        DocumentationItem.critical_answered
+    ).filter(DocumentationItem.id == item_id).first()
+
+
+def completion_status(total: int, answered: int, critical: int, critical_answered: int) -> dict:
+    """Build a completion status dict from question counts."""
     return {
         "total_questions": total,
         "answered_questions": answered,
@@ -109,5 +314,173 @@ def get_completion_status(db: Session, item_id: int) -> dict:
 def delete_questions_by_item(db: Session, item_id: int) -> int:
     """Delete all questions for a documentation item. Returns count of deleted questions."""
     count = db.query(Question).filter(Question.doc_item_id == item_id).delete()
+    db.query(DocumentationItem).filter(DocumentationItem.id == item_id).update(
+        {
+            DocumentationItem.total_questions: 0,
+            DocumentationItem.answered_questions: 0,
+            DocumentationItem.critical_questions: 0,
+            DocumentationItem.critical_answered: 0,
+        },
+        synchronize_session=False
+    )
     db.commit()
+    events.changed(events.ITEM, item_id)
     return count
+
+
+def recount_completion(db: Session, item_id: Optional[int] = None) -> int:
+    """
+    Recompute the denormalized question counters from the shown questions.
+
+    Repairs drift after manual edits or failed writes. Returns the number of
+    items whose counters changed.
+    """
+    items_query = db.query(DocumentationItem)
+    if item_id is not None:
+        items_query = items_query.filter(DocumentationItem.id == item_id)
+    counts = _visible_counts(db, [item_id] if item_id is not None else None)
+
+    changed = []
+    for item in items_query.all():
+        expected = counts.get(item.id, (0, 0, 0, 0))
+        current = (item.total_questions, item.answered_questions, item.critical_questions, item.critical_answered)
+        if current != expected:
+            item.total_questions, item.answered_questions, item.critical_questions, item.critical_answered = expected
+            changed.append(item.id)
+
+    db.commit()
+    for changed_id in changed:
+        events.changed(events.ITEM, changed_id)
+    return len(changed)
+
+
+def refresh_counters(db: Session, item_ids: List[int]) -> Dict[int, Tuple[int, int, int, int]]:
+    """
+    Recompute the counters of item_ids from their shown questions, without
+    committing, and return them.
+
+    Needed whenever a write may show or hide conditional questions.
+    """
+    counts = {item_id: (0, 0, 0, 0) for item_id in item_ids}
+    counts.update(_visible_counts(db, item_ids))
+    _set_counters(db, counts)
+    return counts
+
+
+def _visible_counts(db: Session, item_ids: Optional[List[int]] = None) -> Dict[int, Tuple[int, int, int, int]]:
+    """Counters per item over its shown questions, evaluating one item at a time."""
+    query = select(*_VISIBILITY_COLUMNS).order_by(Question.doc_item_id)
+    if item_ids is not None:
+        query = query.where(Question.doc_item_id.in_(item_ids))
+    rows = db.execute(query.execution_options(yield_per=1000))
+    return {
+        item_id: visibility.counters(questions)
+        for item_id, questions in groupby(rows, key=attrgetter("doc_item_id"))
+    }
+
+
+def _refresh_item(db: Session, item_id: int) -> Tuple[Tuple[int, int, int, int], Set[int]]:
+    """Recompute one item's counters without committing; returns them with the shown ids."""
+    rows = db.execute(select(*_VISIBILITY_COLUMNS).where(Question.doc_item_id == item_id)).all()
+    visible = visibility.visible_ids(rows)
+    counts = visibility.counters(rows, visible)
+    _set_counters(db, {item_id: counts})
+    return counts, visible
+
+
+def _set_counters(db: Session, counts: Dict[int, Tuple[int, int, int, int]]):
+    if not counts:
+        return
+    items = DocumentationItem.__table__
+    db.execute(
+        update(items)
+        .where(items.c.id == bindparam("item_id"))
+        .values(
+            total_questions=bindparam("total"),
+            answered_questions=bindparam("answered"),
+            critical_questions=bindparam("critical"),
+            critical_answered=bindparam("critical_answered")
+        ),
+        [
+            {"item_id": item_id, "total": c[0], "answered": c[1], "critical": c[2], "critical_answered": c[3]}
+            for item_id, c in counts.items()
+        ]
+    )
+
+
+def _annotate_visibility(questions: Iterable[Question], visible: Set[int]):
+    for question in questions:
+        question.is_visible = question.id in visible
+
+
+def _set_answer(db: Session, question_id: int, answer: Optional[str]) -> Optional[Question]:
+    """
+    Set or clear (answer=None) a question's answer in two statements.
+
+    The item counters are adjusted first from the question's current state in
+    SQL, then the question is updated with RETURNING. Answers to conditional
+    questions and their parents can show or hide other questions, so those
+    items are recounted from the shown questions instead.
+    """
+    answered = answer is not None
+    sign = 1 if answered else -1
+    flipping = (Question.id == question_id, Question.is_answered == (not answered), *_STANDALONE)
+
+    db.execute(
+        update(DocumentationItem)
+        .where(
+            DocumentationItem.id == select(Question.doc_item_id)
+            .where(Question.id == question_id)
+            .scalar_subquery()
+        )
+        .values(
+            answered_questions=DocumentationItem.answered_questions
+            + sign * _count_questions(*flipping),
+            critical_answered=DocumentationItem.critical_answered
+            + sign * _count_questions(*flipping, Question.is_critical == True)
+        )
+        .execution_options(synchronize_session="fetch")
+    )
+    row = db.execute(
+        update(Question)
+        .where(Question.id == question_id)
+        .values(answer=answer, is_answered=answered)
+        .returning(Question, _HAS_CHILDREN)
+        .execution_options(populate_existing=True)
+    ).first()
+    if row is None:
+        db.commit()
+        return None
+
+    question, has_children = row
+    if question.parent_question_id is not None or has_children:
+        _, visible = _refresh_item(db, question.doc_item_id)
+        _annotate_visibility([question], visible)
+    db.commit()
+    events.changed(events.ITEM, question.doc_item_id)
+    return question
+
+
+def _count_questions(*criteria):
+    """Scalar subquery counting the questions matching criteria."""
+    return select(func.count(Question.id)).where(*criteria).scalar_subquery()
+
+
+def _adjust_counters(
+    db: Session,
+    item_id: int,
+    total: int = 0,
+    answered: int = 0,
+    critical: int = 0,
+    critical_answered: int = 0
+) -> None:
+    """Apply relative changes to an item's question counters in the current transaction."""
+    db.query(DocumentationItem).filter(DocumentationItem.id == item_id).update(
+        {
+            DocumentationItem.total_questions: DocumentationItem.total_questions + total,
+            DocumentationItem.answered_questions: DocumentationItem.answered_questions + answered,
+            DocumentationItem.critical_questions: DocumentationItem.critical_questions + critical,
+            DocumentationItem.critical_answered: DocumentationItem.critical_answered + critical_answered,
+        },
+        synchronize_session="fetch"
+    )
@@ -0,0 +1,213 @@
+"""
+Worker processes for CPU-bound document rendering.
+
+python-docx is pure Python: rendering a large FRS holds the GIL for long
+enough to stall every other request of the worker. Exports therefore run in
+a few spawned processes, each running one render at a time, which import
+the exporter once, when they start, and render straight into a file of the
+export cache.
+
+The pool is bounded twice: at most queue_depth renders may be running or
+waiting, and callers stop waiting after timeout seconds. A render that timed
+out has its process killed before the caller hears of it, so a stuck
+exporter neither holds a worker or a slot nor writes to the partial file the
+caller is about to delete; a fresh process takes its place on demand.
+
+With workers=0 renders run in the calling thread, still bounded.
+"""
+import importlib
+import multiprocessing
+import threading
+import time
+from typing import Any, Callable, List, Set
+from app.config import settings
+
+# Forking a threaded server can deadlock the child; spawn starts clean
+_CONTEXT = multiprocessing.get_context("spawn")
+
+# How long a killed worker gets to exit on SIGTERM before it is SIGKILLed
+_STOP_GRACE_SECONDS = 1.0
+
+
+class RenderPoolBusy(Exception):
+    """Raised when queue_depth renders are already running or waiting."""
+    pass
+
+
+class RenderTimeout(Exception):
+    """Raised when a render did not finish within the timeout."""
+    pass
+
+
+def render_docx(path: str, item_data: dict, generated_content: dict, doc_type: str):
+    """Render a Word document into path. Runs in a worker process."""
+    from app.services.export_service import export_to_word
+    buffer = export_to_word(item_data, generated_content, doc_type)
+    with open(path, "wb") as f:
+        f.write(buffer.getbuffer())
+
+
+def _warm(modules):
+    for module in modules:
+        importlib.import_module(module)
+
+
+def _serve(connection, warm_modules):
+    """Worker process loop: run each (fn, args) received and send back its outcome."""
+    _warm(warm_modules)
+    while True:
+        try:
+            fn, args = connection.recv()
+        except EOFError:
+            return
+        try:
+            outcome = (True, fn(*args))
+        except Exception as e:
+            outcome = (False, e)
+        try:
+            connection.send(outcome)
+        except Exception as e:
+            # The result or exception could not be pickled
+            connection.send((False, RuntimeError(f"Render worker could not return its result: {e!r}")))
+
+
+class _Worker:
+    """One worker process and the pipe it takes calls on."""
+
+    def __init__(self, warm_modules):
+        self.connection, child = _CONTEXT.Pipe()
+        self.process = _CONTEXT.Process(target=_serve, args=(child, warm_modules), daemon=True)
+        self.process.start()
+        child.close()
+
+    def call(self, fn: Callable, args: tuple, timeout: float) -> Any:
+        self.connection.send((fn, args))
+        if not self.connection.poll(timeout):
+            raise RenderTimeout(f"Rendering took longer than {timeout:g}s")
+        try:
+            ok, value = self.connection.recv()
+        except EOFError:
+            raise RuntimeError(f"Render worker exited with code {self.process.exitcode}")
+        if not ok:
+            raise value
+        return value
+
+    def stop(self):
+        """Kill the process and wait until it is gone."""
+        self.process.terminate()
+        self.process.join(_STOP_GRACE_SECONDS)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+        self.connection.close()
+
+
+class RenderPool:
+    """Bounded pool of worker processes with per-call timeouts."""
+
+    def __init__(
+        self,
+        workers: int,
+        queue_depth: int,
+        timeout: float,
+        warm_modules=("app.services.export_service",)
+    ):
+        self.workers = workers
+        self.queue_depth = queue_depth
+        self.timeout = timeout
+        self.warm_modules = tuple(warm_modules)
+        self._slots = threading.BoundedSemaphore(queue_depth)
+        # Live workers, and those of them waiting for a call
+        self._live: Set[_Worker] = set()
+        self._idle: List[_Worker] = []
+        self._available = threading.Condition()
+
+    def start(self):
+        """
+        Start the worker processes without waiting for them.
+
+        Each process imports warm_modules as it starts, so the first exports
+        don't pay for it. Calling run() starts workers as well.
+        """
+        while True:
+            with self._available:
+                if len(self._live) >= self.workers:
+                    return
+                worker = _Worker(self.warm_modules)
+                self._live.add(worker)
+                self._idle.append(worker)
+                self._available.notify()
+
+    def shutdown(self):
+        """Stop the worker processes, failing renders still running."""
+        with self._available:
+            workers, self._live, self._idle = list(self._live), set(), []
+        for worker in workers:
+            worker.stop()
+
+    def run(self, fn: Callable, *args) -> Any:
+        """
+        Call fn(*args) in a worker process and return its result.
+
+        fn and its arguments must be picklable.
+
+        Raises:
+            RenderPoolBusy: If queue_depth calls are already running or waiting
+            RenderTimeout: If fn did not finish within the timeout
+        """
+        if not self._slots.acquire(blocking=False):
+            raise RenderPoolBusy(f"{self.queue_depth} renders are already queued")
+        try:
+            if self.workers <= 0:
+                return fn(*args)
+
+            deadline = time.monotonic() + self.timeout
+            worker = self._acquire(deadline)
+            healthy = False
+            try:
+                result = worker.call(fn, args, max(deadline - time.monotonic(), 0))
+                healthy = True
+                return result
+            except RenderTimeout:
+                raise
+            except Exception:
+                # An exception raised by fn leaves its worker usable
+                healthy = worker.process.is_alive()
+                raise
+            finally:
+                self._release(worker, healthy)
+        finally:
+            self._slots.release()
+
+    def _acquire(self, deadline: float) -> _Worker:
+        """Take an idle worker, starting one if the pool is not full, waiting until deadline."""
+        with self._available:
+            while not self._idle and len(self._live) >= self.workers:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise RenderTimeout(f"No render worker became free within {self.timeout:g}s")
+                self._available.wait(remaining)
+            if self._idle:
+                return self._idle.pop()
+            worker = _Worker(self.warm_modules)
+            self._live.add(worker)
+            return worker
+
+    def _release(self, worker: _Worker, healthy: bool):
+        with self._available:
+            # Workers of a pool shut down meanwhile are no longer live
+            reuse = healthy and worker in self._live
+            if reuse:
+                self._idle.append(worker)
+            else:
+                self._live.discard(worker)
+            self._available.notify()
+        if not reuse:
+            worker.stop()
+
+
+export_pool = RenderPool(
+    workers=settings.EXPORT_WORKERS,
+    queue_depth=settings.EXPORT_QUEUE_DEPTH,
+    timeout=settings.EXPORT_TIMEOUT_SECONDS
+)
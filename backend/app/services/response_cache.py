@@ -0,0 +1,190 @@
+"""
+In-process cache of serialised GET responses.
+
+Entries are bounded by count and size, expire after a TTL and are evicted
+least recently used first. Callers key entries by the entity and its
+version fingerprint (the ETag), so an entry is never served for data that
+has changed since. Each entry also carries tags such as ("item", 7); the
+service layer's change events drop every entry tagged with what they name,
+releasing entries that can no longer be hit.
+
+Writes made by other processes (other uvicorn workers, the CLI commands) are
+not seen by the events; the entries they make stale are not served, but a
+pluggable backend reports those writes so they are released: LocalBackend
+assumes a single process, DataVersionBackend watches SQLite's data_version
+and clears the whole cache whenever another connection committed.
+"""
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Hashable, Iterable, Optional, Set, Tuple
+from sqlalchemy.engine import make_url
+from app.config import settings
+from app.services import events
+
+Tag = Tuple[str, int]
+
+
+@dataclass
+class CachedResponse:
+    """A serialised response body with the headers it was sent with."""
+    body: bytes
+    headers: Dict[str, str] = field(default_factory=dict)
+
+
+class LocalBackend:
+    """Single process: every write goes through this process's events."""
+
+    def poll(self) -> bool:
+        return False
+
+
+class DataVersionBackend:
+    """
+    Detect commits from other connections through PRAGMA data_version.
+
+    Runs on its own connection, so it also reports this process's commits;
+    the cache is then cleared more often than strictly needed, but never
+    serves data another worker has changed.
+    """
+
+    def __init__(self, database_path: str, archive_path: Optional[str] = None):
+        self._database_path = database_path
+        self._archive_path = archive_path
+        self._conn = None
+        self._version = None
+        self._lock = threading.Lock()
+
+    def poll(self) -> bool:
+        with self._lock:
+            if self._conn is None:
+                self._conn = sqlite3.connect(self._database_path, check_same_thread=False)
+                if self._archive_path:
+                    self._conn.execute("ATTACH DATABASE ? AS archive", (self._archive_path,))
+            version = [self._conn.execute("PRAGMA main.data_version").fetchone()[0]]
+            if self._archive_path:
+                version.append(self._conn.execute("PRAGMA archive.data_version").fetchone()[0])
+            changed = self._version is not None and version != self._version
+            self._version = version
+            return changed
+
+
+class ResponseCache:
+    """Bounded TTL + LRU map from request keys to CachedResponse."""
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        max_bytes: int = 32 * 1024 * 1024,
+        ttl: float = 60.0,
+        backend=None,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.backend = backend or LocalBackend()
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Hashable, Tuple[float, CachedResponse, Tuple[Tag, ...]]]" = OrderedDict()
+        self._tags: Dict[Tag, Set[Hashable]] = {}
+        self._bytes = 0
+        self._generation = 0
+        self._stats = dict.fromkeys(("hits", "misses", "evictions", "expirations", "invalidations"), 0)
+
+    def get(self, key: Hashable) -> Optional[CachedResponse]:
+        """Return the live entry for key, or None on a miss."""
+        if self.backend.poll():
+            self.clear()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= self._clock():
+                self._remove(key)
+                self._stats["expirations"] += 1
+                entry = None
+            if entry is None:
+                self._stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            return entry[1]
+
+    def token(self) -> int:
+        """Take before reading the data an entry is built from; pass to set()."""
+        return self._generation
+
+    def set(self, key: Hashable, value: CachedResponse, tags: Iterable[Tag], token: int) -> bool:
+        """
+        Store value under key unless anything was invalidated since token was
+        taken, since the value may then have been read before that write.
+        """
+        size = len(value.body)
+        with self._lock:
+            if token != self._generation or size > self.max_bytes:
+                return False
+            if key in self._entries:
+                self._remove(key)
+            tags = tuple(tags)
+            self._entries[key] = (self._clock() + self.ttl, value, tags)
+            self._bytes += size
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self._stats["evictions"] += 1
+            return True
+
+    def invalidate(self, kind: str, entity_id: int):
+        """Drop every entry tagged (kind, entity_id)."""
+        with self._lock:
+            self._generation += 1
+            self._stats["invalidations"] += 1
+            for key in self._tags.pop((kind, entity_id), ()):
+                if key in self._entries:
+                    self._remove(key)
+
+    def clear(self):
+        """Drop every entry."""
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+            self._tags.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        """Hit rate and counters since the process started."""
+        with self._lock:
+            lookups = self._stats["hits"] + self._stats["misses"]
+            return {
+                **self._stats,
+                "hit_rate": self._stats["hits"] / lookups if lookups else 0.0,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+            }
+
+    def _remove(self, key: Hashable):
+        _, value, tags = self._entries.pop(key)
+        self._bytes -= len(value.body)
+        for tag in tags:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+
+def _backend():
+    if settings.CACHE_BACKEND == "sqlite":
+        return DataVersionBackend(make_url(settings.DATABASE_URL).database, settings.ARCHIVE_DATABASE_PATH)
+    return LocalBackend()
+
+
+response_cache = ResponseCache(
+    max_entries=settings.CACHE_MAX_ENTRIES,
+    max_bytes=settings.CACHE_MAX_BYTES,
+    ttl=settings.CACHE_TTL_SECONDS,
+    backend=_backend()
+)
+events.subscribe(response_cache.invalidate)
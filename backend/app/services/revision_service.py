@@ -0,0 +1,126 @@
+import json
+from sqlalchemy import func, insert, select
+from sqlalchemy.orm import Session, joinedload, load_only
+from app.models.documentation_item import DocumentationItem
+from app.models.enums import RevisionSource
+from app.models.revision import ContentRevision
+from app.services import archive_service, json_diff
+from app.services.pagination import paginate
+from typing import List, Optional, Tuple
+
+# Every Nth revision stores the full document, so rebuilding any revision
+# applies at most SNAPSHOT_INTERVAL - 1 diffs
+SNAPSHOT_INTERVAL = 10
+
+SUMMARY_COLUMNS = [
+    "id", "doc_item_id", "revision_number", "source", "feedback", "restored_from",
+    "model", "prompt_tokens", "completion_tokens", "total_tokens", "created_at",
+]
+
+
+def add_revision(
+    db: Session,
+    item: DocumentationItem,
+    content: dict,
+    blob_hash: str,
+    source: RevisionSource,
+    feedback: Optional[str] = None,
+    model: Optional[str] = None,
+    usage: Optional[dict] = None,
+    restored_from: Optional[int] = None
+) -> int:
+    """
+    Record content as the next revision of an item, without committing.
+
+    The revision is stored as a diff against the item's current content unless
+    a snapshot is due or the diff would not be smaller than the document
+    itself. Snapshots reference the document's blob, which the item shares, so
+    they cost no extra storage while they are current.
+
+    Returns:
+        The new revision number
+    """
+    number = item.revision_count + 1
+    base = item.generated_content
+    snapshot = (number - 1) % SNAPSHOT_INTERVAL == 0 or base is None
+
+    ops = None
+    if not snapshot:
+        ops = json_diff.diff(base, content)
+        if _size(ops) >= _size(content):
+            snapshot, ops = True, None
+
+    usage = usage or {}
+    db.execute(
+        insert(ContentRevision).values(
+            doc_item_id=item.id,
+            revision_number=number,
+            source=source,
+            feedback=feedback,
+            restored_from=restored_from,
+            model=model,
+            prompt_tokens=usage.get("prompt_tokens"),
+            completion_tokens=usage.get("completion_tokens"),
+            total_tokens=usage.get("total_tokens"),
+            is_snapshot=snapshot,
+            blob_hash=blob_hash if snapshot else None,
+            content=ops
+        )
+    )
+    return number
+
+
+@archive_service.read_through(is_empty=archive_service.empty_page)
+def get_revisions_page(
+    db: Session,
+    item_id: int,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = None
+) -> Tuple[List[ContentRevision], Optional[str]]:
+    """Get a page of an item's revisions, newest first, without their content."""
+    query = db.query(ContentRevision)\
+        .options(load_only(*[getattr(ContentRevision, c) for c in SUMMARY_COLUMNS]))\
+        .filter(ContentRevision.doc_item_id == item_id)
+    return paginate(query, [ContentRevision.revision_number], cursor, limit, descending=True)
+
+
+@archive_service.read_through()
+def get_revision(db: Session, item_id: int, revision_number: int) -> Optional[Tuple[ContentRevision, dict]]:
+    """
+    Get a revision together with its rebuilt document.
+
+    Loads the revision, the nearest snapshot at or before it and the diffs in
+    between with one SELECT.
+
+    Returns:
+        Tuple of (revision, content), or None if the revision does not exist
+    """
+    last_snapshot = select(func.max(ContentRevision.revision_number))\
+        .where(
+            ContentRevision.doc_item_id == item_id,
+            ContentRevision.is_snapshot.is_(True),
+            ContentRevision.revision_number <= revision_number
+        )\
+        .scalar_subquery()
+
+    chain = db.query(ContentRevision)\
+        .options(joinedload(ContentRevision.blob))\
+        .filter(
+            ContentRevision.doc_item_id == item_id,
+            ContentRevision.revision_number <= revision_number,
+            ContentRevision.revision_number >= last_snapshot
+        )\
+        .order_by(ContentRevision.revision_number)\
+        .all()
+
+    if not chain or chain[-1].revision_number != revision_number:
+        return None
+
+    content = chain[0].blob.json()
+    for revision in chain[1:]:
+        content = json_diff.patch(content, revision.content)
+    return chain[-1], content
+
+
+def _size(value) -> int:
+    return len(json.dumps(value, separators=(",", ":"), ensure_ascii=False))
@@ -0,0 +1,176 @@
+import html
+import re
+from sqlalchemy import text
+from sqlalchemy.orm import Session, joinedload
+from app.models.documentation_item import DocumentationItem
+from app.models.search_index import KIND_ITEM, KIND_NAMES, SEARCH_INDEX_BACKFILL
+from app.services.pagination import decode_cursor, encode_cursor
+from typing import Any, List, Optional, Tuple
+
+KIND_CODES = {name: code for code, name in KIND_NAMES.items()}
+
+# Title matches count ten times as much as body or document matches
+_RANK = "bm25(search_index, 0, 0, 0, 0, 10.0, 1.0, 1.0)"
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+# FTS5 marks matches with these private-use characters, so the indexed text
+# can be HTML-escaped before they are swapped for <mark> tags
+_MARK_OPEN = "\ue000"
+_MARK_CLOSE = "\ue001"
+
+
+def build_match_query(query: str) -> Optional[str]:
+    """
+    Turn free text into a safe FTS5 MATCH expression.
+
+    Every word becomes a quoted prefix term and all terms must match, so user
+    input can never produce FTS5 syntax errors.
+    """
+    tokens = _TOKEN.findall(query)
+    if not tokens:
+        return None
+    return " ".join(f'"{token}"*' for token in tokens)
+
+
+def search(
+    db: Session,
+    query: str,
+    kind: Optional[str] = None,
+    project_id: Optional[int] = None,
+    cursor: Optional[str] = None,
+    limit: int = 20
+) -> Tuple[List[dict], Optional[str]]:
+    """
+    Full-text search across projects, items, questions and generated documents.
+
+    Results are ordered by relevance (bm25, lower is better) and paginated
+    with a keyset cursor over (score, rowid).
+
+    Args:
+        db: Database session
+        query: Free-text search query
+        kind: Restrict to "project", "item" or "question"
+        project_id: Restrict to one project
+        cursor: Opaque cursor returned with the previous page
+        limit: Maximum results per page
+
+    Returns:
+        Tuple of (results, next_cursor)
+
+    Raises:
+        InvalidCursorError: If the cursor is malformed
+    """
+    match = build_match_query(query)
+    if match is None:
+        return [], None
+
+    conditions = ["search_index MATCH :match"]
+    params = {"match": match, "limit": limit + 1, "mark_open": _MARK_OPEN, "mark_close": _MARK_CLOSE}
+    if kind is not None:
+        conditions.append("kind = :kind")
+        params["kind"] = KIND_CODES[kind]
+    if project_id is not None:
+        conditions.append("project_id = :project_id")
+        params["project_id"] = project_id
+
+    # Rank every match, but only highlight the rows of the requested page
+    after = ""
+    if cursor:
+        params["after_score"], params["after_rowid"] = decode_cursor(cursor, 2)
+        after = "WHERE score > :after_score OR (score = :after_score AND rowid > :after_rowid)"
+
+    sql = f"""
+        WITH page AS (
+            SELECT rowid, score FROM (
+                SELECT rowid, {_RANK} AS score
+                FROM search_index
+                WHERE {" AND ".join(conditions)}
+            )
+            {after}
+            ORDER BY score, rowid
+            LIMIT :limit
+        )
+        SELECT search_index.rowid, kind, entity_id, project_id, item_id,
+               highlight(search_index, 4, :mark_open, :mark_close) AS title,
+               snippet(search_index, -1, :mark_open, :mark_close, '…', 16) AS snippet,
+               page.score
+        FROM search_index JOIN page ON page.rowid = search_index.rowid
+        WHERE search_index MATCH :match
+        ORDER BY page.score, page.rowid
+    """
+    rows = db.execute(text(sql), params).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor([rows[-1].score, rows[-1].rowid])
+
+    results = [
+        {
+            "type": KIND_NAMES[row.kind],
+            "id": row.entity_id,
+            "project_id": row.project_id,
+            "item_id": row.item_id,
+            "title": _marked_html(row.title),
+            "snippet": _marked_html(row.snippet),
+            "score": row.score,
+        }
+        for row in rows
+    ]
+    return results, next_cursor
+
+
+def _marked_html(value: Optional[str]) -> str:
+    """Escape indexed text for HTML and turn the match markers into <mark> tags."""
+    escaped = html.escape(value or "")
+    return escaped.replace(_MARK_OPEN, "<mark>").replace(_MARK_CLOSE, "</mark>")
+
+
+def content_text(content: Any) -> str:
+    """Flatten a generated document to the text of its string values."""
+    if isinstance(content, str):
+        return content
+    if isinstance(content, dict):
+        content = content.values()
+    elif not isinstance(content, list):
+        return ""
+    return " ".join(text for text in map(content_text, content) if text)
+
+
+def index_item_content(db: Session, item_id: int, content: Optional[dict]):
+    """Write an item's generated document to its search index row, without committing."""
+    index_items_content(db, [(item_id, content)])
+
+
+def index_items_content(db: Session, contents: List[Tuple[int, Optional[dict]]]):
+    """Write several (item_id, content) pairs to the search index in one executemany."""
+    if not contents:
+        return
+    db.execute(
+        text(f"UPDATE search_index SET content = :content WHERE rowid = :item_id * 4 + {KIND_ITEM}"),
+        [
+            {"content": content_text(content) if content else None, "item_id": item_id}
+            for item_id, content in contents
+        ]
+    )
+
+
+def rebuild_index(db: Session) -> int:
+    """
+    Rebuild the search index from the projects, items and questions tables.
+
+    Returns the number of indexed rows.
+    """
+    db.execute(text("DELETE FROM search_index"))
+    for statement in SEARCH_INDEX_BACKFILL:
+        db.execute(text(statement))
+
+    items = db.query(DocumentationItem)\
+        .options(joinedload(DocumentationItem.generated_content_blob))\
+        .filter(DocumentationItem.generated_content_hash.is_not(None))\
+        .all()
+    index_items_content(db, [(item.id, item.generated_content) for item in items])
+
+    db.commit()
+    return db.execute(text("SELECT count(*) FROM search_index")).scalar()
@@ -0,0 +1,217 @@
+"""
+Markdown and standalone HTML renderings of generated documents.
+
+Both formats walk the same per-type section layout (SECTIONS) and emit text
+through a small set of format strings compiled once at import, so a render
+is a single pass of string formatting over generated_content: no document
+model is built, and output is yielded section by section.
+
+Sections are rendered in the order of the docx export and skipped when the
+content leaves them empty.
+"""
+import html
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+# Bump whenever a rendering changes, so clients revalidate their copies
+VERSION = 1
+
+MARKDOWN = "markdown"
+HTML = "html"
+
+MEDIA_TYPES = {MARKDOWN: "text/markdown; charset=utf-8", HTML: "text/html; charset=utf-8"}
+EXTENSIONS = {MARKDOWN: ".md", HTML: ".html"}
+
+GHERKIN_KEYWORDS = (("given", "Given"), ("when", "When"), ("then", "Then"))
+
+# (kind, key in generated_content, heading, kind-specific options)
+Section = Tuple[str, str, str, Optional[tuple]]
+
+SECTIONS: Dict[str, List[Section]] = {
+    "UserStory": [
+        ("user_story", "user_story", "User Story", None),
+        ("scenarios", "acceptance_criteria", "Acceptance Criteria", None),
+        ("paragraph", "notes", "Notes", None),
+        ("list", "dependencies", "Dependencies", None),
+    ],
+    "PRD": [
+        ("paragraph", "overview", "Overview", None),
+        ("list", "objectives", "Objectives", None),
+        ("lists", "scope", "Scope", (("in_scope", "In Scope"), ("out_of_scope", "Out of Scope"))),
+        ("table", "stakeholders", "Stakeholders", (("role", "Role"), ("responsibilities", "Responsibilities"))),
+        ("table", "requirements", "Requirements",
+         (("id", "ID"), ("description", "Description"), ("priority", "Priority"))),
+        ("list", "constraints", "Constraints", None),
+        ("list", "success_criteria", "Success Criteria", None),
+    ],
+    "Epic": [
+        ("paragraph", "business_value", "Business Value", None),
+        ("list", "user_problems", "User Problems", None),
+        ("lists", "scope", "Scope", (("included", "Included"), ("excluded", "Excluded"))),
+        ("table", "features", "Features", (("name", "Feature"), ("description", "Description"))),
+        ("list", "dependencies", "Dependencies", None),
+        ("list", "success_metrics", "Success Metrics", None),
+    ],
+    "FRS": [
+        ("paragraph", "overview", "Overview", None),
+        ("areas", "functional_areas", "Functional Requirements", (
+            ("id", "ID"), ("description", "Description"), ("priority", "Priority"),
+            ("inputs", "Inputs"), ("outputs", "Outputs"), ("business_rules", "Business Rules"),
+        )),
+    ],
+}
+
+
+class _Markdown:
+    document = "# {}\n\n".format
+    heading = {2: "## {}\n\n".format, 3: "### {}\n\n".format}
+    paragraph = "{}\n\n".format
+    item = "- {}\n".format
+    list_start = ""
+    list_end = "\n"
+    user_story = "**As a** {}, **I want** {}, **so that** {}.\n\n".format
+    scenario_start = "```gherkin\nScenario: {}\n".format
+    step = "  {} {}\n".format
+    scenario_end = "```\n\n"
+    row = "| {} |\n".format
+    cell_separator = " | "
+    table_end = "\n"
+    end = ""
+
+    @staticmethod
+    def text(value) -> str:
+        return str(value)
+
+    @staticmethod
+    def cell(value) -> str:
+        return str(value).replace("|", "\\|").replace("\n", " ")
+
+    @classmethod
+    def table_start(cls, headers: List[str]) -> str:
+        return cls.row(cls.cell_separator.join(headers)) + cls.row(cls.cell_separator.join("---" for _ in headers))
+
+
+class _Html:
+    document = (
+        "<!DOCTYPE html>\n<html lang=\"en\">\n<head>\n<meta charset=\"utf-8\">\n<title>{0}</title>\n"
+        "<style>body{{font-family:system-ui,sans-serif;max-width:50rem;margin:2rem auto;padding:0 1rem;"
+        "line-height:1.5}}table{{border-collapse:collapse;width:100%}}"
+        "th,td{{border:1px solid #ccc;padding:.4rem;text-align:left;vertical-align:top}}"
+        "pre{{background:#f6f8fa;padding:1rem}}</style>\n</head>\n<body>\n<h1>{0}</h1>\n"
+    ).format
+    heading = {2: "<h2>{}</h2>\n".format, 3: "<h3>{}</h3>\n".format}
+    paragraph = "<p>{}</p>\n".format
+    item = "<li>{}</li>\n".format
+    list_start = "<ul>\n"
+    list_end = "</ul>\n"
+    user_story = "<p><strong>As a</strong> {}, <strong>I want</strong> {}, <strong>so that</strong> {}.</p>\n".format
+    scenario_start = "<pre><code class=\"language-gherkin\">Scenario: {}\n".format
+    step = "  {} {}\n".format
+    scenario_end = "</code></pre>\n"
+    header_row = "<tr><th>{}</th></tr>\n".format
+    row = "<tr><td>{}</td></tr>\n".format
+    cell_separator = "</td><td>"
+    table_end = "</table>\n"
+    end = "</body>\n</html>\n"
+
+    @staticmethod
+    def text(value) -> str:
+        return html.escape(str(value))
+
+    cell = text
+
+    @classmethod
+    def table_start(cls, headers: List[str]) -> str:
+        return "<table>\n" + cls.header_row("</th><th>".join(headers))
+
+
+FORMATS = {MARKDOWN: _Markdown, HTML: _Html}
+
+
+def render(generated_content: dict, doc_type: str, fmt: str, title: Optional[str] = None) -> Iterator[str]:
+    """
+    Yield the document in fmt (MARKDOWN or HTML), a section at a time.
+
+    title is used when the content has none. Unknown doc types render their
+    title only.
+    """
+    f = FORMATS[fmt]
+    yield f.document(f.text(generated_content.get("title") or title or ""))
+    for kind, key, heading, options in SECTIONS.get(doc_type, ()):
+        value = generated_content.get(key)
+        if not value:
+            continue
+        yield f.heading[2](f.text(heading))
+        yield from _RENDERERS[kind](f, value, options)
+    yield f.end
+
+
+def _paragraph(f, value, options) -> Iterator[str]:
+    yield f.paragraph(f.text(value))
+
+
+def _list(f, value, options) -> Iterator[str]:
+    yield f.list_start
+    for entry in value:
+        yield f.item(f.text(entry))
+    yield f.list_end
+
+
+def _lists(f, value, options) -> Iterator[str]:
+    for key, heading in options:
+        if value.get(key):
+            yield f.heading[3](f.text(heading))
+            yield from _list(f, value[key], None)
+
+
+def _table(f, value, options) -> Iterator[str]:
+    yield f.table_start([f.text(heading) for _, heading in options])
+    for row in value:
+        yield f.row(f.cell_separator.join(f.cell(_cell_value(row.get(key))) for key, _ in options))
+    yield f.table_end
+
+
+def _cell_value(value) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, list):
+        return "; ".join(str(entry) for entry in value)
+    return str(value)
+
+
+def _user_story(f, value, options) -> Iterator[str]:
+    yield f.user_story(*(f.text(value.get(key, "")) for key in ("as_a", "i_want", "so_that")))
+
+
+def _scenarios(f, value, options) -> Iterator[str]:
+    for scenario in value:
+        yield f.scenario_start(f.text(scenario.get("scenario_name", "")))
+        for key, keyword in GHERKIN_KEYWORDS:
+            for index, step in enumerate(scenario.get(key) or ()):
+                yield f.step(*_gherkin_step(keyword if index == 0 else "And", f.text(step)))
+        yield f.scenario_end
+
+
+def _gherkin_step(keyword: str, step: str) -> Tuple[str, str]:
+    """Split off a keyword the model already wrote, so it isn't doubled."""
+    first, _, rest = step.partition(" ")
+    if first.lower() in ("given", "when", "then", "and", "but"):
+        return first, rest
+    return keyword, step
+
+
+def _areas(f, value, options) -> Iterator[str]:
+    for area in value:
+        yield f.heading[3](f.text(area.get("area_name", "")))
+        if area.get("requirements"):
+            yield from _table(f, area["requirements"], options)
+
+
+_RENDERERS: Dict[str, Callable[..., Iterator[str]]] = {
+    "paragraph": _paragraph,
+    "list": _list,
+    "lists": _lists,
+    "table": _table,
+    "user_story": _user_story,
+    "scenarios": _scenarios,
+    "areas": _areas,
+}
@@ -0,0 +1,306 @@
+"""
+Project dumps for backup and migration between instances.
+
+A dump is NDJSON: one project record, then its documentation items, then
+their questions, one JSON object per line with a "record" key naming the
+kind. Rows are streamed from the database with yield_per and written out one
+line at a time, and loading consumes the lines in batches of bulk inserts,
+so neither side holds a whole project in memory.
+
+Ids are not kept: a loaded project gets new ids, and item and question ids
+in the dump are only used to remap doc_item_id and parent_question_id.
+Content revisions are not part of a dump; loaded items start their history
+from their current document.
+"""
+from datetime import date, datetime
+from itertools import groupby, islice
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+import orjson
+from sqlalchemy import bindparam, insert, select, update
+from sqlalchemy.orm import Session, joinedload
+from app.models.documentation_item import DocumentationItem
+from app.models.enums import DocumentationItemStatus, DocumentationType, ProjectStatus, QuestionType
+from app.models.project import Project
+from app.models.question import Question
+from app.services import archive_service, blob_service, question_service, search_service
+
+FORMAT_VERSION = 1
+
+# Rows fetched from the database, or inserted, per round trip
+BATCH_SIZE = 500
+
+
+class InvalidDumpError(ValueError):
+    """Raised when a project dump cannot be loaded."""
+    pass
+
+
+# Columns written for each record kind, with how to read them back
+_PROJECT_FIELDS: Dict[str, Callable] = {
+    "name": str,
+    "description": str,
+    "client": lambda v: v,
+    "status": ProjectStatus,
+    "created_at": datetime.fromisoformat,
+    "updated_at": datetime.fromisoformat,
+}
+
+_ITEM_FIELDS: Dict[str, Callable] = {
+    "type": DocumentationType,
+    "title": str,
+    "description": str,
+    "status": DocumentationItemStatus,
+    "deadline": date.fromisoformat,
+    "created_at": datetime.fromisoformat,
+    "updated_at": datetime.fromisoformat,
+}
+
+_QUESTION_FIELDS: Dict[str, Callable] = {
+    "question_text": str,
+    "question_type": QuestionType,
+    "options": lambda v: v,
+    "is_critical": bool,
+    "display_order": int,
+    "answer": lambda v: v,
+    "is_answered": bool,
+    "trigger_condition": lambda v: v,
+}
+
+
+def dump_project(db: Session, project_id: int) -> Optional[Iterator[bytes]]:
+    """
+    Stream a project, live or archived, as NDJSON lines.
+
+    Returns None if the project does not exist. The rows are read while the
+    returned iterator is consumed, so db must stay usable until then.
+    """
+    if db.get(Project, project_id) is not None:
+        return _dump_lines(db, project_id)
+
+    with archive_service.archive_session(db) as archive:
+        if archive.get(Project, project_id) is None:
+            return None
+
+    def archived_lines():
+        with archive_service.archive_session(db) as archive:
+            yield from _dump_lines(archive, project_id)
+
+    return archived_lines()
+
+
+def load_project(db: Session, lines: Iterable[bytes]) -> Project:
+    """
+    Create a new project from NDJSON dump lines and commit.
+
+    Items and questions are inserted in batches with multi-row
+    INSERT ... RETURNING to learn their new ids; question parents are linked
+    once every question is in. Nothing is committed if the dump is invalid.
+
+    Raises:
+        InvalidDumpError: If the dump is malformed or its records are out of order
+    """
+    try:
+        project_id = _load_records(db, _parse(lines))
+        project = db.get(Project, project_id, options=[joinedload(Project.knowledge_base_blob)])
+        if project.status == ProjectStatus.ARCHIVED:
+            archive_service.archive_project(db, project_id)
+    except Exception:
+        db.rollback()
+        raise
+    db.commit()
+
+    if project.status != ProjectStatus.ARCHIVED:
+        return project
+    db.expunge(project)
+    with archive_service.archive_session(db) as archive:
+        return archive.get(Project, project_id, options=[joinedload(Project.knowledge_base_blob)])
+
+
+def _load_records(db: Session, records: Iterator[dict]) -> int:
+    project_id = _insert_project(db, next(records, None))
+
+    # Dump ids to new ids; only ids are kept, never rows
+    item_ids: Dict[int, int] = {}
+    question_ids: Dict[int, int] = {}
+    # (new question id, parent id in the dump), linked once all questions exist
+    parents: List[Tuple[int, int]] = []
+
+    for kind, batch in _batches(records):
+        if kind == "item":
+            if question_ids:
+                raise InvalidDumpError(f"Line {batch[0]['_line']}: items must come before questions")
+            _insert_items(db, project_id, batch, item_ids)
+        elif kind == "question":
+            _insert_questions(db, batch, item_ids, question_ids, parents)
+        else:
+            raise InvalidDumpError(f"Line {batch[0]['_line']}: unexpected {kind!r} record")
+
+    _link_parents(db, question_ids, parents)
+    question_service.refresh_counters(db, list(item_ids.values()))
+    return project_id
+
+
+def _dump_lines(db: Session, project_id: int) -> Iterator[bytes]:
+    project = db.get(Project, project_id, options=[joinedload(Project.knowledge_base_blob)])
+    yield _line({
+        "record": "project",
+        "format": FORMAT_VERSION,
+        **{name: getattr(project, name) for name in _PROJECT_FIELDS},
+        "knowledge_base": project.knowledge_base,
+    })
+
+    items = db.scalars(
+        select(DocumentationItem)
+        .options(joinedload(DocumentationItem.generated_content_blob))
+        .where(DocumentationItem.project_id == project_id)
+        .order_by(DocumentationItem.id)
+        .execution_options(yield_per=BATCH_SIZE)
+    )
+    for item in items:
+        yield _line({
+            "record": "item",
+            "id": item.id,
+            **{name: getattr(item, name) for name in _ITEM_FIELDS},
+            "generated_content": item.generated_content,
+        })
+        # Loaded objects are not needed again; keep the identity map small
+        db.expunge(item)
+
+    questions = Question.__table__
+    rows = db.execute(
+        select(questions)
+        .join(DocumentationItem, DocumentationItem.id == questions.c.doc_item_id)
+        .where(DocumentationItem.project_id == project_id)
+        .order_by(questions.c.doc_item_id, questions.c.display_order, questions.c.id)
+        .execution_options(yield_per=BATCH_SIZE)
+    )
+    for row in rows.mappings():
+        yield _line({
+            "record": "question",
+            "id": row["id"],
+            "doc_item_id": row["doc_item_id"],
+            "parent_question_id": row["parent_question_id"],
+            **{name: row[name] for name in _QUESTION_FIELDS},
+        })
+
+
+def _line(record: dict) -> bytes:
+    return orjson.dumps(record, option=orjson.OPT_APPEND_NEWLINE)
+
+
+def _parse(lines: Iterable[bytes]) -> Iterator[dict]:
+    for number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = orjson.loads(line)
+        except orjson.JSONDecodeError as e:
+            raise InvalidDumpError(f"Line {number} is not valid JSON: {e}")
+        if not isinstance(record, dict) or "record" not in record:
+            raise InvalidDumpError(f"Line {number} is not a dump record")
+        record["_line"] = number
+        yield record
+
+
+def _fields(record: dict, fields: Dict[str, Callable]) -> dict:
+    values = {}
+    for name, convert in fields.items():
+        value = record.get(name)
+        try:
+            values[name] = convert(value) if value is not None else None
+        except (TypeError, ValueError):
+            raise InvalidDumpError(f"Line {record['_line']}: invalid {name} {value!r}")
+    return values
+
+
+def _insert_project(db: Session, record: Optional[dict]) -> int:
+    if record is None:
+        raise InvalidDumpError("The dump is empty")
+    if record["record"] != "project":
+        raise InvalidDumpError(f"Line {record['_line']}: a dump must start with its project record")
+    if record.get("format") != FORMAT_VERSION:
+        raise InvalidDumpError(f"Unsupported dump format {record.get('format')!r}")
+    values = _fields(record, _PROJECT_FIELDS)
+    if values["name"] is None or values["description"] is None:
+        raise InvalidDumpError("The project record needs a name and a description")
+    values["status"] = values["status"] or ProjectStatus.ACTIVE
+    if record.get("knowledge_base"):
+        values["knowledge_base_hash"] = blob_service.put_text(db, record["knowledge_base"])
+    return db.scalar(insert(Project).values(**values).returning(Project.id))
+
+
+def _batches(records: Iterator[dict]) -> Iterator[Tuple[str, List[dict]]]:
+    """Group consecutive records of the same kind into batches of at most BATCH_SIZE."""
+    for kind, run in groupby(records, key=lambda record: record["record"]):
+        while batch := list(islice(run, BATCH_SIZE)):
+            yield kind, batch
+
+
+def _insert_items(db: Session, project_id: int, batch: List[dict], item_ids: Dict[int, int]):
+    rows = []
+    for record in batch:
+        values = _fields(record, _ITEM_FIELDS)
+        if values["type"] is None or values["title"] is None or values["description"] is None:
+            raise InvalidDumpError(f"Line {record['_line']}: an item needs a type, title and description")
+        values["project_id"] = project_id
+        values["status"] = values["status"] or DocumentationItemStatus.DRAFT
+        content = record.get("generated_content")
+        values["generated_content_hash"] = blob_service.put_json(db, content) if content is not None else None
+        rows.append(values)
+
+    new_ids = db.scalars(
+        insert(DocumentationItem).returning(DocumentationItem.id, sort_by_parameter_order=True), rows
+    ).all()
+    for record, new_id in zip(batch, new_ids):
+        item_ids[record.get("id")] = new_id
+    search_service.index_items_content(db, [
+        (new_id, record["generated_content"])
+        for record, new_id in zip(batch, new_ids)
+        if record.get("generated_content") is not None
+    ])
+
+
+def _insert_questions(
+    db: Session,
+    batch: List[dict],
+    item_ids: Dict[int, int],
+    question_ids: Dict[int, int],
+    parents: List[Tuple[int, int]]
+):
+    rows = []
+    for record in batch:
+        values = _fields(record, _QUESTION_FIELDS)
+        if record.get("doc_item_id") not in item_ids:
+            raise InvalidDumpError(f"Line {record['_line']}: unknown item {record.get('doc_item_id')!r}")
+        if values["question_text"] is None or values["question_type"] is None or values["display_order"] is None:
+            raise InvalidDumpError(
+                f"Line {record['_line']}: a question needs a question_text, question_type and display_order"
+            )
+        values["doc_item_id"] = item_ids[record["doc_item_id"]]
+        values["is_critical"] = values["is_critical"] if values["is_critical"] is not None else True
+        values["is_answered"] = bool(values["is_answered"])
+        rows.append(values)
+
+    new_ids = db.scalars(insert(Question).returning(Question.id, sort_by_parameter_order=True), rows).all()
+    for record, new_id in zip(batch, new_ids):
+        question_ids[record.get("id")] = new_id
+        if record.get("parent_question_id") is not None:
+            parents.append((new_id, record["parent_question_id"]))
+
+
+def _link_parents(db: Session, question_ids: Dict[int, int], parents: List[Tuple[int, int]]):
+    """Point questions at their parents' new ids; links to unknown questions are dropped."""
+    links = [
+        {"question_id": new_id, "parent_id": question_ids[parent]}
+        for new_id, parent in parents
+        if parent in question_ids
+    ]
+    if not links:
+        return
+    questions = Question.__table__
+    db.execute(
+        update(questions)
+        .where(questions.c.id == bindparam("question_id"))
+        .values(parent_question_id=bindparam("parent_id")),
+        links
+    )
@@ -0,0 +1,87 @@
+"""
+Which questions of a documentation item are shown.
+
+A question with a parent_question_id is conditional: it is shown when its
+parent is shown and answered with the trigger's required answer, or with one
+of them when required_answer is a list. Without a required answer any answer
+shows it. Checkbox answers are ", "-joined selections, any of which may match.
+Questions without a parent are always shown.
+
+Hidden questions are left out of the completion counters and the generation
+prompts, so answering them is never required.
+"""
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from app.models.enums import QuestionType
+
+# How the client joins checkbox selections into an answer
+CHECKBOX_SEPARATOR = ", "
+
+
+def children_map(questions: Iterable) -> Dict[Optional[int], List]:
+    """
+    Group questions by parent_question_id.
+
+    Questions whose parent is not among them (deleted parents are set to NULL,
+    but a page may not hold them) are grouped under None with the roots.
+    """
+    questions = list(questions)
+    ids = {q.id for q in questions}
+    children: Dict[Optional[int], List] = {}
+    for q in questions:
+        parent = q.parent_question_id if q.parent_question_id in ids else None
+        children.setdefault(parent, []).append(q)
+    return children
+
+
+def visible_ids(questions: Iterable) -> Set[int]:
+    """
+    Ids of the shown questions, in one pass from the roots down.
+
+    Each question is visited at most once, through its parent; questions on a
+    parent cycle are never reached and count as hidden.
+    """
+    children = children_map(questions)
+    visible = set()
+    stack = list(children.get(None, ()))
+    while stack:
+        question = stack.pop()
+        visible.add(question.id)
+        stack.extend(child for child in children.get(question.id, ()) if triggered(question, child))
+    return visible
+
+
+def visible_questions(questions: Iterable) -> List:
+    """The shown questions, in their original order."""
+    questions = list(questions)
+    visible = visible_ids(questions)
+    return [q for q in questions if q.id in visible]
+
+
+def triggered(parent, child) -> bool:
+    """Whether the parent's answer satisfies the child's trigger condition."""
+    if not parent.is_answered or parent.answer is None:
+        return False
+    required = (child.trigger_condition or {}).get("required_answer")
+    if required is None:
+        return True
+    required = set(required) if isinstance(required, list) else {required}
+    if parent.question_type == QuestionType.CHECKBOX:
+        return not required.isdisjoint(parent.answer.split(CHECKBOX_SEPARATOR))
+    return parent.answer in required
+
+
+def counters(questions: Iterable, visible: Optional[Set[int]] = None) -> Tuple[int, int, int, int]:
+    """
+    (total, answered, critical, critical_answered) over the shown questions.
+
+    Pass visible if the caller has already evaluated it.
+    """
+    questions = list(questions)
+    visible = visible_ids(questions) if visible is None else visible
+    shown = [q for q in questions if q.id in visible]
+    return (
+        len(shown),
+        sum(1 for q in shown if q.is_answered),
+        sum(1 for q in shown if q.is_critical),
+        sum(1 for q in shown if q.is_critical and q.is_answered),
+    )
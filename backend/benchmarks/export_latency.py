@@ -0,0 +1,120 @@
+"""
+Benchmark of API latency while Word exports are rendering.
+
+A probe thread sends GET /api/metrics/cache through the ASGI app in a loop
+and records each request's latency, first on an idle server, then while two
+threads keep rendering a large FRS document:
+
+- inline: export_service.export_to_word on the calling thread, as the
+  export route used to, holding the GIL while it builds the document
+- pool: through app.services.render_pool, which renders in worker
+  processes while the request thread waits without the GIL
+
+With the pool, p99 should stay close to the idle server's.
+
+Usage:
+    python -m benchmarks.export_latency [requirements] [seconds]
+"""
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.api import metrics
+from app.services.render_pool import RenderPool, render_docx
+
+EXPORTERS = 2
+
+
+def _content(count: int) -> dict:
+    """An FRS with count requirements spread over ten functional areas."""
+    return {
+        "title": "Order management",
+        "overview": "Functional requirements of the order management system. " * 20,
+        "functional_areas": [
+            {
+                "area_name": f"Area {area}",
+                "requirements": [
+                    {
+                        "id": f"FR-{area}-{n}",
+                        "description": "The system shall validate and record every change to an order. " * 4,
+                        "priority": "Must",
+                        "inputs": "Order id, changed fields",
+                        "outputs": "Updated order, audit entry",
+                        "business_rules": [f"Rule {rule}: changes are audited" for rule in range(5)]
+                    }
+                    for n in range(count // 10)
+                ]
+            }
+            for area in range(10)
+        ]
+    }
+
+
+def _probe(client: TestClient, seconds: float) -> list:
+    latencies = []
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        client.get("/api/metrics/cache")
+        latencies.append((time.perf_counter() - start) * 1000)
+        time.sleep(0.005)
+    return latencies
+
+
+def _measure(client: TestClient, seconds: float, export=None) -> list:
+    stop = threading.Event()
+    counts = []
+
+    def exporter(index: int):
+        path = os.path.join(tempfile.gettempdir(), f"export-latency-{os.getpid()}-{index}.docx")
+        count = 0
+        while not stop.is_set():
+            export(path)
+            count += 1
+        counts.append(count)
+        os.unlink(path)
+
+    threads = [threading.Thread(target=exporter, args=(i,)) for i in range(EXPORTERS if export else 0)]
+    for thread in threads:
+        thread.start()
+    try:
+        return _probe(client, seconds), counts
+    finally:
+        stop.set()
+        for thread in threads:
+            thread.join()
+
+
+def _report(name: str, latencies: list, counts: list):
+    cuts = statistics.quantiles(latencies, n=100)
+    exports = f", {sum(counts)} exports" if counts else ""
+    print(f"{name:8} p50 {cuts[49]:7.1f} ms   p99 {cuts[98]:7.1f} ms   max {max(latencies):7.1f} ms{exports}")
+
+
+def main():
+    requirements = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    seconds = float(sys.argv[2]) if len(sys.argv) > 2 else 10
+
+    args = ({"title": "Order management", "description": "Benchmark", "type": "FRS"}, _content(requirements), "FRS")
+    pool = RenderPool(workers=EXPORTERS, queue_depth=EXPORTERS, timeout=600)
+    pool.start()
+    # Wait for the workers, so start-up isn't measured
+    pool.run(os.getpid)
+
+    # A router that needs no database, so only the exports compete with it
+    app = FastAPI()
+    app.include_router(metrics.router)
+    client = TestClient(app)
+    print(f"FRS with {requirements} requirements, {EXPORTERS} concurrent exports, {seconds:g}s each")
+    _report("idle", *_measure(client, seconds))
+    _report("inline", *_measure(client, seconds, lambda path: render_docx(path, *args)))
+    _report("pool", *_measure(client, seconds, lambda path: pool.run(render_docx, path, *args)))
+    pool.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Import-time budget of the API process.
+
+Imports the routers in fresh interpreters under `-X importtime`, after the
+frameworks, so only the app's own modules and what they pull in are counted,
+and reports the median over several runs. Exits with status 1 when the
+median is over the budget, so it can gate a release on a quiet machine; it
+is wall-clock time, so it is not part of the test suite.
+
+Usage:
+    python -m benchmarks.import_time [runs] [budget_ms]
+"""
+import os
+import statistics
+import subprocess
+import sys
+from typing import Tuple
+
+# Milliseconds; the app's own imports took about a quarter of this when set
+IMPORT_BUDGET_MS = 500
+
+# Only imported when first needed
+LAZY_MODULES = ("openai", "docx")
+
+FRAMEWORKS = "import fastapi, fastapi.responses, starlette.staticfiles, sqlalchemy.orm, pydantic"
+ROUTERS = "from app.api import projects, items, questions, generation, search, revisions, metrics; import app.compression"
+
+
+def import_app() -> Tuple[str, str]:
+    """
+    Import the API in a fresh interpreter.
+
+    Returns the comma-separated LAZY_MODULES it loaded and the -X importtime
+    report.
+    """
+    code = f"{FRAMEWORKS}; {ROUTERS}; import sys; print(','.join(m for m in {LAZY_MODULES!r} if m in sys.modules))"
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True, text=True, check=True,
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        env={**os.environ, "OPENAI_API_KEY": os.environ.get("OPENAI_API_KEY", "test")}
+    )
+    return result.stdout.strip(), result.stderr
+
+
+def app_import_ms(report: str) -> float:
+    """Milliseconds spent importing the app's own modules, from an -X importtime report."""
+    total = 0
+    for line in report.splitlines():
+        # "import time: self [us] | cumulative | name", nesting shown by indentation
+        parts = line.split("|")
+        if len(parts) == 3 and parts[2].startswith(" app"):
+            total += int(parts[1])
+    return total / 1000
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    budget = float(sys.argv[2]) if len(sys.argv) > 2 else IMPORT_BUDGET_MS
+
+    timings = [app_import_ms(import_app()[1]) for _ in range(runs)]
+    median = statistics.median(timings)
+    print(f"app imports: median {median:.0f} ms over {runs} runs (min {min(timings):.0f}, max {max(timings):.0f})")
+    print(f"budget:      {budget:.0f} ms")
+    if median > budget:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Micro-benchmark of serialising a list_items-sized response.
+
+Seeds an in-memory database with 1000 documentation items carrying large
+generated content, then times turning them into a JSON body two ways:
+
+- response_model: build ItemResponse by hand and let FastAPI validate and
+  serialise it against response_model, as the routers used to
+- fast path: app.api.responses.dump_json, validating once from attributes
+  and rendering with orjson
+
+Usage:
+    python -m benchmarks.serialization [items] [rounds]
+"""
+import asyncio
+import sys
+import time
+from types import SimpleNamespace
+from typing import List
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app.api.items import ItemResponse
+from app.api.responses import dump_json
+from app.database import Base, attach_archive, set_sqlite_pragma
+from app.models.enums import DocumentationType
+from app.services import archive_service, item_service, project_service
+
+
+def _content(index: int) -> dict:
+    """A generated document of roughly 30 KB."""
+    return {
+        "title": f"Document {index}",
+        "sections": [
+            {
+                "heading": f"Section {section}",
+                "body": "The system shall record every change to the project. " * 40,
+                "requirements": [f"REQ-{index}-{section}-{n}: must be traceable" for n in range(10)]
+            }
+            for section in range(10)
+        ]
+    }
+
+
+def _seed(db, count: int) -> int:
+    project = project_service.create_project(db, name="Benchmark", description="Serialisation benchmark")
+    for index in range(count):
+        item = item_service.create_item(
+            db, project.id, DocumentationType.PRD, f"Item {index}", "Generated for the benchmark"
+        )
+        item_service.update_generated_content(db, item.id, _content(index))
+    return project.id
+
+
+def _response_model_path(items, field) -> bytes:
+    models = [
+        ItemResponse(
+            id=item.id,
+            project_id=item.project_id,
+            type=item.type,
+            title=item.title,
+            description=item.description,
+            status=item.status,
+            deadline=item.deadline,
+            generated_content=item.generated_content,
+            created_at=item.created_at.isoformat(),
+            updated_at=item.updated_at.isoformat()
+        )
+        for item in items
+    ]
+    return asyncio.run(serialize_response(field=field, response_content=models, dump_json=True))
+
+
+def _fast_path(items) -> bytes:
+    return dump_json(List[ItemResponse], items)
+
+
+def _time(fn, rounds: int) -> float:
+    fn()
+    start = time.perf_counter()
+    for _ in range(rounds):
+        fn()
+    return (time.perf_counter() - start) / rounds * 1000
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    event.listen(engine, "connect", set_sqlite_pragma)
+    event.listen(engine, "connect", attach_archive(":memory:"))
+    Base.metadata.create_all(bind=engine)
+    archive_service.create_schema(engine)
+    db = sessionmaker(bind=engine, expire_on_commit=False)()
+
+    project_id = _seed(db, count)
+    # Snapshot the rows with their content decoded, so only serialisation is timed
+    items = [
+        SimpleNamespace(**{name: getattr(item, name) for name in ItemResponse.model_fields})
+        for item in item_service.get_items_by_project(db, project_id)
+    ]
+
+    field = create_model_field(name="Response_list_items", type_=List[ItemResponse], mode="serialization")
+    before = _time(lambda: _response_model_path(items, field), rounds)
+    after = _time(lambda: _fast_path(items), rounds)
+    size = len(_fast_path(items)) / 1024 / 1024
+    print(f"{count} items, {size:.1f} MB of JSON, mean of {rounds} rounds")
+    print(f"response_model: {before:8.1f} ms/request")
+    print(f"fast path:      {after:8.1f} ms/request ({before / after:.1f}x, {before - after:.1f} ms saved)")
+
+
+if __name__ == "__main__":
+    main()
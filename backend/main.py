@@ -1,13 +1,44 @@
 import os
+from contextlib import asynccontextmanager
 from pathlib import Path
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
-from app.api import projects, items, questions, generation
+from app.api import projects, items, questions, generation, search, revisions, metrics
+from app.compression import IMMUTABLE, CompressionMiddleware, InMemoryFile, PrecompressedStaticFiles, precompress
 from app.config import settings
+from app.database import engine
+from app.services import archive_service
+from app.services.export_cache import export_cache
+from app.services.prerender import prerenderer
+from app.services.render_pool import export_pool
 
-app = FastAPI(title="ba-ai API")
+# Serve static frontend files in production
+# The frontend build output is copied to /app/static in Docker
+STATIC_DIR = Path(__file__).parent / "static"
+# Answers every client-side route, so it is kept in memory
+spa_index = InMemoryFile(STATIC_DIR / "index.html")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # The archive database lives outside the Alembic-managed schema and is
+    # upgraded here
+    archive_service.create_schema(engine)
+    if STATIC_DIR.exists():
+        # Up-to-date variants are skipped, so this only costs time after a build
+        precompress(STATIC_DIR)
+        if spa_index.exists():
+            spa_index.load()
+    # Left behind by renders that crashed or were killed
+    export_cache.remove_stale_partials()
+    # Bring the export workers up now, so the first export doesn't wait for them
+    export_pool.start()
+    yield
+    prerenderer.shutdown()
+    export_pool.shutdown()
+
+
+app = FastAPI(title="ba-ai API", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -15,41 +46,44 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
-    expose_headers=["Content-Disposition"],
+    expose_headers=["Content-Disposition", "X-Next-Cursor", "X-Total-Count"],
 )
+app.add_middleware(CompressionMiddleware)
 
 # Register API routers
 app.include_router(projects.router)
 app.include_router(items.router)
 app.include_router(questions.router)
 app.include_router(generation.router)
+app.include_router(search.router)
+app.include_router(revisions.router)
+app.include_router(metrics.router)
 
-# Serve static frontend files in production
-# The frontend build output is copied to /app/static in Docker
-STATIC_DIR = Path(__file__).parent / "static"
 if STATIC_DIR.exists():
-    # Serve static assets (JS, CSS, images)
-    app.mount("/assets", StaticFiles(directory=STATIC_DIR / "assets"), name="assets")
+    # Serve static assets (JS, CSS, images), precompressed where possible;
+    # their filenames are content-hashed, so clients may cache them for good
+    app.mount(
+        "/assets",
+        PrecompressedStaticFiles(directory=STATIC_DIR / "assets", cache_control=IMMUTABLE),
+        name="assets"
+    )
 
     # Serve index.html for all non-API routes (SPA routing)
     @app.get("/{full_path:path}")
-    async def serve_spa(full_path: str):
+    async def serve_spa(full_path: str, request: Request):
         # Don't serve SPA for API routes or health check
         if full_path.startswith("api/") or full_path == "health":
             return {"detail": "Not Found"}
         # Serve index.html for SPA routing
-        index_path = STATIC_DIR / "index.html"
-        if index_path.exists():
-            return FileResponse(index_path)
+        if spa_index.exists():
+            return spa_index.response(request.headers)
         return {"detail": "Frontend not built"}
 
 @app.get("/")
-def root():
+def root(request: Request):
     # In production, serve the SPA
-    if STATIC_DIR.exists():
-        index_path = STATIC_DIR / "index.html"
-        if index_path.exists():
-            return FileResponse(index_path)
+    if STATIC_DIR.exists() and spa_index.exists():
+        return spa_index.response(request.headers)
     return {"message": "ba-ai API"}
 
 @app.get("/health")
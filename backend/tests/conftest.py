@@ -1,8 +1,13 @@
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
-from app.database import Base, get_db
+from app.database import Base, attach_archive, get_db, set_sqlite_pragma
+from app.services import archive_service
+from app.services.export_cache import export_cache
+from app.services.prerender import prerenderer
+from app.services.render_pool import export_pool
+from app.services.response_cache import response_cache
 from main import app
 
 SQLALCHEMY_DATABASE_URL = "sqlite:///./test.db"
@@ -11,20 +16,35 @@ engine = create_engine(
     SQLALCHEMY_DATABASE_URL,
     connect_args={"check_same_thread": False}
 )
-TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+event.listen(engine, "connect", set_sqlite_pragma)
+event.listen(engine, "connect", attach_archive("./test-archive.db"))
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
 
 @pytest.fixture(scope="function")
 def db_session():
     Base.metadata.create_all(bind=engine)
+    archive_service.create_schema(engine)
     db = TestingSessionLocal()
     try:
         yield db
     finally:
         db.close()
+        archive_service.drop_schema(engine)
         Base.metadata.drop_all(bind=engine)
+        # Ids restart with the next test's tables
+        response_cache.clear()
+        # Pooled connections cache statements that can resolve a dropped
+        # table's name to its archive twin; start each test on fresh ones
+        engine.dispose()
 
 @pytest.fixture(scope="function")
-def client(db_session):
+def client(db_session, tmp_path, monkeypatch):
+    monkeypatch.setattr(export_cache, "directory", tmp_path / "exports")
+    # Render in this process, where the tests' mocks apply
+    monkeypatch.setattr(export_pool, "workers", 0)
+    # Tests that want background renders turn them on
+    monkeypatch.setattr(prerenderer, "enabled", False)
+
     def override_get_db():
         try:
             yield db_session
@@ -34,3 +54,15 @@ def client(db_session):
     app.dependency_overrides[get_db] = override_get_db
     yield TestClient(app)
     app.dependency_overrides.clear()
+
+@pytest.fixture(scope="function")
+def query_counter():
+    """Collect the SQL statements executed against the test engine."""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    yield statements
+    event.remove(engine, "before_cursor_execute", before_cursor_execute)
@@ -0,0 +1,154 @@
+import pytest
+from unittest.mock import patch
+from sqlalchemy import select, text
+from app.models.blob import Blob
+from app.models.project import Project
+from app.services import archive_service, item_service
+
+
+MOCK_AI_QUESTIONS = {
+    "questions": [
+        {"question_text": "Test question 1?", "question_type": "Text", "is_critical": True},
+        {"question_text": "Test question 2?", "question_type": "Text", "is_critical": False}
+    ]
+}
+
+CONTENT = {"title": "Checkout", "sections": ["Payment details are collected."]}
+
+
+@patch('app.services.ai_service.ai_service.generate_structured_response')
+def _project_with_item(client, db_session, mock_ai):
+    mock_ai.return_value = MOCK_AI_QUESTIONS
+    project_id = client.post(
+        "/api/projects",
+        json={"name": "Checkout Project", "description": "Test desc"}
+    ).json()["id"]
+    item_id = client.post(
+        f"/api/projects/{project_id}/items",
+        json={"type": "PRD", "title": "Checkout", "description": "Desc"}
+    ).json()["id"]
+    item_service.update_generated_content(db_session, item_id, CONTENT)
+    return project_id, item_id
+
+
+def test_archive_moves_project_to_archive(client, db_session):
+    """Test that archiving moves the project tree and its documents out of the live tables."""
+    project_id, item_id = _project_with_item(client, db_session)
+
+    response = client.patch(f"/api/projects/{project_id}/archive")
+    assert response.status_code == 200
+    assert response.json()["status"] == "Archived"
+
+    assert db_session.get(Project, project_id) is None
+    assert db_session.query(Blob).count() == 0
+    archived = archive_service.ARCHIVE_TABLES["projects"]
+    assert db_session.scalar(select(archived.c.name).where(archived.c.id == project_id)) == "Checkout Project"
+
+
+def test_archived_project_reads_through(client, db_session):
+    """Test that archived projects, items and questions are still readable."""
+    project_id, item_id = _project_with_item(client, db_session)
+    client.patch(f"/api/projects/{project_id}/archive")
+
+    assert client.get(f"/api/projects/{project_id}").json()["status"] == "Archived"
+    assert [item["id"] for item in client.get(f"/api/projects/{project_id}/items").json()] == [item_id]
+    assert client.get(f"/api/items/{item_id}").json()["generated_content"] == CONTENT
+    assert len(client.get(f"/api/items/{item_id}/questions").json()) == 2
+    assert client.post(f"/api/items/{item_id}/validate").json()["total_questions"] == 2
+
+    projects = client.get("/api/projects").json()
+    assert [project["id"] for project in projects] == [project_id]
+    assert client.get("/api/projects?status=Active").json() == []
+
+
+def test_archived_project_is_read_only(client, db_session):
+    """Test that archived projects reject generation and new items."""
+    project_id, item_id = _project_with_item(client, db_session)
+    client.patch(f"/api/projects/{project_id}/archive")
+
+    response = client.post(f"/api/items/{item_id}/generate", json={})
+    assert response.status_code == 409
+    response = client.post(
+        f"/api/projects/{project_id}/items",
+        json={"type": "PRD", "title": "New", "description": "Desc"}
+    )
+    assert response.status_code == 409
+
+    # Editing restores the project long enough to apply the change
+    response = client.put(f"/api/projects/{project_id}", json={"name": "Renamed"})
+    assert response.json()["name"] == "Renamed"
+    assert response.json()["status"] == "Archived"
+    assert db_session.get(Project, project_id) is None
+
+
+def test_unarchive_restores_project(client, db_session):
+    """Test that unarchiving moves the project back and makes it searchable again."""
+    project_id, item_id = _project_with_item(client, db_session)
+    client.patch(f"/api/projects/{project_id}/archive")
+    assert client.get("/api/search?q=payment").json() == []
+
+    response = client.patch(f"/api/projects/{project_id}/archive")
+    assert response.json()["status"] == "Active"
+
+    item = client.get(f"/api/items/{item_id}").json()
+    assert item["generated_content"] == CONTENT
+    results = client.get("/api/search?q=payment").json()
+    assert [(result["type"], result["id"]) for result in results] == [("item", item_id)]
+
+
+def test_delete_archived_project(client, db_session):
+    """Test that archived projects can be deleted."""
+    project_id, item_id = _project_with_item(client, db_session)
+    client.patch(f"/api/projects/{project_id}/archive")
+
+    response = client.delete(f"/api/projects/{project_id}")
+    assert response.status_code == 204
+    assert client.get(f"/api/projects/{project_id}").status_code == 404
+    assert client.get(f"/api/items/{item_id}").status_code == 404
+    assert archive_service.collect_garbage(db_session) == 0
+
+
+def test_create_schema_versions_archive(db_session):
+    """Test that the archive records its schema version and older unversioned archives are adopted."""
+    connection = db_session.connection()
+    version = connection.exec_driver_sql("PRAGMA archive.user_version").scalar()
+    assert version == archive_service.ARCHIVE_VERSION
+
+    # Archives created before versioning have the tables but no version
+    db_session.execute(text("PRAGMA archive.user_version = 0"))
+    db_session.commit()
+    archive_service.create_schema(db_session.get_bind())
+    assert db_session.execute(text("PRAGMA archive.user_version")).scalar() == archive_service.ARCHIVE_VERSION
+
+
+def test_archive_gains_insert_sentinels(client, db_session):
+    """Test that archives from before the insert sentinels get the columns and still unarchive."""
+    project_id, item_id = _project_with_item(client, db_session)
+    client.patch(f"/api/projects/{project_id}/archive")
+    db_session.execute(text("ALTER TABLE archive.questions DROP COLUMN _sentinel"))
+    db_session.execute(text("ALTER TABLE archive.documentation_items DROP COLUMN _sentinel"))
+    db_session.execute(text("PRAGMA archive.user_version = 2"))
+    db_session.commit()
+
+    archive_service.create_schema(db_session.get_bind())
+    response = client.patch(f"/api/projects/{project_id}/archive")
+    assert response.json()["status"] == "Active"
+    assert len(client.get(f"/api/items/{item_id}/questions").json()) == 2
+
+
+def test_create_schema_rejects_newer_archive(db_session):
+    """Test that an archive written by newer code is not silently used."""
+    db_session.execute(text(f"PRAGMA archive.user_version = {archive_service.ARCHIVE_VERSION + 1}"))
+    db_session.commit()
+
+    with pytest.raises(archive_service.ArchiveSchemaError):
+        archive_service.create_schema(db_session.get_bind())
+
+
+def test_create_schema_rejects_column_drift(db_session):
+    """Test that archive tables missing a live column fail at startup rather than on unarchive."""
+    db_session.execute(text("ALTER TABLE archive.projects DROP COLUMN description"))
+    db_session.commit()
+
+    with pytest.raises(archive_service.ArchiveSchemaError, match="projects"):
+        archive_service.create_schema(db_session.get_bind())
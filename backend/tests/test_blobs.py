@@ -0,0 +1,88 @@
+from app.models.blob import Blob, CODEC_ZLIB
+from app.models.enums import DocumentationType
+from app.services import blob_service, item_service, project_service
+
+
+CONTENT = {"title": "Checkout", "sections": ["The checkout flow collects payment details. " * 20]}
+
+
+def _item(client, db_session, title="PRD"):
+    project_id = client.post(
+        "/api/projects",
+        json={"name": "Test Project", "description": "Test desc"}
+    ).json()["id"]
+    return item_service.create_item(
+        db_session, project_id, DocumentationType.PRD, title, "Desc"
+    )
+
+
+def test_generated_content_is_compressed_and_deduplicated(client, db_session):
+    """Test that identical documents share one compressed blob."""
+    first = _item(client, db_session)
+    second = _item(client, db_session)
+    item_service.update_generated_content(db_session, first.id, CONTENT)
+    item_service.update_generated_content(db_session, second.id, CONTENT)
+
+    blobs = db_session.query(Blob).all()
+    assert len(blobs) == 1
+    assert blobs[0].codec == CODEC_ZLIB
+    assert len(blobs[0].data) < blobs[0].size
+
+    response = client.get(f"/api/items/{second.id}")
+    assert response.json()["generated_content"] == CONTENT
+
+
+def test_knowledge_base_round_trip(client, db_session):
+    """Test that the knowledge base is stored out of row and read back."""
+    project_id = client.post(
+        "/api/projects",
+        json={"name": "Test Project", "description": "Test desc"}
+    ).json()["id"]
+    assert client.get(f"/api/projects/{project_id}").json()["knowledge_base"] == ""
+
+    project_service.update_knowledge_base(db_session, project_id, "Known facts")
+    assert client.get(f"/api/projects/{project_id}").json()["knowledge_base"] == "Known facts"
+
+    data = client.get("/api/projects?fields=knowledge_base").json()
+    assert data[0]["knowledge_base"] == "Known facts"
+
+
+def test_collect_garbage(client, db_session):
+    """Test that only unreferenced blobs are collected."""
+    item = _item(client, db_session)
+    blob_service.put_text(db_session, "orphan")
+    db_session.commit()
+    item_service.update_generated_content(db_session, item.id, CONTENT)
+
+    assert blob_service.collect_garbage(db_session) == 1
+    assert db_session.query(Blob).count() == 1
+
+
+def test_generated_content_is_searchable(client, db_session):
+    """Test that document text stays indexed when the item is renamed."""
+    item = _item(client, db_session)
+    item_service.update_generated_content(db_session, item.id, CONTENT)
+    item_service.update_item(db_session, item.id, title="Renamed")
+
+    results = client.get("/api/search?q=payment").json()
+    assert [r["id"] for r in results] == [item.id]
+    assert results[0]["title"] == "Renamed"
+
+
+def test_replaced_blobs_are_deleted(client, db_session):
+    """Test that overwritten knowledge bases and documents don't leave orphan blobs."""
+    project_id = client.post(
+        "/api/projects",
+        json={"name": "Test Project", "description": "Test desc"}
+    ).json()["id"]
+    project_service.update_knowledge_base(db_session, project_id, "First facts")
+    project_service.update_knowledge_base(db_session, project_id, "Second facts")
+    assert db_session.query(Blob).count() == 1
+
+    # The first revision is a snapshot, so its blob stays; later ones are diffs
+    item = _item(client, db_session)
+    for n in range(3):
+        item_service.update_generated_content(db_session, item.id, {**CONTENT, "title": f"Version {n}"})
+    assert db_session.query(Blob).count() == 3
+    assert blob_service.collect_garbage(db_session) == 0
+    assert client.get(f"/api/items/{item.id}/revisions/1").status_code == 200
@@ -0,0 +1,128 @@
+from fastapi import FastAPI, Request, Response
+from fastapi.testclient import TestClient
+from app.compression import (
+    DOCX_MEDIA_TYPE, IMMUTABLE, CompressionMiddleware, InMemoryFile, PrecompressedStaticFiles, negotiate_encoding,
+    precompress
+)
+
+
+def test_negotiate_encoding():
+    """Test Accept-Encoding negotiation with q-values and wildcards."""
+    assert negotiate_encoding("gzip, deflate, br", ["br", "gzip"]) == "br"
+    assert negotiate_encoding("gzip;q=1.0, br;q=0.5", ["br", "gzip"]) == "gzip"
+    assert negotiate_encoding("br;q=0, *", ["br", "gzip"]) == "gzip"
+    assert negotiate_encoding("identity", ["br", "gzip"]) is None
+    assert negotiate_encoding("", ["gzip"]) is None
+
+
+def test_large_json_is_compressed(client):
+    """Test that large API responses are compressed and small ones are not."""
+    project_id = client.post(
+        "/api/projects",
+        json={"name": "P", "description": "A long project description. " * 100}
+    ).json()["id"]
+
+    response = client.get(f"/api/projects/{project_id}", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["Vary"]
+    assert response.json()["description"].startswith("A long project description.")
+
+    response = client.get("/health", headers={"Accept-Encoding": "gzip"})
+    assert "Content-Encoding" not in response.headers
+
+
+def test_docx_is_not_compressed():
+    """Test that .docx downloads are sent as they are while other large bodies are compressed."""
+    body = b"PK" + b"document " * 500
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware)
+
+    @app.get("/docx")
+    def docx():
+        return Response(body, media_type=DOCX_MEDIA_TYPE)
+
+    @app.get("/text")
+    def text():
+        return Response(body, media_type="text/plain")
+
+    client = TestClient(app)
+    for encoding in ("br", "gzip"):
+        response = client.get("/docx", headers={"Accept-Encoding": encoding})
+        assert "Content-Encoding" not in response.headers
+        assert response.content == body
+        response = client.get("/text", headers={"Accept-Encoding": encoding})
+        assert response.headers["Content-Encoding"] == encoding
+
+
+def test_precompressed_static_files(tmp_path):
+    """Test that precompressed variants are written once and served directly."""
+    script = "console.log('hello world');\n" * 200
+    (tmp_path / "app.js").write_text(script)
+    assert precompress(tmp_path) >= 1
+    assert (tmp_path / "app.js.gz").exists()
+    assert precompress(tmp_path) == 0
+
+    app = FastAPI()
+    app.mount("/assets", PrecompressedStaticFiles(directory=tmp_path), name="assets")
+    client = TestClient(app)
+
+    response = client.get("/assets/app.js", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert response.headers["Content-Type"].startswith("text/javascript")
+    assert response.text == script
+
+    response = client.get("/assets/app.js", headers={"Accept-Encoding": "identity"})
+    assert "Content-Encoding" not in response.headers
+    assert response.text == script
+
+
+def test_immutable_assets(tmp_path):
+    """Test that hashed assets are cacheable for good, in every encoding and on 304s."""
+    (tmp_path / "index-3f2a1b.js").write_text("console.log('hello world');\n" * 200)
+    precompress(tmp_path)
+    app = FastAPI()
+    app.mount("/assets", PrecompressedStaticFiles(directory=tmp_path, cache_control=IMMUTABLE), name="assets")
+    client = TestClient(app)
+
+    for encoding in ("br", "gzip", "identity"):
+        response = client.get("/assets/index-3f2a1b.js", headers={"Accept-Encoding": encoding})
+        assert response.headers["Cache-Control"] == IMMUTABLE
+        response = client.get(
+            "/assets/index-3f2a1b.js",
+            headers={"Accept-Encoding": encoding, "If-None-Match": response.headers["ETag"]}
+        )
+        assert response.status_code == 304
+        assert response.headers["Cache-Control"] == IMMUTABLE
+
+
+def test_in_memory_index(tmp_path):
+    """Test that index.html is served from memory with its variants and an ETag."""
+    page = "<!DOCTYPE html><html><body>" + "<div id=\"root\"></div>" * 100 + "</body></html>"
+    index = tmp_path / "index.html"
+    index.write_text(page)
+    precompress(tmp_path)
+    spa_index = InMemoryFile(index)
+    app = FastAPI()
+
+    @app.get("/{full_path:path}")
+    def serve_spa(full_path: str, request: Request):
+        return spa_index.response(request.headers)
+
+    client = TestClient(app)
+    response = client.get("/projects/7", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert response.headers["Cache-Control"] == "no-cache"
+    assert response.text == page
+
+    # Served from memory: removing the files changes nothing
+    index.unlink()
+    (tmp_path / "index.html.gz").unlink()
+    etag = response.headers["ETag"]
+    response = client.get("/", headers={"Accept-Encoding": "identity"})
+    assert "Content-Encoding" not in response.headers
+    assert response.headers["ETag"] == etag
+    assert response.text == page
+
+    response = client.get("/items/3", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
@@ -0,0 +1,128 @@
+from unittest.mock import patch
+from app.services import item_service
+from app.services.response_cache import response_cache
+
+
+MOCK_AI_QUESTIONS = {
+    "questions": [
+        {"question_text": "Test question 1?", "question_type": "Text", "is_critical": True},
+        {"question_text": "Test question 2?", "question_type": "Text", "is_critical": False}
+    ]
+}
+
+
+@patch('app.services.ai_service.ai_service.generate_structured_response')
+def _project_with_item(client, mock_ai):
+    mock_ai.return_value = MOCK_AI_QUESTIONS
+    project_id = client.post(
+        "/api/projects",
+        json={"name": "Test Project", "description": "Test desc"}
+    ).json()["id"]
+    item_id = client.post(
+        f"/api/projects/{project_id}/items",
+        json={"type": "PRD", "title": "Item", "description": "Desc"}
+    ).json()["id"]
+    return project_id, item_id
+
+
+def _revalidate(client, url, etag):
+    return client.get(url, headers={"If-None-Match": etag})
+
+
+def test_project_not_modified(client, query_counter):
+    """Test that a matching If-None-Match gets a 304 from a single lookup."""
+    project_id, _ = _project_with_item(client)
+    url = f"/api/projects/{project_id}"
+
+    response = client.get(url)
+    etag = response.headers["ETag"]
+    assert etag.startswith('W/"')
+    assert response.headers["Last-Modified"].endswith("GMT")
+    assert response.headers["Cache-Control"] == "no-cache"
+
+    # Bypass the response cache to exercise the database path
+    response_cache.clear()
+    query_counter.clear()
+    response = _revalidate(client, url, etag)
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["ETag"] == etag
+    assert len(query_counter) == 1
+
+    client.put(url, json={"name": "Renamed"})
+    response = _revalidate(client, url, etag)
+    assert response.status_code == 200
+    assert response.json()["name"] == "Renamed"
+    assert response.headers["ETag"] != etag
+
+
+def test_item_not_modified(client, db_session):
+    """Test that generating content invalidates the item's ETag."""
+    _, item_id = _project_with_item(client)
+    url = f"/api/items/{item_id}"
+
+    etag = client.get(url).headers["ETag"]
+    assert _revalidate(client, url, etag).status_code == 304
+
+    item_service.update_generated_content(db_session, item_id, {"title": "PRD"})
+    response = _revalidate(client, url, etag)
+    assert response.status_code == 200
+    assert response.json()["generated_content"] == {"title": "PRD"}
+
+
+def test_item_list_not_modified(client):
+    """Test that creating or deleting an item invalidates the list's ETag."""
+    project_id, item_id = _project_with_item(client)
+    url = f"/api/projects/{project_id}/items"
+
+    etag = client.get(url).headers["ETag"]
+    assert _revalidate(client, url, etag).status_code == 304
+
+    client.delete(f"/api/items/{item_id}")
+    response = _revalidate(client, url, etag)
+    assert response.status_code == 200
+    assert response.json() == []
+
+
+def test_project_list_not_modified(client):
+    """Test that creating, renaming or deleting a project invalidates the list's ETag."""
+    project_id, _ = _project_with_item(client)
+    url = "/api/projects"
+
+    etag = client.get(url).headers["ETag"]
+    assert _revalidate(client, url, etag).status_code == 304
+    # Filters and projections are cached separately
+    assert client.get(url, params={"fields": "name"}).json() == [{"id": project_id, "name": "Test Project"}]
+
+    client.put(f"/api/projects/{project_id}", json={"name": "Renamed"})
+    response = _revalidate(client, url, etag)
+    assert response.status_code == 200
+    assert response.json()[0]["name"] == "Renamed"
+    etag = response.headers["ETag"]
+
+    client.delete(f"/api/projects/{project_id}")
+    response = _revalidate(client, url, etag)
+    assert response.status_code == 200
+    assert response.json() == []
+
+
+def test_question_list_not_modified(client):
+    """Test that changing an answer invalidates the question list's ETag."""
+    _, item_id = _project_with_item(client)
+    url = f"/api/items/{item_id}/questions"
+
+    response = client.get(url)
+    etag = response.headers["ETag"]
+    question_id = response.json()[0]["id"]
+    assert _revalidate(client, url, etag).status_code == 304
+
+    client.put(f"/api/questions/{question_id}", json={"answer": "A"})
+    response = _revalidate(client, url, etag)
+    assert response.status_code == 200
+    etag = response.headers["ETag"]
+
+    # Rewording an answer leaves the counters unchanged but still counts
+    client.put(f"/api/questions/{question_id}", json={"answer": "B"})
+    response = _revalidate(client, url, etag)
+    assert response.status_code == 200
+    assert response.json()[0]["answer"] == "B"
@@ -0,0 +1,53 @@
+import zipfile
+from io import BytesIO
+from unittest.mock import patch
+from app.models.enums import DocumentationType
+from app.services import item_service, project_service
+
+
+def _render_docx(path, item_data, generated_content, doc_type):
+    if generated_content["title"] == "broken":
+        raise ValueError("cannot render")
+    with open(path, "wb") as f:
+        f.write(f"{item_data['title']}:{generated_content['title']}".encode())
+
+
+def _seed(db):
+    project = project_service.create_project(db, name="Pedidos: Ya", description="D")
+    for title, content in (("Login", "a"), ("Login", "b"), ("Sign/up", "c"), ("Broken", "broken"), ("Draft", None)):
+        item = item_service.create_item(db, project.id, DocumentationType.PRD, title, "Desc")
+        if content:
+            item_service.update_generated_content(db, item.id, {"title": content})
+    return project.id
+
+
+@patch('app.api.generation.render_docx', side_effect=_render_docx)
+@patch('app.services.export_bundle.render_docx', side_effect=_render_docx)
+def test_project_export_zip(mock_bundle_render, mock_export, client, db_session):
+    """Test that every generated document is streamed into one ZIP."""
+    project_id = _seed(db_session)
+    # One document is already in the export cache
+    assert client.get("/api/items/1/export").status_code == 200
+
+    response = client.get(f"/api/projects/{project_id}/export")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/zip"
+    assert 'filename="Pedidos_ Ya.zip"' in response.headers["content-disposition"]
+
+    with zipfile.ZipFile(BytesIO(response.content)) as archive:
+        assert archive.testzip() is None
+        files = {name: archive.read(name) for name in archive.namelist()}
+    assert files == {
+        "Login.docx": b"Login:a",
+        "Login (2).docx": b"Login:b",
+        "Sign_up.docx": b"Sign/up:c",
+        "export-errors.txt": b"Broken: cannot render\n",
+    }
+    # The cached document was not rendered again
+    assert mock_export.call_count == 1
+    assert mock_bundle_render.call_count == 3
+
+
+def test_project_export_not_found(client):
+    """Test exporting a project that doesn't exist."""
+    assert client.get("/api/projects/999/export").status_code == 404
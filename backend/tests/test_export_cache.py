@@ -0,0 +1,190 @@
+import os
+import threading
+import time
+from types import SimpleNamespace
+from unittest.mock import patch
+from app.models.enums import DocumentationType
+from app.services.export_cache import STALE_PARTIAL_SECONDS, ExportCache, document_key, export_cache
+from app.services.prerender import Prerenderer, prerenderer
+from app.services.render_pool import RenderPoolBusy
+
+
+MOCK_AI_QUESTIONS = {
+    "questions": [
+        {"question_text": "Test question 1?", "question_type": "Text", "is_critical": False}
+    ]
+}
+
+MOCK_AI_DOC = {"title": "Generated", "notes": "Notes"}
+
+MOCK_KB = {"knowledge_base": "KB"}
+
+
+def _render_docx(path, item_data, generated_content, doc_type):
+    with open(path, "wb") as f:
+        f.write(f"{item_data['title']}:{generated_content['title']}".encode())
+
+
+def test_lru_eviction(tmp_path):
+    """Test that the least recently used documents are evicted once the cache is over budget."""
+    cache = ExportCache(str(tmp_path), max_bytes=10)
+    for i, key in enumerate(("a", "b")):
+        path, _ = cache.put(key, b"x" * 4)
+        os.utime(path, (i, i))
+    # A hit refreshes the stale mtime of "a", making "b" the oldest
+    assert cache.get("a") is not None
+    cache.put("c", b"x" * 4)
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c")[0].read_bytes() == b"xxxx"
+
+
+def test_stale_partials_are_evicted(tmp_path):
+    """Test that partial files count toward the budget and abandoned ones are deleted."""
+    cache = ExportCache(str(tmp_path), max_bytes=10)
+    abandoned = cache.partial_path("a")
+    abandoned.write_bytes(b"x" * 4)
+    stale = time.time() - STALE_PARTIAL_SECONDS - 1
+    os.utime(abandoned, (stale, stale))
+    rendering = cache.partial_path("b").with_name("b.1.1.tmp")
+    rendering.write_bytes(b"x" * 4)
+
+    cache.put("c", b"x" * 4)
+    assert not abandoned.exists()
+    assert rendering.exists()
+    assert cache.get("c") is not None
+    assert cache._bytes == 8
+
+    os.utime(rendering, (stale, stale))
+    assert cache.remove_stale_partials() == 4
+    assert not rendering.exists()
+
+
+def test_document_key():
+    """Test that every input of the rendering changes the key."""
+    key = document_key("hash", "Title", "Desc", "PRD")
+    assert key == document_key("hash", "Title", "Desc", "PRD")
+    assert len({
+        key,
+        document_key("other", "Title", "Desc", "PRD"),
+        document_key("hash", "Title 2", "Desc", "PRD"),
+        document_key("hash", "Title", "Desc 2", "PRD"),
+        document_key("hash", "Title", "Desc", "UserStory"),
+    }) == 5
+
+
+@patch('app.api.generation.render_docx', side_effect=_render_docx)
+@patch('app.services.ai_service.ai_service.generate_structured_response')
+def test_export_served_from_cache(mock_ai, mock_export, client):
+    """Test that unchanged documents are rendered once and revalidated with their ETag."""
+    mock_ai.side_effect = [MOCK_AI_QUESTIONS, MOCK_AI_DOC, MOCK_KB]
+    project_id = client.post("/api/projects", json={"name": "P", "description": "D"}).json()["id"]
+    item_id = client.post(
+        f"/api/projects/{project_id}/items",
+        json={"type": "PRD", "title": "Checkout", "description": "Desc"}
+    ).json()["id"]
+    client.post(f"/api/items/{item_id}/generate", json={})
+
+    first = client.get(f"/api/items/{item_id}/export")
+    assert first.status_code == 200
+    assert first.content == b"Checkout:Generated"
+    assert "P - Checkout.docx" in first.headers["content-disposition"]
+    second = client.get(f"/api/items/{item_id}/export")
+    assert second.content == first.content
+    assert second.headers["etag"] == first.headers["etag"]
+    assert mock_export.call_count == 1
+
+    response = client.get(f"/api/items/{item_id}/export", headers={"If-None-Match": first.headers["etag"]})
+    assert response.status_code == 304
+
+    client.put(f"/api/items/{item_id}", json={"title": "Payments"})
+    response = client.get(f"/api/items/{item_id}/export", headers={"If-None-Match": first.headers["etag"]})
+    assert response.status_code == 200
+    assert response.content == b"Payments:Generated"
+    assert mock_export.call_count == 2
+
+
+@patch('app.api.generation.export_pool.run', side_effect=RenderPoolBusy("busy"))
+@patch('app.services.ai_service.ai_service.generate_structured_response')
+def test_export_pool_busy(mock_ai, mock_run, client):
+    """Test that exports are refused with 503 while the render queue is full."""
+    mock_ai.side_effect = [MOCK_AI_QUESTIONS, MOCK_AI_DOC, MOCK_KB]
+    project_id = client.post("/api/projects", json={"name": "P", "description": "D"}).json()["id"]
+    item_id = client.post(
+        f"/api/projects/{project_id}/items",
+        json={"type": "PRD", "title": "Checkout", "description": "Desc"}
+    ).json()["id"]
+    client.post(f"/api/items/{item_id}/generate", json={})
+
+    response = client.get(f"/api/items/{item_id}/export")
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "5"
+    assert list(export_cache.directory.iterdir()) == []
+
+
+class BlockingPool:
+    """Records renders; the first one waits until released."""
+
+    def __init__(self):
+        self.rendered = []
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def run(self, fn, path, item_data, content, doc_type):
+        self.started.set()
+        self.release.wait(5)
+        self.rendered.append(content["title"])
+        with open(path, "wb") as f:
+            f.write(content["title"].encode())
+
+
+def test_prerender_skips_superseded(tmp_path):
+    """Test that only the latest queued content of an item is rendered."""
+    pool = BlockingPool()
+    renderer = Prerenderer(ExportCache(str(tmp_path)), pool)
+
+    def item(content_hash, item_id=1):
+        return SimpleNamespace(
+            id=item_id, generated_content_hash=content_hash, title="T", description="D", type=DocumentationType.PRD
+        )
+
+    first = renderer.schedule(item("a"), {"title": "a"})
+    assert pool.started.wait(5)
+    stale = renderer.schedule(item("b"), {"title": "b"})
+    other = renderer.schedule(item("x", item_id=2), {"title": "x"})
+    latest = renderer.schedule(item("c"), {"title": "c"})
+    pool.release.set()
+
+    assert [f.result(5) for f in (first, stale, other, latest)] == [True, False, True, True]
+    assert pool.rendered == ["a", "x", "c"]
+    # Already cached content is not rendered again
+    assert renderer.schedule(item("c"), {"title": "c"}).result(5) is False
+    renderer.shutdown()
+
+
+@patch('app.api.generation.render_docx', side_effect=_render_docx)
+@patch('app.services.prerender.render_docx', side_effect=_render_docx)
+@patch('app.services.ai_service.ai_service.generate_structured_response')
+def test_generate_prerenders_export(mock_ai, mock_prerender, mock_export, client, monkeypatch):
+    """Test that generated content is rendered in the background and downloads hit the cache."""
+    monkeypatch.setattr(prerenderer, "enabled", True)
+    mock_ai.side_effect = [MOCK_AI_QUESTIONS, MOCK_AI_DOC, MOCK_KB]
+    project_id = client.post("/api/projects", json={"name": "P", "description": "D"}).json()["id"]
+    item_id = client.post(
+        f"/api/projects/{project_id}/items",
+        json={"type": "PRD", "title": "Checkout", "description": "Desc"}
+    ).json()["id"]
+    try:
+        client.post(f"/api/items/{item_id}/generate", json={})
+        for _ in range(100):
+            if list(export_cache.directory.glob("*.docx")):
+                break
+            time.sleep(0.05)
+
+        response = client.get(f"/api/items/{item_id}/export")
+        assert response.content == b"Checkout:Generated"
+        assert mock_prerender.call_count == 1
+        assert mock_export.call_count == 0
+    finally:
+        prerenderer.shutdown()
@@ -411,3 +411,32 @@ def test_generate_without_questions_answered(mock_ai, client):
     response = client.post(f"/api/items/{item_id}/generate", json={})
     assert response.status_code == 400
     assert "Not all critical questions answered" in response.json()["detail"]
+
+
+@patch('app.services.ai_service.ai_service.generate_structured_response')
+def test_generate_query_count(mock_ai, client, query_counter):
+    """Test that generation loads its context without per-entity lookups."""
+    mock_ai.side_effect = [MOCK_AI_QUESTIONS, MOCK_AI_DOC, MOCK_KB]
+
+    project_response = client.post(
+        "/api/projects",
+        json={"name": "Test Project", "description": "Test desc"}
+    )
+    project_id = project_response.json()["id"]
+
+    item_response = client.post(
+        f"/api/projects/{project_id}/items",
+        json={"type": "UserStory", "title": "Test Item", "description": "Test desc"}
+    )
+    item_id = item_response.json()["id"]
+
+    for question in client.get(f"/api/items/{item_id}/questions").json():
+        client.put(f"/api/questions/{question['id']}", json={"answer": "Test answer"})
+
+    query_counter.clear()
+    response = client.post(f"/api/items/{item_id}/generate", json={})
+    assert response.status_code == 200
+    # Item + project + documents, questions; then the content blob, revision,
+    # search index and item writes; then the knowledge base blob and project
+    writes = [s for s in query_counter if not s.startswith(("BEGIN", "COMMIT"))]
+    assert len(writes) <= 8
@@ -185,3 +185,30 @@ def test_create_item_with_deadline(mock_ai, client):
     assert response.status_code == 201
     data = response.json()
     assert data["deadline"] == deadline
+
+
+@patch('app.services.ai_service.ai_service.generate_structured_response')
+def test_list_items_summary_fields(mock_ai, client):
+    """Test that the item list omits generated_content unless requested."""
+    mock_ai.return_value = MOCK_AI_QUESTIONS
+
+    project_response = client.post(
+        "/api/projects",
+        json={"name": "Test Project", "description": "Test desc"}
+    )
+    project_id = project_response.json()["id"]
+    client.post(
+        f"/api/projects/{project_id}/items",
+        json={"type": "UserStory", "title": "Item 1", "description": "Desc 1"}
+    )
+
+    response = client.get(f"/api/projects/{project_id}/items")
+    assert response.status_code == 200
+    data = response.json()
+    assert "generated_content" not in data[0]
+    assert data[0]["title"] == "Item 1"
+    assert data[0]["type"] == "UserStory"
+
+    response = client.get(f"/api/projects/{project_id}/items?fields=title,generated_content")
+    assert response.status_code == 200
+    assert set(response.json()[0].keys()) == {"id", "title", "generated_content"}
@@ -1,4 +1,6 @@
-from app.models.enums import ProjectStatus
+from app.models.enums import ProjectStatus, DocumentationType, QuestionType
+from app.models import DocumentationItem, Question
+from app.services import item_service, question_service
 
 
 def test_create_project(client):
@@ -145,3 +147,85 @@ def test_toggle_archive(client):
     response = client.patch(f"/api/projects/{project_id}/archive")
     assert response.status_code == 200
     assert response.json()["status"] == "Active"
+
+
+def test_list_projects_paginated(client):
+    """Test walking the project list with keyset cursors."""
+    for i in range(5):
+        client.post(
+            "/api/projects",
+            json={"name": f"Project {i}", "description": "Desc"}
+        )
+
+    seen = []
+    response = client.get("/api/projects?limit=2&include_total=true")
+    assert response.status_code == 200
+    assert response.headers["X-Total-Count"] == "5"
+    while True:
+        data = response.json()
+        assert len(data) <= 2
+        seen.extend(p["id"] for p in data)
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+        response = client.get(f"/api/projects?limit=2&cursor={cursor}")
+        assert response.status_code == 200
+
+    assert len(seen) == 5
+    assert len(set(seen)) == 5
+
+
+def test_list_projects_invalid_cursor(client):
+    """Test that a malformed cursor is rejected."""
+    response = client.get("/api/projects?cursor=not-a-cursor")
+    assert response.status_code == 400
+
+
+def test_list_projects_summary_fields(client):
+    """Test that the list omits knowledge_base unless requested via fields."""
+    client.post(
+        "/api/projects",
+        json={"name": "Project", "description": "Desc", "client": "Acme"}
+    )
+
+    response = client.get("/api/projects")
+    assert response.status_code == 200
+    data = response.json()
+    assert "knowledge_base" not in data[0]
+    assert data[0]["client"] == "Acme"
+
+    response = client.get("/api/projects?fields=name,knowledge_base")
+    assert response.status_code == 200
+    data = response.json()
+    assert set(data[0].keys()) == {"id", "name", "knowledge_base"}
+
+    response = client.get("/api/projects?fields=bogus")
+    assert response.status_code == 400
+
+
+def test_delete_project_cascades_in_database(client, db_session, query_counter):
+    """Test that deleting a project removes its items and questions in one statement."""
+    project_id = client.post(
+        "/api/projects",
+        json={"name": "To Delete", "description": "Will be deleted"}
+    ).json()["id"]
+    for i in range(3):
+        item = item_service.create_item(db_session, project_id, DocumentationType.PRD, f"Item {i}", "Desc")
+        question_service.create_questions_batch(db_session, [
+            {
+                "doc_item_id": item.id,
+                "question_text": f"Q{n}?",
+                "question_type": QuestionType.TEXT,
+                "display_order": n
+            }
+            for n in range(5)
+        ])
+
+    query_counter.clear()
+    response = client.delete(f"/api/projects/{project_id}")
+    assert response.status_code == 204
+    assert [s for s in query_counter if s.startswith("DELETE")] == [
+        "DELETE FROM projects WHERE projects.id = ?"
+    ]
+    assert db_session.query(DocumentationItem).count() == 0
+    assert db_session.query(Question).count() == 0
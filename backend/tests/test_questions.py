@@ -121,6 +121,7 @@ def test_validate_completeness(mock_ai, client, db_session):
         display_order=2,
         is_critical=False
     )
+    critical_id = q1.id
 
     # Check status before answering
     response = client.post(f"/api/items/{item_id}/validate")
@@ -131,7 +132,7 @@ def test_validate_completeness(mock_ai, client, db_session):
     assert data["critical_questions"] == 1
 
     # Answer the critical question
-    question_service.update_answer(db_session, q1.id, "Answer to critical")
+    question_service.update_answer(db_session, critical_id, "Answer to critical")
 
     # Check status after answering critical
     response = client.post(f"/api/items/{item_id}/validate")
@@ -173,3 +174,131 @@ def test_question_with_options(mock_ai, client, db_session):
     data = response.json()
     assert len(data) == 1
     assert data[0]["options"] == ["High", "Medium", "Low"]
+
+
+@patch('app.services.ai_service.ai_service.generate_structured_response')
+def test_completion_counters_track_answers(mock_ai, client, db_session):
+    """Test that item counters follow answer, re-answer and clear."""
+    project_response = client.post(
+        "/api/projects",
+        json={"name": "Test Project", "description": "Test desc"}
+    )
+    project_id = project_response.json()["id"]
+
+    item_response = client.post(
+        f"/api/projects/{project_id}/items",
+        json={"type": "UserStory", "title": "Test Item", "description": "Test desc"}
+    )
+    item_id = item_response.json()["id"]
+
+    question = question_service.create_question(
+        db_session,
+        doc_item_id=item_id,
+        question_text="Critical question?",
+        question_type=QuestionType.TEXT,
+        display_order=1,
+        is_critical=True
+    )
+
+    question_service.update_answer(db_session, question.id, "First")
+    question_service.update_answer(db_session, question.id, "Second")
+    status = question_service.get_completion_status(db_session, item_id)
+    assert status["answered_questions"] == 1
+    assert status["critical_answered"] == 1
+
+    question_service.clear_answer(db_session, question.id)
+    status = question_service.get_completion_status(db_session, item_id)
+    assert status["answered_questions"] == 0
+    assert status["all_critical_answered"] is False
+
+    data = client.get(f"/api/projects/{project_id}/items").json()
+    assert data[0]["total_questions"] == 1
+    assert data[0]["critical_answered"] == 0
+
+
+@patch('app.services.ai_service.ai_service.generate_structured_response')
+def test_recount_completion_repairs_drift(mock_ai, client, db_session):
+    """Test that the repair routine restores counters from the questions table."""
+    from app.models.documentation_item import DocumentationItem
+
+    project_response = client.post(
+        "/api/projects",
+        json={"name": "Test Project", "description": "Test desc"}
+    )
+    project_id = project_response.json()["id"]
+
+    item_response = client.post(
+        f"/api/projects/{project_id}/items",
+        json={"type": "UserStory", "title": "Test Item", "description": "Test desc"}
+    )
+    item_id = item_response.json()["id"]
+
+    question_service.create_question(
+        db_session,
+        doc_item_id=item_id,
+        question_text="Question?",
+        question_type=QuestionType.TEXT,
+        display_order=1
+    )
+
+    item = db_session.get(DocumentationItem, item_id)
+    item.total_questions = 7
+    db_session.commit()
+
+    assert question_service.recount_completion(db_session) == 1
+    assert question_service.get_completion_status(db_session, item_id)["total_questions"] == 1
+    assert question_service.recount_completion(db_session) == 0
+
+
+@patch('app.services.ai_service.ai_service.generate_structured_response')
+def test_update_answers_batch(mock_ai, client, db_session):
+    """Test submitting several answers in one request."""
+    project_response = client.post(
+        "/api/projects",
+        json={"name": "Test Project", "description": "Test desc"}
+    )
+    project_id = project_response.json()["id"]
+
+    item_response = client.post(
+        f"/api/projects/{project_id}/items",
+        json={"type": "UserStory", "title": "Test Item", "description": "Test desc"}
+    )
+    item_id = item_response.json()["id"]
+
+    ids = [
+        question_service.create_question(
+            db_session,
+            doc_item_id=item_id,
+            question_text=f"Question {i}?",
+            question_type=QuestionType.TEXT,
+            display_order=i,
+            is_critical=i == 1
+        ).id
+        for i in (1, 2, 3)
+    ]
+
+    response = client.patch(
+        f"/api/items/{item_id}/answers",
+        json={"answers": [
+            {"question_id": ids[0], "answer": "One"},
+            {"question_id": ids[2], "answer": "Three"}
+        ]}
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert [q["answer"] for q in data["questions"]] == ["One", "Three"]
+    assert all(q["is_answered"] for q in data["questions"])
+    assert data["status"]["answered_questions"] == 2
+    assert data["status"]["all_critical_answered"] is True
+
+    # Unknown or foreign question ids reject the whole batch
+    response = client.patch(
+        f"/api/items/{item_id}/answers",
+        json={"answers": [
+            {"question_id": ids[1], "answer": "Two"},
+            {"question_id": 99999, "answer": "Nope"}
+        ]}
+    )
+    assert response.status_code == 404
+    status = client.post(f"/api/items/{item_id}/validate").json()
+    assert status["answered_questions"] == 2
@@ -0,0 +1,58 @@
+import os
+import time
+import pytest
+from app.services.render_pool import RenderPool, RenderPoolBusy, RenderTimeout
+
+
+def test_runs_in_worker_process():
+    """Test that calls run in a separate, reused process."""
+    pool = RenderPool(workers=1, queue_depth=2, timeout=30, warm_modules=("json",))
+    try:
+        pid = pool.run(os.getpid)
+        assert pid != os.getpid()
+        assert pool.run(os.getpid) == pid
+    finally:
+        pool.shutdown()
+
+
+def test_timeout_replaces_worker():
+    """Test that a timed out render's process is killed and its slot and worker freed at once."""
+    pool = RenderPool(workers=1, queue_depth=1, timeout=0.5, warm_modules=())
+    try:
+        pid = pool.run(os.getpid)
+        started = time.monotonic()
+        with pytest.raises(RenderTimeout):
+            pool.run(time.sleep, 60)
+        with pytest.raises(ProcessLookupError):
+            os.kill(pid, 0)
+
+        replacement = pool.run(os.getpid)
+        assert replacement != pid
+        assert time.monotonic() - started < 30
+    finally:
+        pool.shutdown()
+
+
+def test_exceptions_keep_worker():
+    """Test that an exception raised by the call reaches the caller and the worker is reused."""
+    pool = RenderPool(workers=1, queue_depth=1, timeout=30, warm_modules=())
+    try:
+        pid = pool.run(os.getpid)
+        with pytest.raises(ValueError):
+            pool.run(int, "not a number")
+        assert pool.run(os.getpid) == pid
+    finally:
+        pool.shutdown()
+
+
+def test_inline_queue_depth():
+    """Test that without workers calls run in this thread and are still bounded."""
+    pool = RenderPool(workers=0, queue_depth=1, timeout=30)
+
+    def nested():
+        with pytest.raises(RenderPoolBusy):
+            pool.run(os.getpid)
+        return os.getpid()
+
+    assert pool.run(nested) == os.getpid()
+    assert pool.run(os.getpid) == os.getpid()
@@ -0,0 +1,153 @@
+import sqlite3
+from datetime import datetime, timezone
+from unittest.mock import patch
+from sqlalchemy import update
+from app.models.documentation_item import DocumentationItem
+from app.models.project import Project
+from app.services.response_cache import CachedResponse, DataVersionBackend, ResponseCache
+
+
+MOCK_AI_QUESTIONS = {
+    "questions": [
+        {"question_text": "Test question 1?", "question_type": "Text", "is_critical": True}
+    ]
+}
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _entry(body=b"{}"):
+    return CachedResponse(body, {"etag": 'W/"x"'})
+
+
+def test_lru_and_ttl():
+    """Test that the least recently used entry is evicted and entries expire."""
+    clock = FakeClock()
+    cache = ResponseCache(max_entries=2, ttl=10, clock=clock)
+    for key in ("a", "b"):
+        cache.set(key, _entry(), [], cache.token())
+    assert cache.get("a") is not None
+    cache.set("c", _entry(), [], cache.token())
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    clock.now = 11
+    assert cache.get("a") is None
+
+    stats = cache.stats()
+    assert stats["evictions"] == 1
+    assert stats["expirations"] == 1
+    assert stats["hit_rate"] == 2 / 4
+
+
+def test_invalidation_by_tag_and_token():
+    """Test that tags drop entries and stale tokens are refused."""
+    cache = ResponseCache()
+    cache.set("project", _entry(), [("project", 1)], cache.token())
+    cache.set("item", _entry(), [("project", 1), ("item", 2)], cache.token())
+
+    token = cache.token()
+    cache.invalidate("item", 2)
+    assert cache.get("item") is None
+    assert cache.get("project") is not None
+    # Read before the write was committed, so it must not be stored
+    assert cache.set("item", _entry(), [("item", 2)], token) is False
+
+    cache.invalidate("project", 1)
+    assert cache.get("project") is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_data_version_backend(tmp_path):
+    """Test that a commit from another connection clears the cache."""
+    path = str(tmp_path / "shared.db")
+    other = sqlite3.connect(path)
+    other.execute("CREATE TABLE t (x)")
+    other.commit()
+
+    cache = ResponseCache(backend=DataVersionBackend(path))
+    cache.set("a", _entry(), [], cache.token())
+    assert cache.get("a") is not None
+
+    other.execute("INSERT INTO t VALUES (1)")
+    other.commit()
+    assert cache.get("a") is None
+    other.close()
+
+
+@patch('app.services.ai_service.ai_service.generate_structured_response')
+def test_cached_reads_only_check_the_version(mock_ai, client, query_counter):
+    """Test that repeated GETs are served from the cache until a write."""
+    mock_ai.return_value = MOCK_AI_QUESTIONS
+    project_id = client.post(
+        "/api/projects", json={"name": "P", "description": "D"}
+    ).json()["id"]
+    item_id = client.post(
+        f"/api/projects/{project_id}/items",
+        json={"type": "PRD", "title": "Item", "description": "Desc"}
+    ).json()["id"]
+    urls = [
+        f"/api/projects/{project_id}",
+        f"/api/projects/{project_id}/items",
+        f"/api/items/{item_id}",
+        f"/api/items/{item_id}/questions",
+        "/api/projects",
+    ]
+
+    first = [client.get(url) for url in urls]
+    query_counter.clear()
+    second = [client.get(url) for url in urls]
+    # One version fingerprint each; the project list's covers both tiers
+    assert len(query_counter) == len(urls) + 1
+    assert all(s.startswith("SELECT") for s in query_counter)
+    assert [r.json() for r in second] == [r.json() for r in first]
+    assert [r.headers["ETag"] for r in second] == [r.headers["ETag"] for r in first]
+
+    question_id = first[3].json()[0]["id"]
+    client.put(f"/api/questions/{question_id}", json={"answer": "A"})
+    assert client.get(urls[3]).json()[0]["answer"] == "A"
+    assert client.get(urls[1]).json()[0]["answered_questions"] == 1
+
+    client.put(f"/api/items/{item_id}", json={"title": "Renamed"})
+    assert client.get(urls[2]).json()["title"] == "Renamed"
+    assert client.get(urls[1]).json()[0]["title"] == "Renamed"
+
+    client.delete(f"/api/projects/{project_id}")
+    assert [client.get(url).status_code for url in urls[:3]] == [404, 200, 404]
+    assert client.get(urls[1]).json() == []
+
+    stats = client.get("/api/metrics/cache").json()
+    assert stats["hits"] >= 5
+    assert 0 < stats["hit_rate"] < 1
+
+
+@patch('app.services.ai_service.ai_service.generate_structured_response')
+def test_unannounced_writes_are_not_served(mock_ai, client, db_session):
+    """Test that a write no change event announced still changes what GETs return."""
+    mock_ai.return_value = MOCK_AI_QUESTIONS
+    project_id = client.post(
+        "/api/projects", json={"name": "P", "description": "D"}
+    ).json()["id"]
+    item_id = client.post(
+        f"/api/projects/{project_id}/items",
+        json={"type": "PRD", "title": "Item", "description": "Desc"}
+    ).json()["id"]
+    assert client.get(f"/api/items/{item_id}").json()["title"] == "Item"
+    assert client.get("/api/projects").json()[0]["name"] == "P"
+
+    # As another worker would, without this process's events
+    now = datetime.now(timezone.utc)
+    db_session.execute(
+        update(DocumentationItem).where(DocumentationItem.id == item_id).values(title="Renamed", updated_at=now)
+    )
+    db_session.execute(update(Project).where(Project.id == project_id).values(name="Renamed", updated_at=now))
+    db_session.commit()
+
+    assert client.get(f"/api/items/{item_id}").json()["title"] == "Renamed"
+    assert client.get("/api/projects").json()[0]["name"] == "Renamed"
@@ -0,0 +1,49 @@
+from datetime import date, datetime
+from types import SimpleNamespace
+from typing import List
+import orjson
+from app.api.items import ItemResponse
+from app.api.responses import dump_json
+from app.models.enums import DocumentationItemStatus, DocumentationType
+
+
+def _item(**overrides):
+    values = dict(
+        id=1,
+        project_id=2,
+        type=DocumentationType.PRD,
+        title="Title",
+        description="Desc",
+        status=DocumentationItemStatus.DRAFT,
+        deadline=date(2025, 3, 1),
+        generated_content={"sections": [{"title": "Intro"}]},
+        created_at=datetime(2025, 1, 2, 3, 4, 5, 678901),
+        updated_at=datetime(2025, 1, 2, 3, 4, 5)
+    )
+    values.update(overrides)
+    return SimpleNamespace(**values)
+
+
+def test_dump_json_matches_response_model():
+    """Test that the fast path renders the same JSON as the hand-built model."""
+    item = _item()
+    built = ItemResponse(
+        **{**vars(item), "created_at": item.created_at.isoformat(), "updated_at": item.updated_at.isoformat()}
+    )
+
+    assert orjson.loads(dump_json(ItemResponse, item)) == orjson.loads(built.model_dump_json())
+    assert orjson.loads(dump_json(List[ItemResponse], [item, _item(id=3)]))[1]["id"] == 3
+
+
+def test_write_responses_use_fast_path(client):
+    """Test that create and update answer with the response model's shape and status."""
+    response = client.post("/api/projects", json={"name": "Project", "description": "Desc"})
+    assert response.status_code == 201
+    assert response.headers["content-type"] == "application/json"
+    project = response.json()
+    assert project["knowledge_base"] == ""
+    assert datetime.fromisoformat(project["created_at"])
+
+    response = client.put(f"/api/projects/{project['id']}", json={"client": "Acme"})
+    assert response.status_code == 200
+    assert response.json() == {**project, "client": "Acme", "updated_at": response.json()["updated_at"]}
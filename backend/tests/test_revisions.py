@@ -0,0 +1,131 @@
+import copy
+import json
+from app.models.enums import DocumentationType
+from app.models.revision import ContentRevision
+from app.services import item_service, json_diff, revision_service
+from unittest.mock import patch
+
+
+MOCK_AI_QUESTIONS = {
+    "questions": [
+        {"question_text": "Test question?", "question_type": "Text", "is_critical": True}
+    ]
+}
+
+MOCK_AI_DOC = {
+    "title": "Generated User Story",
+    "acceptance_criteria": ["Can log in", "Can log out"],
+    "notes": "First draft"
+}
+
+MOCK_KB = {"knowledge_base": "Updated knowledge base"}
+
+
+def _generated_item(client):
+    """Create an item, answer its question and generate the first revision."""
+    project_id = client.post(
+        "/api/projects",
+        json={"name": "Test Project", "description": "Test desc"}
+    ).json()["id"]
+    item_id = client.post(
+        f"/api/projects/{project_id}/items",
+        json={"type": "UserStory", "title": "Test Item", "description": "Test desc"}
+    ).json()["id"]
+    for question in client.get(f"/api/items/{item_id}/questions").json():
+        client.put(f"/api/questions/{question['id']}", json={"answer": "Test answer"})
+    assert client.post(f"/api/items/{item_id}/generate", json={}).status_code == 200
+    return item_id
+
+
+def test_json_diff_round_trip():
+    """Test that patching with a diff reproduces the new document."""
+    old = {"a": 1, "b": [1, 2, 3, 4], "c": {"d": "x"}, "gone": True}
+    new = {"a": 2, "b": [1, 9, 3, 4, 5], "c": {"d": "y", "e": [1]}, "added": None}
+    ops = json_diff.diff(old, new)
+    assert json_diff.patch(old, ops) == new
+    assert old["b"] == [1, 2, 3, 4]
+    assert json_diff.diff(new, new) == []
+
+
+def test_json_diff_keeps_number_types():
+    """Test that bool, int and float changes survive the round trip at any depth."""
+    old = {"x": {"flag": True}, "l": [1, 2], "n": [[1], 0.5]}
+    new = {"x": {"flag": 1}, "l": [True, 2.0], "n": [[1.0], 0.5]}
+    patched = json_diff.patch(old, json_diff.diff(old, new))
+    assert json.dumps(patched) == json.dumps(new)
+
+
+@patch('app.services.ai_service.ai_service.generate_structured_response')
+def test_regenerate_records_revisions(mock_ai, client):
+    """Test that generate and regenerate each record a revision with their feedback."""
+    second = dict(MOCK_AI_DOC, notes="Second draft")
+    mock_ai.side_effect = [MOCK_AI_QUESTIONS, MOCK_AI_DOC, MOCK_KB, second]
+    item_id = _generated_item(client)
+
+    response = client.post(f"/api/items/{item_id}/regenerate", json={"feedback": "Tighten the notes"})
+    assert response.status_code == 200
+
+    response = client.get(f"/api/items/{item_id}/revisions")
+    assert response.status_code == 200
+    data = response.json()
+    assert [r["revision_number"] for r in data] == [2, 1]
+    assert data[0]["source"] == "Regenerate"
+    assert data[0]["feedback"] == "Tighten the notes"
+    assert data[1]["source"] == "Generate"
+    assert "content" not in data[0]
+
+    assert client.get(f"/api/items/{item_id}/revisions/1").json()["content"] == MOCK_AI_DOC
+    assert client.get(f"/api/items/{item_id}/revisions/2").json()["content"] == second
+    assert client.get(f"/api/items/{item_id}/revisions/3").status_code == 404
+
+
+@patch('app.services.ai_service.ai_service.generate_structured_response')
+def test_restore_revision(mock_ai, client):
+    """Test that restoring makes an old revision current without an AI call."""
+    second = dict(MOCK_AI_DOC, notes="Second draft")
+    mock_ai.side_effect = [MOCK_AI_QUESTIONS, MOCK_AI_DOC, MOCK_KB, second]
+    item_id = _generated_item(client)
+    client.post(f"/api/items/{item_id}/regenerate", json={"feedback": "More"})
+
+    calls = mock_ai.call_count
+    response = client.post(f"/api/items/{item_id}/revisions/1/restore")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["revision_number"] == 3
+    assert data["source"] == "Restore"
+    assert data["restored_from"] == 1
+    assert data["content"] == MOCK_AI_DOC
+    assert mock_ai.call_count == calls
+
+    assert client.get(f"/api/items/{item_id}").json()["generated_content"] == MOCK_AI_DOC
+    assert client.post(f"/api/items/{item_id}/revisions/9/restore").status_code == 404
+
+
+def test_revisions_store_diffs_between_snapshots(client, db_session):
+    """Test that most revisions are stored as diffs and all rebuild exactly."""
+    project_id = client.post(
+        "/api/projects",
+        json={"name": "Test Project", "description": "Test desc"}
+    ).json()["id"]
+    item = item_service.create_item(
+        db_session, project_id, DocumentationType.PRD, "PRD", "Desc"
+    )
+
+    content = {"title": "PRD", "sections": [f"Section {i} " * 20 for i in range(20)]}
+    versions = []
+    for i in range(25):
+        content = copy.deepcopy(content)
+        content["sections"][i % 20] = f"Rewritten section {i}"
+        item_service.update_generated_content(db_session, item.id, content)
+        versions.append(content)
+
+    rows = db_session.query(ContentRevision)\
+        .filter(ContentRevision.doc_item_id == item.id)\
+        .order_by(ContentRevision.revision_number)\
+        .all()
+    snapshots = [r.revision_number for r in rows if r.is_snapshot]
+    assert snapshots == [1, 11, 21]
+
+    for number, expected in enumerate(versions, start=1):
+        _, rebuilt = revision_service.get_revision(db_session, item.id, number)
+        assert rebuilt == expected
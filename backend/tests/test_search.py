@@ -0,0 +1,100 @@
+from sqlalchemy import text
+from app.models.enums import DocumentationType, QuestionType
+from app.services import item_service, question_service, search_service
+
+
+def _seed(client, db_session):
+    """Create a project with one generated item and an answered question."""
+    project_id = client.post(
+        "/api/projects",
+        json={"name": "Payments Portal", "description": "Checkout rebuild", "client": "Acme"}
+    ).json()["id"]
+    item = item_service.create_item(
+        db_session, project_id, DocumentationType.USER_STORY, "Refund flow", "Customers request refunds"
+    )
+    question = question_service.create_question(
+        db_session,
+        doc_item_id=item.id,
+        question_text="Which currencies are supported?",
+        question_type=QuestionType.TEXT,
+        display_order=1
+    )
+    question_service.update_answer(db_session, question.id, "Euro and Swiss franc")
+    item_service.update_generated_content(db_session, item.id, {
+        "title": "Refund flow",
+        "acceptance_criteria": [{"scenario_name": "Partial chargeback", "given": ["Given a settled order"]}]
+    })
+    return project_id, item.id, question.id
+
+
+def test_search_escapes_highlights(client):
+    """Test that indexed text is HTML-escaped and only the match markers become tags."""
+    client.post("/api/projects", json={"name": "<img src=x onerror=alert(1)> Ledger", "description": "D"})
+
+    data = client.get("/api/search?q=ledger").json()
+    assert data[0]["title"] == "&lt;img src=x onerror=alert(1)&gt; <mark>Ledger</mark>"
+
+
+def test_search_finds_each_entity_type(client, db_session):
+    """Test that projects, items, answers and generated content are indexed."""
+    project_id, item_id, question_id = _seed(client, db_session)
+
+    data = client.get("/api/search?q=acme").json()
+    assert [(r["type"], r["id"]) for r in data] == [("project", project_id)]
+
+    data = client.get("/api/search?q=chargeback").json()
+    assert [(r["type"], r["id"]) for r in data] == [("item", item_id)]
+    assert "<mark>chargeback</mark>" in data[0]["snippet"].lower()
+
+    data = client.get("/api/search?q=swiss").json()
+    assert data[0]["type"] == "question"
+    assert data[0]["item_id"] == item_id
+    assert data[0]["project_id"] == project_id
+
+    # Prefix matching and type filter
+    data = client.get("/api/search?q=refu&type=item").json()
+    assert [r["id"] for r in data] == [item_id]
+
+
+def test_search_index_follows_updates_and_deletes(client, db_session):
+    """Test that the triggers replace and remove index rows."""
+    project_id, item_id, _ = _seed(client, db_session)
+
+    client.put(f"/api/projects/{project_id}", json={"name": "Ledger"})
+    assert client.get("/api/search?q=payments").json() == []
+    assert len(client.get("/api/search?q=ledger").json()) == 1
+
+    client.delete(f"/api/projects/{project_id}")
+    assert client.get("/api/search?q=refund").json() == []
+    assert client.get("/api/search?q=swiss").json() == []
+
+
+def test_search_pagination_and_syntax(client):
+    """Test cursor paging and that FTS operators in input are harmless."""
+    for i in range(5):
+        client.post("/api/projects", json={"name": f"Alpha {i}", "description": "Desc"})
+
+    seen = []
+    response = client.get("/api/search?q=alpha&limit=2")
+    while True:
+        seen.extend(r["id"] for r in response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+        response = client.get(f"/api/search?q=alpha&limit=2&cursor={cursor}")
+    assert len(seen) == 5
+    assert len(set(seen)) == 5
+
+    response = client.get('/api/search?q=alpha" OR NEAR(')
+    assert response.status_code == 200
+
+
+def test_rebuild_index(client, db_session):
+    """Test that a rebuild restores a wiped index."""
+    project_id, _, _ = _seed(client, db_session)
+    db_session.execute(text("DELETE FROM search_index"))
+    db_session.commit()
+    assert client.get("/api/search?q=acme").json() == []
+
+    assert search_service.rebuild_index(db_session) == 3
+    assert client.get("/api/search?q=acme").json()[0]["id"] == project_id
@@ -0,0 +1,13 @@
+"""
+What importing the API process loads.
+
+The import-time budget itself is wall-clock and lives in
+benchmarks/import_time.py.
+"""
+from benchmarks.import_time import import_app
+
+
+def test_heavy_modules_are_lazy():
+    """Test that importing the API doesn't import the OpenAI SDK or python-docx."""
+    loaded, _ = import_app()
+    assert loaded == ""
@@ -0,0 +1,111 @@
+from unittest.mock import patch
+from app.services import text_export
+
+
+USER_STORY = {
+    "title": "Login",
+    "user_story": {"as_a": "user", "i_want": "to login", "so_that": "I can access my account"},
+    "acceptance_criteria": [
+        {
+            "scenario_name": "Successful login",
+            "given": ["Given the user is on the login page", "the user has an account"],
+            "when": ["the user enters valid credentials"],
+            "then": ["Then the user is logged in"]
+        }
+    ],
+    "notes": None,
+    "dependencies": ["Authentication service"]
+}
+
+FRS = {
+    "title": "Orders",
+    "overview": "Order handling",
+    "functional_areas": [
+        {
+            "area_name": "Checkout",
+            "requirements": [
+                {
+                    "id": "FR-1", "description": "Totals | taxes", "priority": "Must",
+                    "inputs": None, "outputs": "Total", "business_rules": ["Round up", "Use VAT"]
+                }
+            ]
+        }
+    ]
+}
+
+MOCK_AI_QUESTIONS = {
+    "questions": [
+        {"question_text": "Test question 1?", "question_type": "Text", "is_critical": False}
+    ]
+}
+
+
+def _markdown(content, doc_type):
+    return "".join(text_export.render(content, doc_type, text_export.MARKDOWN))
+
+
+def test_user_story_markdown():
+    """Test that user stories render as Markdown with Gherkin scenarios."""
+    assert _markdown(USER_STORY, "UserStory") == (
+        "# Login\n\n"
+        "## User Story\n\n"
+        "**As a** user, **I want** to login, **so that** I can access my account.\n\n"
+        "## Acceptance Criteria\n\n"
+        "```gherkin\n"
+        "Scenario: Successful login\n"
+        "  Given the user is on the login page\n"
+        "  And the user has an account\n"
+        "  When the user enters valid credentials\n"
+        "  Then the user is logged in\n"
+        "```\n\n"
+        "## Dependencies\n\n"
+        "- Authentication service\n\n"
+    )
+
+
+def test_frs_markdown_table():
+    """Test that requirement tables escape pipes and join list cells."""
+    markdown = _markdown(FRS, "FRS")
+    assert "### Checkout\n\n| ID | Description | Priority | Inputs | Outputs | Business Rules |\n" in markdown
+    assert "| FR-1 | Totals \\| taxes | Must |  | Total | Round up; Use VAT |\n" in markdown
+
+
+def test_html_is_escaped():
+    """Test that the HTML rendering is a standalone, escaped document."""
+    content = {"title": "<Plan>", "business_value": "A & B", "user_problems": ["<script>"],
+               "scope": {"included": ["x"], "excluded": []}, "features": []}
+    page = "".join(text_export.render(content, "Epic", text_export.HTML))
+    assert page.startswith("<!DOCTYPE html>")
+    assert "<title>&lt;Plan&gt;</title>" in page
+    assert "<p>A &amp; B</p>" in page
+    assert "<li>&lt;script&gt;</li>" in page
+    assert "<h3>Included</h3>" in page and "Excluded" not in page
+    assert page.endswith("</html>\n")
+
+
+@patch('app.services.ai_service.ai_service.generate_structured_response')
+def test_export_formats(mock_ai, client):
+    """Test exporting as Markdown and HTML through the format parameter."""
+    mock_ai.side_effect = [MOCK_AI_QUESTIONS, USER_STORY, {"knowledge_base": "KB"}]
+    project_id = client.post("/api/projects", json={"name": "P", "description": "D"}).json()["id"]
+    item_id = client.post(
+        f"/api/projects/{project_id}/items",
+        json={"type": "UserStory", "title": "Login", "description": "Desc"}
+    ).json()["id"]
+    client.post(f"/api/items/{item_id}/generate", json={})
+
+    response = client.get(f"/api/items/{item_id}/export?format=markdown")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "text/markdown; charset=utf-8"
+    assert "P - Login.md" in response.headers["content-disposition"]
+    assert response.text.startswith("# Login\n\n## User Story")
+
+    html_response = client.get(f"/api/items/{item_id}/export?format=html")
+    assert html_response.headers["content-type"] == "text/html; charset=utf-8"
+    assert html_response.headers["etag"] != response.headers["etag"]
+    response = client.get(
+        f"/api/items/{item_id}/export?format=html", headers={"If-None-Match": html_response.headers["etag"]}
+    )
+    assert response.status_code == 304
+
+    assert client.get(f"/api/items/{item_id}/export?format=pdf").status_code == 422
@@ -0,0 +1,89 @@
+import orjson
+from app.models.enums import QuestionType
+from app.models.project import Project
+from app.services import item_service, project_service, question_service, transfer_service
+
+
+CONTENT = {"title": "Checkout", "sections": ["Payment details are collected."]}
+
+
+def _seed_project(client, db_session):
+    project_id = client.post(
+        "/api/projects",
+        json={"name": "Checkout Project", "description": "Desc", "client": "Acme"}
+    ).json()["id"]
+    project_service.update_knowledge_base(db_session, project_id, "Uses Stripe.")
+    item = item_service.create_item(db_session, project_id, "PRD", "Checkout", "Desc")
+    item_service.update_generated_content(db_session, item.id, CONTENT)
+    parent, = question_service.create_questions_batch(db_session, [{
+        "doc_item_id": item.id, "question_text": "Card payments?",
+        "question_type": QuestionType.MULTIPLE_CHOICE, "options": ["Yes", "No"],
+        "display_order": 1, "is_critical": True
+    }])
+    question_service.create_questions_batch(db_session, [{
+        "doc_item_id": item.id, "parent_question_id": parent.id, "question_text": "Which provider?",
+        "question_type": QuestionType.TEXT, "display_order": 2, "is_critical": False
+    }])
+    question_service.update_answer(db_session, parent.id, "Yes")
+    return project_id, item.id
+
+
+def test_dump_and_load_round_trip(client, db_session):
+    """Test that a loaded dump recreates the project with new ids and remapped links."""
+    project_id, item_id = _seed_project(client, db_session)
+
+    response = client.get(f"/api/projects/{project_id}/dump")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    records = [orjson.loads(line) for line in response.content.splitlines()]
+    assert [r["record"] for r in records] == ["project", "item", "question", "question"]
+    assert records[0]["knowledge_base"] == "Uses Stripe."
+    assert records[1]["generated_content"] == CONTENT
+
+    response = client.post("/api/projects/load", content=response.content)
+    assert response.status_code == 201
+    loaded = response.json()
+    assert loaded["id"] != project_id
+    assert (loaded["name"], loaded["client"], loaded["knowledge_base"]) == ("Checkout Project", "Acme", "Uses Stripe.")
+
+    items = client.get(f"/api/projects/{loaded['id']}/items").json()
+    assert len(items) == 1 and items[0]["id"] != item_id
+    assert (items[0]["total_questions"], items[0]["answered_questions"]) == (2, 1)
+    assert client.get(f"/api/items/{items[0]['id']}").json()["generated_content"] == CONTENT
+
+    parent, child = client.get(f"/api/items/{items[0]['id']}/questions").json()
+    assert parent["answer"] == "Yes" and parent["options"] == ["Yes", "No"]
+    assert child["parent_question_id"] == parent["id"]
+
+    hits = client.get("/api/search", params={"q": "payment details", "project_id": loaded["id"]}).json()
+    assert [hit["id"] for hit in hits] == [items[0]["id"]]
+
+
+def test_load_rejects_invalid_dump(client, db_session):
+    """Test that an invalid dump is refused without leaving anything behind."""
+    project_id, _ = _seed_project(client, db_session)
+    dump = client.get(f"/api/projects/{project_id}/dump").content
+    lines = dump.splitlines()
+
+    # A question whose item is not in the dump
+    response = client.post("/api/projects/load", content=b"\n".join([lines[0], lines[2]]))
+    assert response.status_code == 400
+    assert "unknown item" in response.json()["detail"]
+
+    response = client.post("/api/projects/load", content=b"\n".join(lines[1:]))
+    assert response.status_code == 400
+    assert db_session.query(Project).count() == 1
+
+
+def test_dump_archived_project(client, db_session):
+    """Test that archived projects can be dumped and load back archived."""
+    project_id, _ = _seed_project(client, db_session)
+    client.patch(f"/api/projects/{project_id}/archive")
+
+    dump = client.get(f"/api/projects/{project_id}/dump").content
+    project = transfer_service.load_project(db_session, dump.splitlines(keepends=True))
+    assert project.status.value == "Archived"
+    assert project.knowledge_base == "Uses Stripe."
+    assert client.get(f"/api/projects/{project.id}/items").json()[0]["total_questions"] == 2
+
+    assert client.get("/api/projects/999/dump").status_code == 404
@@ -0,0 +1,149 @@
+from types import SimpleNamespace
+from unittest.mock import patch
+from sqlalchemy import inspect, text
+from app.models.enums import QuestionType
+from app.services import archive_service, visibility
+
+
+MOCK_AI_QUESTIONS = {
+    "questions": [
+        {
+            "question_text": "Which payment methods does checkout take?", "question_type": "Checkbox",
+            "options": ["Cards", "Wallets"], "is_critical": True,
+            "parent_question_index": None, "required_answer": None
+        },
+        {
+            "question_text": "Which card provider?", "question_type": "Text", "options": None,
+            "is_critical": True, "parent_question_index": 0, "required_answer": "Cards"
+        },
+        {
+            "question_text": "Any other notes?", "question_type": "Text", "options": None,
+            "is_critical": False, "parent_question_index": None, "required_answer": None
+        },
+    ]
+}
+
+MOCK_AI_DOC = {"title": "Checkout", "content": "Generated"}
+
+
+def _question(id, parent=None, answer=None, required=None, question_type=QuestionType.TEXT):
+    return SimpleNamespace(
+        id=id, parent_question_id=parent, question_type=question_type, answer=answer,
+        is_answered=answer is not None, is_critical=True,
+        trigger_condition={"required_answer": required} if parent else None
+    )
+
+
+def test_visible_ids():
+    """Test that triggers are evaluated down the parent chain."""
+    questions = [
+        _question(1, answer="Yes"),
+        _question(2, parent=1, required="Yes", answer="Stripe"),
+        _question(3, parent=2, required=["Adyen", "Stripe"]),
+        _question(4, parent=1, required="No"),
+        _question(5, parent=4),
+        _question(6, answer="Cards, Wallets", question_type=QuestionType.CHECKBOX),
+        _question(7, parent=6, required="Wallets"),
+        # Parents on a cycle are never reached from a root
+        _question(8, parent=9),
+        _question(9, parent=8),
+    ]
+    assert visibility.visible_ids(questions) == {1, 2, 3, 6, 7}
+    assert visibility.counters(questions) == (5, 3, 5, 3)
+
+
+@patch('app.services.ai_service.ai_service.generate_structured_response')
+def test_conditional_questions_follow_answers(mock_ai, client):
+    """Test that parents are resolved at insert and hidden questions stay out of the counters."""
+    mock_ai.return_value = MOCK_AI_QUESTIONS
+    project_id = client.post("/api/projects", json={"name": "P", "description": "D"}).json()["id"]
+    item_id = client.post(
+        f"/api/projects/{project_id}/items",
+        json={"type": "PRD", "title": "Checkout", "description": "Desc"}
+    ).json()["id"]
+    url = f"/api/items/{item_id}/questions"
+
+    parent, child, notes = client.get(url).json()
+    assert child["parent_question_id"] == parent["id"]
+    assert child["trigger_condition"] == {"required_answer": "Cards"}
+    assert [q["is_visible"] for q in (parent, child, notes)] == [True, False, True]
+    status = client.post(f"/api/items/{item_id}/validate").json()
+    assert (status["total_questions"], status["critical_questions"]) == (2, 1)
+
+    response = client.put(f"/api/questions/{parent['id']}", json={"answer": "Cards, Wallets"})
+    assert response.json()["is_visible"] is True
+    assert client.get(url).json()[1]["is_visible"] is True
+    status = client.post(f"/api/items/{item_id}/validate").json()
+    assert (status["total_questions"], status["critical_answered"], status["all_critical_answered"]) == (3, 1, False)
+
+    response = client.patch(
+        f"/api/items/{item_id}/answers",
+        json={"answers": [{"question_id": parent["id"], "answer": "Wallets"}]}
+    )
+    assert response.json()["status"]["total_questions"] == 2
+    assert response.json()["status"]["all_critical_answered"] is True
+    items = client.get(f"/api/projects/{project_id}/items").json()
+    assert items[0]["total_questions"] == 2
+
+
+@patch('app.services.ai_service.ai_service.generate_structured_response')
+def test_generate_prompt_skips_hidden_questions(mock_ai, client):
+    """Test that hidden questions are neither required nor sent to the model."""
+    mock_ai.return_value = MOCK_AI_QUESTIONS
+    project_id = client.post("/api/projects", json={"name": "P", "description": "D"}).json()["id"]
+    item_id = client.post(
+        f"/api/projects/{project_id}/items",
+        json={"type": "PRD", "title": "Checkout", "description": "Desc"}
+    ).json()["id"]
+    parent = client.get(f"/api/items/{item_id}/questions").json()[0]
+    client.put(f"/api/questions/{parent['id']}", json={"answer": "Wallets"})
+
+    mock_ai.reset_mock()
+    mock_ai.side_effect = [MOCK_AI_DOC, {"knowledge_base": "KB"}]
+    response = client.post(f"/api/items/{item_id}/generate", json={})
+    assert response.status_code == 200
+    prompt = mock_ai.call_args_list[0].kwargs["user_prompt"]
+    assert "Which payment methods does checkout take?" in prompt
+    assert "Which card provider?" not in prompt
+
+
+@patch('app.services.ai_service.ai_service.generate_structured_response')
+def test_archived_before_parent_resolution(mock_ai, client, db_session):
+    """Test that projects archived before parents were resolved come back with them on unarchive."""
+    mock_ai.return_value = MOCK_AI_QUESTIONS
+    project_id = client.post("/api/projects", json={"name": "P", "description": "D"}).json()["id"]
+    item_id = client.post(
+        f"/api/projects/{project_id}/items",
+        json={"type": "PRD", "title": "Checkout", "description": "Desc"}
+    ).json()["id"]
+    client.patch(f"/api/projects/{project_id}/archive")
+
+    # What the archive held before migration b7d3e9f1a264
+    db_session.execute(text("DROP INDEX archive.ix_questions_parent_question_id"))
+    db_session.execute(text("""
+        UPDATE archive.questions SET
+            trigger_condition = json_set(trigger_condition, '$.parent_question_index', 0),
+            parent_question_id = NULL
+        WHERE parent_question_id IS NOT NULL
+    """))
+    db_session.execute(text("""
+        UPDATE archive.documentation_items SET total_questions = 3, critical_questions = 2
+    """))
+    db_session.execute(text("ALTER TABLE archive.questions DROP COLUMN _sentinel"))
+    db_session.execute(text("ALTER TABLE archive.documentation_items DROP COLUMN _sentinel"))
+    db_session.execute(text("PRAGMA archive.user_version = 1"))
+    db_session.commit()
+
+    archive_service.create_schema(db_session.get_bind())
+    indexes = inspect(db_session.get_bind()).get_indexes("questions", schema="archive")
+    assert "ix_questions_parent_question_id" in {index["name"] for index in indexes}
+
+    client.patch(f"/api/projects/{project_id}/archive")
+    parent, child, notes = client.get(f"/api/items/{item_id}/questions").json()
+    assert child["parent_question_id"] == parent["id"]
+    assert child["trigger_condition"] == {"required_answer": "Cards"}
+    assert child["is_visible"] is False
+    status = client.post(f"/api/items/{item_id}/validate").json()
+    assert (status["total_questions"], status["critical_questions"]) == (2, 1)
+    items = client.get(f"/api/projects/{project_id}/items").json()
+    assert items[0]["total_questions"] == 2
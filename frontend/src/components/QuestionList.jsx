@@ -1,6 +1,6 @@
 import QuestionRow from './QuestionRow';
 
-function QuestionList({ questions, onSaveAnswer, isSaving }) {
+function QuestionList({ questions, pendingAnswers = {}, onAnswer, isSaving }) {
   if (!questions || questions.length === 0) {
     return (
       <div className="text-center py-8 text-secondary">
@@ -9,21 +9,8 @@ function QuestionList({ questions, onSaveAnswer, isSaving }) {
     );
   }
 
-  // Filter questions based on trigger conditions
-  const visibleQuestions = questions.filter((question) => {
-    if (!question.trigger_condition) return true;
-
-    const { parent_question_id, required_answer } = question.trigger_condition;
-    if (!parent_question_id) return true;
-
-    const parentQuestion = questions.find((q) => q.id === parent_question_id);
-    if (!parentQuestion || !parentQuestion.is_answered) return false;
-
-    if (Array.isArray(required_answer)) {
-      return required_answer.includes(parentQuestion.answer);
-    }
-    return parentQuestion.answer === required_answer;
-  });
+  // The server hides conditional questions whose trigger is not met
+  const visibleQuestions = questions.filter((question) => question.is_visible !== false);
 
   const answeredCount = visibleQuestions.filter((q) => q.is_answered).length;
   const totalCount = visibleQuestions.length;
@@ -50,7 +37,8 @@ function QuestionList({ questions, onSaveAnswer, isSaving }) {
           <QuestionRow
             key={question.id}
             question={question}
-            onSaveAnswer={onSaveAnswer}
+            pendingAnswer={pendingAnswers[question.id]}
+            onAnswer={onAnswer}
             isSaving={isSaving}
           />
         ))}
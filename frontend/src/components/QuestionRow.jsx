@@ -2,35 +2,32 @@ import { useState, useEffect } from 'react';
 import { Check, Circle, ChevronDown, ChevronUp } from 'lucide-react';
 import QuestionInput from './QuestionInput';
 
-function QuestionRow({ question, onSaveAnswer, isSaving }) {
+// Answers are collected by the page and saved together, so a row only
+// hands its answer up; pendingAnswer is set until the page has saved it
+function QuestionRow({ question, pendingAnswer, onAnswer, isSaving }) {
+  const currentAnswer = pendingAnswer ?? (question.answer || '');
   const [isExpanded, setIsExpanded] = useState(false);
-  const [answer, setAnswer] = useState(question.answer || '');
-  const [hasChanges, setHasChanges] = useState(false);
+  const [answer, setAnswer] = useState(currentAnswer);
 
   useEffect(() => {
-    setAnswer(question.answer || '');
-    setHasChanges(false);
-  }, [question.answer]);
+    setAnswer(currentAnswer);
+  }, [currentAnswer]);
 
-  const handleAnswerChange = (value) => {
-    setAnswer(value);
-    setHasChanges(value !== (question.answer || ''));
-  };
+  const hasChanges = answer !== currentAnswer;
+  const isPending = pendingAnswer !== undefined;
 
   const handleSave = () => {
-    onSaveAnswer(question.id, answer);
-    setHasChanges(false);
+    onAnswer(question.id, answer);
     setIsExpanded(false);
   };
 
   const handleMarkNA = () => {
-    onSaveAnswer(question.id, 'N/A');
+    onAnswer(question.id, 'N/A');
     setAnswer('N/A');
-    setHasChanges(false);
     setIsExpanded(false);
   };
 
-  const isAnswered = question.is_answered;
+  const isAnswered = isPending ? pendingAnswer !== '' : question.is_answered;
   const isCritical = question.is_critical;
 
   return (
@@ -53,10 +50,11 @@ function QuestionRow({ question, onSaveAnswer, isSaving }) {
               {question.question_text}
               {isCritical && <span className="text-error ml-1">*</span>}
             </p>
+            {isPending && <span className="text-xs text-warning flex-shrink-0">Unsaved</span>}
           </div>
           {isAnswered && !isExpanded && (
             <p className="text-sm text-secondary mt-1 truncate">
-              {question.answer}
+              {currentAnswer}
             </p>
           )}
         </div>
@@ -75,7 +73,7 @@ function QuestionRow({ question, onSaveAnswer, isSaving }) {
           <QuestionInput
             question={question}
             value={answer}
-            onChange={handleAnswerChange}
+            onChange={setAnswer}
           />
 
           <div className="flex items-center gap-3 mt-4">
@@ -84,7 +82,7 @@ function QuestionRow({ question, onSaveAnswer, isSaving }) {
               disabled={isSaving || !hasChanges}
               className="px-4 py-2 bg-primary hover:bg-primary-light text-white rounded-md transition-colors disabled:opacity-50 disabled:cursor-not-allowed"
             >
-              {isSaving ? 'Saving...' : 'Save Answer'}
+              Set Answer
             </button>
 
             {!isCritical && (
@@ -0,0 +1,36 @@
+import { describe, it, expect, vi } from 'vitest';
+import { render, screen, fireEvent } from '@testing-library/react';
+import QuestionRow from './QuestionRow';
+
+describe('QuestionRow', () => {
+  const question = {
+    id: 7,
+    question_text: 'Which card provider?',
+    question_type: 'Text',
+    is_critical: false,
+    is_answered: false,
+    answer: null,
+  };
+
+  it('hands the answer to the page instead of saving it', () => {
+    const onAnswer = vi.fn();
+    render(<QuestionRow question={question} onAnswer={onAnswer} isSaving={false} />);
+
+    fireEvent.click(screen.getByText('Which card provider?'));
+    fireEvent.change(screen.getByPlaceholderText('Enter your answer...'), {
+      target: { value: 'Stripe' },
+    });
+    fireEvent.click(screen.getByText('Set Answer'));
+
+    expect(onAnswer).toHaveBeenCalledWith(7, 'Stripe');
+  });
+
+  it('shows a pending answer as unsaved', () => {
+    render(
+      <QuestionRow question={question} pendingAnswer="Stripe" onAnswer={() => {}} isSaving={false} />
+    );
+
+    expect(screen.getByText('Unsaved')).toBeInTheDocument();
+    expect(screen.getByText('Stripe')).toBeInTheDocument();
+  });
+});
@@ -15,9 +15,30 @@ export function useUpdateAnswer() {
   return useMutation({
     mutationFn: ({ questionId, answer }) => questionsApi.updateAnswer(questionId, answer),
     onSuccess: (data) => {
-      // Invalidate questions for this item
-      queryClient.invalidateQueries({ queryKey: ['questions'] });
-      queryClient.invalidateQueries({ queryKey: ['item'] });
+      // Invalidate questions for this item only
+      queryClient.invalidateQueries({ queryKey: ['questions', String(data.doc_item_id)] });
+      queryClient.invalidateQueries({ queryKey: ['item', String(data.doc_item_id)] });
+    },
+  });
+}
+
+export function useUpdateAnswers(itemId) {
+  const queryClient = useQueryClient();
+
+  return useMutation({
+    // answers: [{ question_id, answer }]
+    mutationFn: (answers) => questionsApi.updateAnswers(itemId, answers),
+    onSuccess: (data) => {
+      // Merge the changed questions into the cache instead of refetching
+      const changed = new Map(data.questions.map((q) => [q.id, q]));
+      const cached = queryClient.setQueryData(['questions', itemId], (old) =>
+        old ? old.map((q) => changed.get(q.id) || q) : old
+      );
+      // Answers can show or hide conditional questions; refetch their visibility
+      if (cached?.some((q) => q.parent_question_id)) {
+        queryClient.invalidateQueries({ queryKey: ['questions', itemId] });
+      }
+      queryClient.invalidateQueries({ queryKey: ['item', itemId] });
     },
   });
 }
@@ -1,32 +1,119 @@
+import { useEffect, useEffectEvent, useRef, useState } from 'react';
 import { useParams, useNavigate, Link } from 'react-router-dom';
-import { ArrowLeft, FileText, Loader2 } from 'lucide-react';
+import { ArrowLeft, FileText, Loader2, Save } from 'lucide-react';
 import { useDocumentationItem } from '../hooks/useDocumentationItem';
-import { useQuestions, useUpdateAnswer, useValidateItem } from '../hooks/useQuestions';
+import { useQuestions, useUpdateAnswers, useValidateItem } from '../hooks/useQuestions';
 import { useGenerateDoc } from '../hooks/useGeneration';
 import StatusBadge from '../components/StatusBadge';
 import DeadlineWarning from '../components/DeadlineWarning';
 import QuestionList from '../components/QuestionList';
 
+// Pending answers are saved this long after the last change
+const AUTOSAVE_DELAY_MS = 1500;
+
+const toAnswerList = (pending) =>
+  Object.entries(pending).map(([questionId, answer]) => ({
+    question_id: Number(questionId),
+    answer,
+  }));
+
 function DocumentationItem() {
   const { id } = useParams();
   const navigate = useNavigate();
 
   const { data: item, isLoading: itemLoading } = useDocumentationItem(id);
   const { data: questions, isLoading: questionsLoading } = useQuestions(id);
-  const updateAnswer = useUpdateAnswer();
+  const updateAnswers = useUpdateAnswers(id);
   const validateItem = useValidateItem();
   const generateDoc = useGenerateDoc();
 
-  const handleSaveAnswer = async (questionId, answer) => {
+  // Answers set on the page, by question id, until they are saved in one
+  // request; a form of fifteen questions then takes one round trip
+  const [pendingAnswers, setPendingAnswers] = useState({});
+  const pendingCount = Object.keys(pendingAnswers).length;
+
+  const handleAnswer = (questionId, answer) => {
+    const saved = questions?.find((q) => q.id === questionId)?.answer || '';
+    setPendingAnswers((pending) => {
+      const next = { ...pending, [questionId]: answer };
+      if (answer === saved) {
+        delete next[questionId];
+      }
+      return next;
+    });
+  };
+
+  const savePendingAnswers = async () => {
+    const answers = toAnswerList(pendingAnswers);
+    if (answers.length === 0) {
+      return;
+    }
+    await updateAnswers.mutateAsync(answers);
+    // Keep answers changed again while the request was in flight
+    setPendingAnswers((pending) => {
+      const next = { ...pending };
+      answers.forEach(({ question_id, answer }) => {
+        if (next[question_id] === answer) {
+          delete next[question_id];
+        }
+      });
+      return next;
+    });
+  };
+
+  const handleSaveAnswers = async () => {
     try {
-      await updateAnswer.mutateAsync({ questionId, answer });
+      await savePendingAnswers();
     } catch (err) {
-      console.error('Failed to save answer:', err);
+      console.error('Failed to save answers:', err);
     }
   };
 
+  // Save shortly after typing stops. After a failed save autosave waits for
+  // the Save button, which retries, instead of failing every few seconds
+  const { mutate: saveAnswers, isPending: isSaving, isError: saveFailed } = updateAnswers;
+  const autosave = useEffectEvent(handleSaveAnswers);
+  useEffect(() => {
+    if (Object.keys(pendingAnswers).length === 0 || isSaving || saveFailed) {
+      return undefined;
+    }
+    const timer = setTimeout(autosave, AUTOSAVE_DELAY_MS);
+    return () => clearTimeout(timer);
+  }, [pendingAnswers, isSaving, saveFailed]);
+
+  // Leaving the page within the delay still saves; the mutation outlives the
+  // page, so only the reload or tab close in between needs the prompt
+  const latestPending = useRef(pendingAnswers);
+  useEffect(() => {
+    latestPending.current = pendingAnswers;
+  }, [pendingAnswers]);
+  useEffect(
+    () => () => {
+      const answers = toAnswerList(latestPending.current);
+      if (answers.length > 0) {
+        saveAnswers(answers);
+      }
+    },
+    [saveAnswers]
+  );
+
+  useEffect(() => {
+    if (pendingCount === 0) {
+      return undefined;
+    }
+    const warn = (event) => {
+      event.preventDefault();
+      // Older browsers only prompt when returnValue is set
+      event.returnValue = '';
+    };
+    window.addEventListener('beforeunload', warn);
+    return () => window.removeEventListener('beforeunload', warn);
+  }, [pendingCount]);
+
   const handleGenerate = async () => {
     try {
+      await savePendingAnswers();
+
       // First validate
       const validation = await validateItem.mutateAsync(id);
 
@@ -68,11 +155,13 @@ function DocumentationItem() {
   const answeredCount = questions?.filter((q) => q.is_answered).length || 0;
   const totalCount = questions?.length || 0;
   const criticalQuestions = questions?.filter((q) => q.is_critical) || [];
-  const allCriticalAnswered = criticalQuestions.every((q) => q.is_answered);
+  const allCriticalAnswered = criticalQuestions.every((q) =>
+    q.id in pendingAnswers ? pendingAnswers[q.id] !== '' : q.is_answered
+  );
   const canGenerate = allCriticalAnswered && totalCount > 0;
 
   const isProcessing =
-    updateAnswer.isPending || validateItem.isPending || generateDoc.isPending;
+    updateAnswers.isPending || validateItem.isPending || generateDoc.isPending;
 
   return (
     <div className="pb-24">
@@ -120,8 +209,9 @@ function DocumentationItem() {
       ) : (
         <QuestionList
           questions={questions}
-          onSaveAnswer={handleSaveAnswer}
-          isSaving={updateAnswer.isPending}
+          pendingAnswers={pendingAnswers}
+          onAnswer={handleAnswer}
+          isSaving={updateAnswers.isPending}
         />
       )}
 
@@ -136,23 +226,38 @@ function DocumentationItem() {
             Back to Project
           </Link>
 
-          <button
-            onClick={handleGenerate}
-            disabled={!canGenerate || isProcessing}
-            className="flex items-center gap-2 px-6 py-2 bg-primary hover:bg-primary-light text-white rounded-md transition-colors disabled:opacity-50 disabled:cursor-not-allowed"
-          >
-            {isProcessing ? (
-              <>
-                <Loader2 className="h-4 w-4 animate-spin" />
-                Processing...
-              </>
-            ) : (
-              <>
-                <FileText className="h-4 w-4" />
-                Generate Documentation
-              </>
+          <div className="flex items-center gap-3">
+            {pendingCount > 0 && (
+              <button
+                onClick={handleSaveAnswers}
+                disabled={isProcessing}
+                className="flex items-center gap-2 px-6 py-2 border border-gray-700 text-primary hover:border-primary rounded-md transition-colors disabled:opacity-50 disabled:cursor-not-allowed"
+              >
+                <Save className="h-4 w-4" />
+                {updateAnswers.isPending
+                  ? 'Saving...'
+                  : `Save ${pendingCount} ${pendingCount === 1 ? 'answer' : 'answers'}`}
+              </button>
             )}
-          </button>
+
+            <button
+              onClick={handleGenerate}
+              disabled={!canGenerate || isProcessing}
+              className="flex items-center gap-2 px-6 py-2 bg-primary hover:bg-primary-light text-white rounded-md transition-colors disabled:opacity-50 disabled:cursor-not-allowed"
+            >
+              {isProcessing ? (
+                <>
+                  <Loader2 className="h-4 w-4 animate-spin" />
+                  Processing...
+                </>
+              ) : (
+                <>
+                  <FileText className="h-4 w-4" />
+                  Generate Documentation
+                </>
+              )}
+            </button>
+          </div>
         </div>
       </div>
     </div>
@@ -11,6 +11,11 @@ export const questionsApi = {
     return response.data;
   },
 
+  updateAnswers: async (itemId, answers) => {
+    const response = await api.patch(`/items/${itemId}/answers`, { answers });
+    return response.data;
+  },
+
   validate: async (itemId) => {
     const response = await api.post(`/items/${itemId}/validate`);
     return response.data;